@@ -1,4 +1,9 @@
 import os
+import io
+import queue
+import logging
+import tempfile
+import threading
 import whisper
 import asyncio
 import torch
@@ -6,17 +11,341 @@ import numpy as np
 
 from pydub import AudioSegment
 from TTS.api import TTS
+from .constants import (
+    AUDIO_DECODER,
+    SAVE_DIR,
+    STT_ENGINE,
+    STT_STREAM_WINDOW,
+    STT_VAD,
+    VAD_MIN_SILENCE_MS,
+    VAD_THRESHOLD_DB,
+)
+from .metrics import record_speech_ratio
+from .stt_engines import create_stt_engine
+
+try:
+    import av
+except ImportError:  # fall back to decoding through an ffmpeg subprocess
+    av = None
+
+logger = logging.getLogger(__name__)
+
+
+class AudioDecodeError(ValueError):
+    """The candidate's audio could not be decoded."""
+
+
+def decode_audio(data: bytes, sr: int = whisper.audio.SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode an encoded audio stream into a mono float32 array at the given sample rate.
+
+    Uses the in-process decoder unless AUDIO_DECODER is set to "file", in which case the
+    stream is written to SAVE_DIR and loaded with ffmpeg like before.
+
+    Parameters:
+    data (bytes): The encoded audio (e.g. ogg/opus from the browser MediaRecorder).
+    sr (int): The target sample rate.
+
+    Returns:
+    np.ndarray: The decoded audio.
+
+    Raises:
+    AudioDecodeError: If the data is not an audio stream the decoder understands.
+    """
+    if AUDIO_DECODER == "file" or av is None:
+        return _decode_from_file(data, sr)
+    return _decode_in_memory(data, sr)
+
+
+def _decode_in_memory(data: bytes, sr: int) -> np.ndarray:
+    try:
+        container = av.open(io.BytesIO(data))
+    except av.error.FFmpegError as e:
+        raise AudioDecodeError(f"Failed to decode audio: {e}") from e
+
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sr)
+    frames = []
+    with container:
+        try:
+            for frame in container.decode(audio=0):
+                frames.extend(resampled.to_ndarray() for resampled in resampler.resample(frame))
+        except av.error.FFmpegError:
+            # a stream that is still being recorded ends mid-page, keep what was decoded
+            pass
+        frames.extend(resampled.to_ndarray() for resampled in resampler.resample(None))
+
+    if not frames:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(frames, axis=1).flatten().astype(np.float32) / 32768.0
+
+
+def _decode_from_file(data: bytes, sr: int) -> np.ndarray:
+    with tempfile.NamedTemporaryFile(dir=SAVE_DIR, suffix=".ogg", delete=False) as audio_file:
+        audio_file.write(data)
+    try:
+        return whisper.load_audio(audio_file.name, sr=sr)
+    except RuntimeError as e:  # ffmpeg failed
+        raise AudioDecodeError(str(e)) from e
+    finally:
+        os.remove(audio_file.name)
+
+
+class _EncodedStream:
+    """A file-like object for PyAV whose reads block until more of the stream is fed."""
+
+    def __init__(self):
+        self.chunks = queue.Queue()
+        self.buffer = b""
+        self.closed = False
+
+    def read(self, size: int) -> bytes:
+        while not self.buffer:
+            if self.closed:
+                return b""
+            data = self.chunks.get()
+            if data is None:
+                self.closed = True
+            else:
+                self.buffer = data
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+
+class StreamDecoder:
+    """
+    Decode an encoded audio stream while it is still arriving.
+
+    PyAV demuxes and decodes the stream on a thread of its own, which waits for more data
+    whenever it runs out, so every byte is decoded once however long the answer gets.
+    `read` returns the audio decoded since the previous call. Without the in-process
+    decoder (see `decode_audio`) the stream is only decoded once it is closed.
+    """
+
+    def __init__(self, sr: int = whisper.audio.SAMPLE_RATE):
+        self.sr = sr
+        self.incremental = AUDIO_DECODER != "file" and av is not None
+        self.buffer = io.BytesIO()
+        self.error = None
+        self._stream = _EncodedStream()
+        self._frames = []
+        self._lock = threading.Lock()
+        self._thread = None
+        if self.incremental:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        try:
+            container = av.open(self._stream)
+        except av.error.FFmpegError as e:
+            self.error = e
+            return
+
+        resampler = av.AudioResampler(format="s16", layout="mono", rate=self.sr)
+        with container:
+            try:
+                for frame in container.decode(audio=0):
+                    self._append(resampler.resample(frame))
+            except av.error.FFmpegError:
+                # a stream that was cut off ends mid-page, keep what was decoded
+                pass
+            self._append(resampler.resample(None))
+
+    def _append(self, frames):
+        frames = [frame.to_ndarray().flatten() for frame in frames]
+        with self._lock:
+            self._frames.extend(frames)
+
+    def feed(self, data: bytes):
+        """Append an encoded chunk to the stream."""
+        if not self.incremental:
+            self.buffer.write(data)
+        elif self._thread.is_alive():
+            self._stream.chunks.put(data)
+
+    def read(self) -> np.ndarray:
+        """Return the audio decoded since the previous call."""
+        with self._lock:
+            frames, self._frames = self._frames, []
+        if not frames:
+            return np.zeros(0, dtype=np.float32)
+        return np.concatenate(frames).astype(np.float32) / 32768.0
+
+    async def close(self) -> np.ndarray:
+        """End the stream and return the rest of the audio once it is decoded."""
+        if not self.incremental:
+            return await asyncio.to_thread(decode_audio, self.buffer.getvalue(), self.sr)
+
+        self._stream.chunks.put(None)
+        await asyncio.to_thread(self._thread.join)
+        if self.error is not None:
+            raise AudioDecodeError(f"Failed to decode audio: {self.error}") from self.error
+        return self.read()
+
+    def abort(self):
+        """Stop decoding and drop the stream."""
+        if self.incremental:
+            self._stream.chunks.put(None)
+
+
+class VoiceActivityDetector:
+    """
+    Energy based voice activity detection for 16 kHz audio, CPU only.
+
+    A frame counts as speech when its energy rises `threshold_db` above the estimated noise
+    floor. Pauses shorter than `min_silence_ms` are kept inside the surrounding speech, so
+    chunks are only cut at natural pauses.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = whisper.audio.SAMPLE_RATE,
+        frame_ms: int = 30,
+        threshold_db: float = VAD_THRESHOLD_DB,
+        min_silence_ms: int = VAD_MIN_SILENCE_MS,
+        min_speech_ms: int = 120,
+        padding_ms: int = 150,
+        max_chunk_seconds: int = 30,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_length = sample_rate * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.padding = sample_rate * padding_ms // 1000
+        self.max_chunk_length = sample_rate * max_chunk_seconds
+        self.gap = np.zeros(sample_rate // 10, dtype=np.float32)
+
+    def _speech_frames(self, audio: np.ndarray) -> np.ndarray:
+        n_frames = len(audio) // self.frame_length
+        frames = audio[: n_frames * self.frame_length].reshape(n_frames, self.frame_length)
+        energy = 10 * np.log10(np.mean(frames**2, axis=1) + 1e-10)
+
+        noise_floor = np.percentile(energy, 10)
+        # keep the threshold below the loud frames when the whole clip is speech
+        threshold = min(noise_floor + self.threshold_db, np.percentile(energy, 95) - 20)
+        return energy > max(threshold, -50)
+
+    @staticmethod
+    def _runs(mask: np.ndarray) -> list:
+        """Return the (start, end) frame indices of every run of True values."""
+        edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+        return list(zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)))
+
+    def speech_segments(self, audio: np.ndarray) -> list:
+        """
+        Find the speech regions of the audio.
+
+        Parameters:
+        audio (np.ndarray): The decoded audio array.
+
+        Returns:
+        list: (start, end) sample offsets of each speech segment.
+        """
+        if len(audio) < self.frame_length:
+            return []
+
+        speech = self._speech_frames(audio)
+        for start, end in self._runs(~speech):
+            if 0 < start and end < len(speech) and end - start < self.min_silence_frames:
+                speech[start:end] = True
+        for start, end in self._runs(speech):
+            if end - start < self.min_speech_frames:
+                speech[start:end] = False
+
+        segments = []
+        for start, end in self._runs(speech):
+            start = max(0, start * self.frame_length - self.padding)
+            end = min(len(audio), end * self.frame_length + self.padding)
+            if segments and start <= segments[-1][1]:
+                segments[-1] = (segments[-1][0], end)
+            else:
+                segments.append((start, end))
+        return segments
+
+    def split(self, audio: np.ndarray) -> tuple:
+        """
+        Drop non-speech and pack the speech into chunks of at most 30 seconds, cut at pauses.
+
+        Parameters:
+        audio (np.ndarray): The decoded audio array.
+
+        Returns:
+        tuple: The list of audio chunks and the ratio of the audio kept as speech.
+        """
+        return self.pack(audio, self.speech_segments(audio))
+
+    def pack(self, audio: np.ndarray, segments: list) -> tuple:
+        """Pack the given speech segments of the audio into chunks, see `split`."""
+        chunks, current, current_length, kept = [], [], 0, 0
+        for start, end in segments:
+            kept += end - start
+            for offset in range(start, end, self.max_chunk_length):
+                piece = audio[offset : min(end, offset + self.max_chunk_length)]
+                if current and current_length + len(self.gap) + len(piece) > self.max_chunk_length:
+                    chunks.append(np.concatenate(current))
+                    current, current_length = [], 0
+                if current:
+                    current.append(self.gap)
+                    current_length += len(self.gap)
+                current.append(piece)
+                current_length += len(piece)
+        if current:
+            chunks.append(np.concatenate(current))
+
+        return chunks, kept / len(audio) if len(audio) else 0.0
+
+
+def chunk_audio(audio: np.ndarray) -> list:
+    """
+    Split 16 kHz audio into 30 second chunks, padding only the last one.
+
+    Parameters:
+    audio (np.ndarray): The loaded audio array
+
+    Returns:
+    list: List of audio chunks
+    """
+    return [
+        whisper.pad_or_trim(audio[i : i + whisper.audio.N_SAMPLES])
+        for i in range(0, max(len(audio), 1), whisper.audio.N_SAMPLES)
+    ]
+
+
+def split_audio(audio: np.ndarray, vad: VoiceActivityDetector = None) -> list:
+    """
+    Split audio into the chunks to decode, trimming silence when a VAD is given.
+
+    Parameters:
+    audio (np.ndarray): The loaded audio array
+    vad (VoiceActivityDetector): The detector used to drop non-speech, if any.
+
+    Returns:
+    list: List of audio chunks
+    """
+    if vad is None:
+        return chunk_audio(audio)
+
+    chunks, speech_ratio = vad.split(audio)
+    record_speech_ratio(speech_ratio)
+    logger.info(
+        f"VAD kept {speech_ratio:.0%} of {len(audio) / vad.sample_rate:.1f}s "
+        f"as {len(chunks)} chunk(s)"
+    )
+    return chunks
 
 
 class AudioToText:
-    def __init__(self, model_size="tiny"):
+    def __init__(self, model_size="tiny", engine=STT_ENGINE):
         """
-        Initialize the AudioToText class with a specified Whisper model size.
+        Initialize the AudioToText class with a specified Whisper model size, decoded by
+        the given STT engine (see `stt_engines.STT_ENGINES`).
         """
-        print(f"Loading Whisper model: {model_size}")
-        self.model = whisper.load_model(model_size)
-        self.sample_rate = 22050
-        self.chunk_length = 30 * self.sample_rate
+        print(f"Loading Whisper model: {model_size} ({engine})")
+        self.engine = create_stt_engine(engine, model_size)
+        self.sample_rate = whisper.audio.SAMPLE_RATE
+        self.chunk_length = whisper.audio.N_SAMPLES
+        self.vad = VoiceActivityDetector(self.sample_rate) if STT_VAD else None
 
     def save_audio(self, audio_segment: AudioSegment, filename="temp_audio.wav") -> str:
         """
@@ -34,58 +363,215 @@ class AudioToText:
         return filename
 
     def chunk_audio(self, audio: np.ndarray) -> list:
+        """Split audio into 30 second chunks, see `chunk_audio`."""
+        return chunk_audio(audio)
+
+    def split_audio(self, audio: np.ndarray) -> list:
+        """Split audio into the chunks to decode, see `split_audio`."""
+        return split_audio(audio, self.vad)
+
+    def transcribe_audio(self, audio_path: str) -> str:
         """
-        Split audio into chunks of 30 seconds or less.
+        Transcribe audio from a file path to text, handling files longer than 30 seconds.
 
         Parameters:
-        audio (np.ndarray): The loaded audio array
+        audio_path (str): The file path to the audio file to transcribe.
 
         Returns:
-        list: List of audio chunks
+        str: The transcribed text.
         """
-        audios = []
+        print(f"Loading and processing audio from: {audio_path}")
+        try:
+            audio = whisper.load_audio(audio_path)
+            return self.transcribe_array(audio)
+        finally:
+            os.remove(audio_path)
 
-        if len(audio) <= self.chunk_length:
-            audio = whisper.pad_or_trim(audio)
-            audios.append(audio)
-        else:
-            for i in range(0, len(audio), self.chunk_length):
-                chunk = audio[i : i + self.chunk_length]
-                if len(chunk) < self.chunk_length:
-                    chunk = whisper.pad_or_trim(chunk)
-                audios.append(chunk)
+    def transcribe_array(self, audio: np.ndarray) -> str:
+        """
+        Transcribe already decoded audio to text, handling audio longer than 30 seconds.
 
-        return audios
+        The mel spectrogram of each 30 second chunk is computed once and all chunks of the
+        answer are decoded together as a single batch.
 
-    def transcribe_audio(self, audio_path: str) -> str:
+        Parameters:
+        audio (np.ndarray): The decoded audio array.
+
+        Returns:
+        str: The transcribed text.
         """
-        Transcribe audio from a file path to text, handling files longer than 30 seconds.
+        chunks = self.split_audio(audio)
+        if not chunks:
+            return ""
+        results = self.decode_batch(chunks)
+        return " ".join(text.strip() for text, _ in results).strip()
+
+    def decode_batch(self, chunks: list) -> list:
+        """
+        Decode several audio chunks of up to 30 seconds with the STT engine.
 
         Parameters:
-        audio_path (str): The file path to the audio file to transcribe.
+        chunks (list): The audio chunks.
 
         Returns:
-        str: The transcribed text.
+        list: A (text, confidence) tuple for each chunk, in order.
         """
-        print(f"Loading and processing audio from: {audio_path}")
-        audio = whisper.load_audio(audio_path)
-        audio_chunks = self.chunk_audio(audio)
+        return self.engine.decode_batch(chunks)
 
-        full_transcript = ""
-        for i, chunk in enumerate(audio_chunks, 1):
-            mel = whisper.log_mel_spectrogram(chunk).to(self.model.device)
 
-            if hasattr(self.model, "transcribe"):
-                result = self.model.transcribe(chunk)
-                chunk_text = result["text"]
-            else:
-                options = whisper.DecodingOptions(fp16=False)
-                result = whisper.decode(self.model, mel, options)
-                chunk_text = result.text
+class StreamingTranscriber:
+    """
+    Incrementally transcribe an answer while the candidate is still speaking.
+
+    Encoded chunks are decoded as they arrive (see `StreamDecoder`) and the audio that is not
+    transcribed yet is kept. Once at least `window_seconds` of it is buffered, each call to
+    `step` runs the VAD over it and transcribes the speech up to the last pause, so no word
+    is cut in two, and when the answer ends only the remaining tail has to go through
+    Whisper. Without a VAD whole 30 second chunks are transcribed. `stt` is anything with an
+    async `transcribe(chunks)` returning (text, confidence), normally the shared
+    `STTScheduler`.
+    """
+
+    def __init__(self, stt, window_seconds: float = STT_STREAM_WINDOW):
+        self.stt = stt
+        self.window = int(window_seconds * whisper.audio.SAMPLE_RATE)
+        self.vad = VoiceActivityDetector() if STT_VAD else None
+        self.decoder = None
+        self.pending = None
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._segments = []
+
+    @property
+    def text(self) -> str:
+        return " ".join(text for text, _ in self._segments if text)
+
+    @property
+    def confidence(self):
+        scores = [confidence for text, confidence in self._segments if text]
+        return sum(scores) / len(scores) if scores else None
+
+    def feed(self, data: bytes):
+        """Append an encoded audio chunk to the stream."""
+        if self.decoder is None:
+            self.decoder = StreamDecoder()
+        self.decoder.feed(data)
+
+    def _split(self, audio: np.ndarray, segments: list) -> list:
+        """Cut the audio into the chunks to decode, keeping only its speech segments."""
+        if self.vad is None:
+            return chunk_audio(audio)
+        segments = [(start, min(end, len(audio))) for start, end in segments if start < len(audio)]
+        chunks, speech_ratio = self.vad.pack(audio, segments)
+        record_speech_ratio(speech_ratio)
+        logger.debug(
+            f"VAD kept {speech_ratio:.0%} of {len(audio) / self.vad.sample_rate:.1f}s "
+            f"as {len(chunks)} chunk(s)"
+        )
+        return chunks
+
+    def _commit_point(self, audio: np.ndarray, segments: list):
+        """Return how many samples of the buffered audio to transcribe now, if any."""
+        if self.vad is None:
+            return len(audio) // whisper.audio.N_SAMPLES * whisper.audio.N_SAMPLES or None
+
+        if not segments:
+            # only silence so far, keep the last second in case a word is starting
+            return max(len(audio) - self.vad.sample_rate, 0) or None
+        # the middle of every pause between two segments, or after the last one once it
+        # is long enough to be a pause rather than a gap between words
+        pauses = [(end + start) // 2 for (_, end), (start, _) in zip(segments, segments[1:])]
+        min_silence = self.vad.min_silence_frames * self.vad.frame_length
+        if len(audio) - segments[-1][1] >= min_silence:
+            pauses.append(segments[-1][1])
+
+        cut = pauses[-1] if pauses else None
+        if cut is not None and cut >= self.window:
+            return cut
+        if len(audio) >= whisper.audio.N_SAMPLES:
+            # no pause for as long as Whisper can decode at once
+            return cut or whisper.audio.N_SAMPLES
+        return None
+
+    async def step(self):
+        """
+        Transcribe the buffered audio up to its last pause, once there is enough of it.
+
+        Returns:
+        str | None: The partial transcript if it advanced, otherwise None.
+        """
+        if self.decoder is None:
+            return None
+        self._audio = np.concatenate((self._audio, self.decoder.read()))
+        if len(self._audio) < self.window:
+            return None
+        segments = self.vad.speech_segments(self._audio) if self.vad else None
+        cut = self._commit_point(self._audio, segments)
+        if cut is None:
+            return None
+
+        chunks = self._split(self._audio[:cut], segments)
+        self._audio = self._audio[cut:]
+        self._segments.append(await self.stt.transcribe(chunks))
+        return self.text
+
+    async def finalize(self) -> tuple:
+        """
+        Wait for the partial transcription in flight, transcribe the remaining tail and
+        reset the stream.
+
+        Returns:
+        tuple: The full transcript and its STT confidence (None when nothing was said).
+
+        Raises:
+        AudioDecodeError: If the answer could not be decoded at all.
+        Exception: Whatever the STT raised, for the partial or the final transcription.
+        """
+        try:
+            if self.pending is not None:
+                pending, self.pending = self.pending, None
+                await pending
+            if self.decoder is None:
+                return "", None
+            tail = np.concatenate((self._audio, await self.decoder.close()))
+            if len(tail):
+                segments = self.vad.speech_segments(tail) if self.vad else None
+                self._segments.append(await self.stt.transcribe(self._split(tail, segments)))
+            return self.text, self.confidence
+        finally:
+            await self.reset()
+
+    async def reset(self):
+        """Cancel the partial transcription in flight and forget the current answer."""
+        if self.pending is not None:
+            pending, self.pending = self.pending, None
+            pending.cancel()
+            # a failed partial transcription only matters to an answer that is finalized
+            await asyncio.gather(pending, return_exceptions=True)
+        if self.decoder is not None:
+            self.decoder.abort()
+        self.decoder = None
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._segments = []
+
+
+class PCMEncoder:
+    """
+    Encode synthesized audio as raw 16-bit little-endian PCM for a single connection.
+
+    The stream format is announced once through `format`, so every segment is sent as bare
+    samples instead of being wrapped in its own WAV container.
+    """
+
+    def __init__(self, sample_rate: int = 24000):
+        self.sample_rate = sample_rate
+
+    @property
+    def format(self) -> dict:
+        return {"encoding": "pcm_s16le", "sample_rate": self.sample_rate, "channels": 1}
 
-            full_transcript += chunk_text + " "
-        os.remove(audio_path)
-        return full_transcript.strip()
+    def encode(self, audio) -> bytes:
+        samples = np.clip(np.asarray(audio, dtype=np.float32), -1.0, 1.0)
+        return (samples * 32767).astype("<i2").tobytes()
 
 
 class TextToAudio:
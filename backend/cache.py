@@ -0,0 +1,230 @@
+import os
+import json
+import asyncio
+import hashlib
+import logging
+import tempfile
+import threading
+
+from collections import OrderedDict
+from .constants import (
+    GUIDELINE_CACHE_TTL,
+    TTS_CACHE_DIR,
+    TTS_CACHE_DISK_MAX_BYTES,
+    TTS_CACHE_MAX_BYTES,
+)
+from .metrics import counters
+from .prompt import question_generator_prompt
+from .util import normalize_text
+
+logger = logging.getLogger(__name__)
+
+class GuidelineCache:
+    """
+    Content-addressed cache of the interview guidelines generated for a resume.
+
+    Entries are keyed on a hash of the normalized resume, role and role description, plus
+    the question generator prompt and the chat model that generates the guidelines (see
+    `chat_model.get_chat_model_name`), so that changing either starts afresh. They
+    live in Redis (the session store's client) and expire `ttl` seconds after they were
+    last used; with Redis configured for `volatile-lru`, the least recently used entries
+    are evicted first under memory pressure. Concurrent requests for the same key share one
+    LLM call, also with a `ttl` of 0, which only turns off the stored entries.
+    """
+
+    prefix = "guidelines:"
+
+    def __init__(self, client, ttl: int = GUIDELINE_CACHE_TTL):
+        self.client = client
+        self.ttl = ttl
+        self._pending = {}
+
+    def key(self, resume, role, role_description, model) -> str:
+        content = json.dumps(
+            [
+                question_generator_prompt,
+                model,
+                normalize_text(resume),
+                normalize_text(role),
+                normalize_text(role_description),
+            ]
+        )
+        return self.prefix + hashlib.sha256(content.encode()).hexdigest()
+
+    async def get(self, key):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.get(key)
+            pipe.expire(key, self.ttl)
+            guidelines, _ = await pipe.execute()
+        return guidelines.decode() if guidelines else None
+
+    async def set(self, key, guidelines: str):
+        await self.client.set(key, guidelines, ex=self.ttl)
+
+    async def get_or_generate(self, resume, role, role_description, generate, model):
+        """
+        Return the cached guidelines, or `await generate(resume, role, role_description)`
+        with the chat model named `model` and cache the result.
+        """
+        key = self.key(resume, role, role_description, model)
+        guidelines = None
+        if self.ttl:
+            try:
+                guidelines = await self.get(key)
+            except Exception as e:
+                logger.error(f"Error reading the guideline cache: {e}")
+        if guidelines is not None:
+            counters.increment("guideline_cache_hit")
+            return guidelines
+
+        if key in self._pending:
+            counters.increment("guideline_cache_coalesced")
+        else:
+            counters.increment("guideline_cache_miss")
+            self._pending[key] = asyncio.create_task(
+                self._generate(key, resume, role, role_description, generate)
+            )
+        return await asyncio.shield(self._pending[key])
+
+    async def _generate(self, key, resume, role, role_description, generate):
+        try:
+            guidelines = await generate(
+                resume=resume, role=role, role_description=role_description
+            )
+            if self.ttl:
+                try:
+                    await self.set(key, guidelines)
+                except Exception as e:
+                    logger.error(f"Error writing the guideline cache: {e}")
+            return guidelines
+        finally:
+            self._pending.pop(key, None)
+
+
+class TTSCache:
+    """
+    Content-addressed cache of synthesized speech, so that the interviewer's repeated lines
+    (greetings, "Very nice.", repeated questions) are synthesized once.
+
+    Entries are the encoded audio of one line, keyed on a hash of the normalized text, the
+    voice, the speed and the audio format. The most recently used entries, up to
+    `max_bytes`, are kept in memory. With a `directory`, every entry is also written there,
+    where the other workers, restarts and `scripts/prewarm_tts` share them; the least
+    recently used files are deleted once they take more than `disk_max_bytes`.
+    """
+
+    prune_every = 100  # disk writes between two size checks
+
+    def __init__(
+        self,
+        max_bytes: int = TTS_CACHE_MAX_BYTES,
+        directory: str = TTS_CACHE_DIR,
+        disk_max_bytes: int = TTS_CACHE_DISK_MAX_BYTES,
+    ):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.disk_max_bytes = disk_max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        # disk writes run on executor threads
+        self._lock = threading.Lock()
+        self._writes = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or bool(self.directory)
+
+    def key(self, text, voice, speed, audio_format: dict) -> str:
+        content = json.dumps([normalize_text(text), voice, speed, audio_format], sort_keys=True)
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    def _path(self, key) -> str:
+        return os.path.join(self.directory, f"{key}.pcm")
+
+    def _remember(self, key, audio: bytes):
+        if len(audio) > self.max_bytes:
+            return
+        if key in self._entries:
+            self.size -= len(self._entries.pop(key))
+        self._entries[key] = audio
+        self.size += len(audio)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    async def get(self, key):
+        audio = self._entries.get(key)
+        if audio is not None:
+            self._entries.move_to_end(key)
+            counters.increment("tts_cache_hit")
+            return audio
+
+        if self.directory:
+            try:
+                audio = await asyncio.to_thread(self._read, key)
+            except OSError as e:
+                logger.error(f"Error reading the TTS cache: {e}")
+            if audio is not None:
+                counters.increment("tts_cache_disk_hit")
+                self._remember(key, audio)
+                return audio
+
+        counters.increment("tts_cache_miss")
+        return None
+
+    async def set(self, key, audio: bytes):
+        if not audio:
+            return
+        self._remember(key, audio)
+        if self.directory:
+            try:
+                await asyncio.to_thread(self._write, key, audio)
+            except OSError as e:
+                logger.error(f"Error writing the TTS cache: {e}")
+
+    def _read(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            return None
+        # mark it recently used, so pruning keeps it
+        os.utime(path)
+        return audio
+
+    def _write(self, key, audio: bytes):
+        # a file of its own per write, so concurrent writes of one key never mix
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(audio)
+            os.replace(temporary, self._path(key))
+        except BaseException:
+            os.remove(temporary)
+            raise
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self.prune_every == 0
+        if prune:
+            self.prune()
+
+    def prune(self):
+        """Delete the least recently used files beyond `disk_max_bytes`."""
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".pcm"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -1,8 +1,12 @@
 import os
+import time
+import zlib
+import asyncio
+from contextlib import asynccontextmanager
 from langchain_community.chat_models.openai import ChatOpenAI
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.chains import LLMChain
-from .prompt import interviewer_prompt, question_generator_prompt, evaluator_prompt
+from .prompt import interviewer_prompt, question_generator_prompt, evaluator_prompt, summary_prompt
 from langchain_core.prompts import (
     PromptTemplate,
     ChatPromptTemplate,
@@ -11,29 +15,172 @@ from langchain_core.prompts import (
     HumanMessagePromptTemplate,
 )
 from langchain.memory import ConversationBufferMemory
-from .constants import OPENAI_MODEL_NAME, GEMINI_MODEL_NAME
+from langchain.schema import SystemMessage, get_buffer_string
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from .util import estimate_tokens
+from .metrics import latency
+from .constants import (
+    OPENAI_MODEL_NAME,
+    GEMINI_MODEL_NAME,
+    CHAT_PROVIDER,
+    FAKE_CHAT_LATENCY,
+    FAKE_CHAT_TOKEN_LATENCY,
+    GOOGLE_MAX_CONCURRENCY,
+    OPENAI_MAX_CONCURRENCY,
+    FAKE_MAX_CONCURRENCY,
+    MEMORY_TURNS,
+    MEMORY_TOKEN_BUDGET,
+    MEMORY_SUMMARY_WORDS,
+)
 
+# one client per provider, shared by every session so its connection pool stays warm
+_chat_models = {}
+_chat_slots = {
+    "google": asyncio.Semaphore(GOOGLE_MAX_CONCURRENCY),
+    "openai": asyncio.Semaphore(OPENAI_MAX_CONCURRENCY),
+    "fake": asyncio.Semaphore(FAKE_MAX_CONCURRENCY),
+}
 
-def get_chat_model():
-    """Factory function to return appropriate chat model based on available API keys"""
+FAKE_QUESTIONS = [
+    "Thanks. Can you walk me through a project you are particularly proud of?",
+    "Very nice. How did you decide between the approaches you considered?",
+    "Could you elaborate on how you tested that and how it behaved in production?",
+    "Interesting. What would you do differently if you started that project today?",
+    "Tell me about a time you disagreed with a teammate. How did you resolve it?",
+]
+FAKE_EVALUATION = (
+    "The candidate answered every question and gave concrete examples from their "
+    "experience.\nSCORE: 7"
+)
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    Offline chat model with deterministic replies, for load tests.
+
+    The reply is picked from `FAKE_QUESTIONS` by a hash of the prompt, or is a fixed
+    evaluation when the evaluator prompt asks for a score. It arrives after `latency`
+    seconds and is streamed one word every `token_latency` seconds, without blocking the
+    event loop.
+    """
+
+    latency: float = FAKE_CHAT_LATENCY
+    token_latency: float = FAKE_CHAT_TOKEN_LATENCY
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake"
+
+    def _reply(self, messages) -> str:
+        prompt = get_buffer_string(messages)
+        if "SCORE:" in prompt:
+            return FAKE_EVALUATION
+        return FAKE_QUESTIONS[zlib.crc32(prompt.encode()) % len(FAKE_QUESTIONS)]
+
+    def _duration(self, reply: str) -> float:
+        return self.latency + self.token_latency * len(reply.split(" "))
+
+    def _result(self, reply: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=reply))])
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        reply = self._reply(messages)
+        time.sleep(self._duration(reply))
+        return self._result(reply)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        reply = self._reply(messages)
+        await asyncio.sleep(self._duration(reply))
+        return self._result(reply)
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        words = self._reply(messages).split(" ")
+        for index, word in enumerate(words):
+            if index:
+                await asyncio.sleep(self.token_latency)
+            content = word if index == len(words) - 1 else word + " "
+            yield ChatGenerationChunk(message=AIMessageChunk(content=content))
+
+
+def get_chat_provider() -> str:
+    """Return the configured chat model provider, or pick one based on available API keys"""
+    if CHAT_PROVIDER:
+        return CHAT_PROVIDER
     if os.getenv("GOOGLE_API_KEY"):
+        return "google"
+    elif os.getenv("OPENAI_API_KEY"):
+        return "openai"
+    else:
+        raise Exception("No API keys found for chat model")
+
+
+def get_chat_model_name() -> str:
+    """Return the provider and name of the model `get_chat_model` talks to"""
+    provider = get_chat_provider()
+    model = {"google": GEMINI_MODEL_NAME, "openai": OPENAI_MODEL_NAME}.get(provider, provider)
+    return f"{provider}:{model}"
+
+
+def _create_chat_model(provider: str):
+    if provider == "fake":
+        return FakeChatModel()
+    if provider == "google":
         return ChatGoogleGenerativeAI(
             model=GEMINI_MODEL_NAME,
             temperature=0,
             google_api_key=os.getenv("GOOGLE_API_KEY")
         )
-    elif os.getenv("OPENAI_API_KEY"):
-        return ChatOpenAI(
-            model=OPENAI_MODEL_NAME,
-            temperature=0,
-            openai_api_key=os.getenv("OPENAI_API_KEY")
-        )
-    else:
-        raise Exception("No API keys found for chat model")
-    
-chat_model = get_chat_model()
+    return ChatOpenAI(
+        model=OPENAI_MODEL_NAME,
+        temperature=0,
+        openai_api_key=os.getenv("OPENAI_API_KEY")
+    )
+
+
+def get_chat_model():
+    """
+    Return the shared chat model for the available API key, creating it on first use.
+
+    The client keeps its HTTP/gRPC connections alive between calls, so reusing it avoids a
+    new TLS handshake and client setup on every turn.
+    """
+    provider = get_chat_provider()
+    if provider not in _chat_models:
+        _chat_models[provider] = _create_chat_model(provider)
+    return _chat_models[provider]
+
+
+@asynccontextmanager
+async def chat_slot():
+    """Wait for one of the provider's concurrent request slots"""
+    started_at = time.perf_counter()
+    async with _chat_slots[get_chat_provider()]:
+        latency.since("llm_slot_wait", started_at)
+        yield
+
+
+def has_chat_model_credentials() -> bool:
+    """Whether an API key for one of the supported chat models is configured"""
+    if CHAT_PROVIDER == "fake":
+        return True
+    return bool(os.getenv("GOOGLE_API_KEY") or os.getenv("OPENAI_API_KEY"))
+
 
 class InterViewer:
+    """
+    The interviewer of one session.
+
+    The full conversation is kept in `memory`, but each question is generated from a bounded
+    history: the last `memory_turns` question/answer pairs verbatim, trimmed further to stay
+    within `memory_token_budget`, plus a rolling `summary` of the turns before them, which
+    `update_summary` extends as turns fall out of the window. Turns that left the window are
+    still sent verbatim until the summary covering them is in, as long as they fit in
+    `memory_token_budget`. With `memory_turns` 0 the whole conversation is sent every turn.
+    """
+
     def __init__(
         self,
         guidelines,
@@ -42,6 +189,10 @@ class InterViewer:
         resume,
         role_description,
         must_have_questions,
+        memory_turns: int = MEMORY_TURNS,
+        memory_token_budget: int = MEMORY_TOKEN_BUDGET,
+        summary: str = "",
+        summarized_messages: int = 0,
     ):
         self.name = name
         self.llm = get_chat_model()
@@ -66,12 +217,17 @@ class InterViewer:
             ]
         )
         self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-        self.interviewer = LLMChain(
-            llm=self.llm, prompt=self.prompt, memory=self.memory, verbose=False
-        )
-    
+        self.memory_turns = memory_turns
+        self.memory_token_budget = memory_token_budget
+        # the messages before `summarized_messages` are only sent through `summary`
+        self.summary = summary
+        self.summarized_messages = summarized_messages
+        self.summarizing = None
+        # number of messages already written to the session store
+        self.persisted_messages = 0
+
     def to_dict(self):
-        """Serialize the InterViewer instance to a dict"""
+        """Serialize the InterViewer settings to a dict, the conversation is stored per turn"""
         return {
             "guidelines": self.guidelines,
             "name": self.name,
@@ -79,11 +235,23 @@ class InterViewer:
             "resume": self.resume,
             "role_description": self.role_description,
             "must_have_questions": self.must_have_questions,
-            "first_msg": self.memory.chat_memory.messages[0].content,
+            "memory_turns": self.memory_turns,
+            "memory_token_budget": self.memory_token_budget,
+            "summary": self.summary,
+            "summarized_messages": self.summarized_messages,
         }
 
+    @property
+    def unpersisted_messages(self):
+        return self.memory.chat_memory.messages[self.persisted_messages :]
+
+    def add_messages(self, messages):
+        """Add messages loaded from the session store to the conversation memory"""
+        self.memory.chat_memory.add_messages(messages)
+        self.persisted_messages += len(messages)
+
     @classmethod
-    def from_dict(cls, data):
+    def from_dict(cls, data, messages=()):
         instance = cls(
             guidelines=data.get("guidelines"),
             name=data.get("name"),
@@ -91,18 +259,121 @@ class InterViewer:
             resume=data.get("resume"),
             role_description=data.get("role_description"),
             must_have_questions=data.get("must_have_questions"),
+            memory_turns=data.get("memory_turns", MEMORY_TURNS),
+            memory_token_budget=data.get("memory_token_budget", MEMORY_TOKEN_BUDGET),
+            summary=data.get("summary", ""),
+            summarized_messages=data.get("summarized_messages", 0),
         )
-        chat_memory = data.get("first_msg")
-        if chat_memory:
-            instance.memory.chat_memory.add_ai_message(chat_memory)
+        instance.add_messages(messages)
+        # sessions stored before the conversation was persisted only kept the first message
+        if not messages and data.get("first_msg"):
+            instance.memory.chat_memory.add_ai_message(data["first_msg"])
         return instance
 
-    async def generate_question(self, user_response: str = "ask me a question") -> str:
+    def _record_confidence(self, confidence):
+        """Attach the STT confidence to the candidate answer that was just saved"""
+        if confidence is not None:
+            answer = self.memory.chat_memory.messages[-2]
+            answer.response_metadata["confidence"] = confidence
+
+    def _window(self):
+        """Split the unsummarized messages into those to fold into the summary and those to
+        send verbatim"""
+        recent = self.memory.chat_memory.messages[self.summarized_messages :]
+        keep = recent[-2 * self.memory_turns :]
+        while len(keep) > 2 and (
+            estimate_tokens(get_buffer_string(keep)) > self.memory_token_budget
+        ):
+            keep = keep[2:]
+        return recent[: len(recent) - len(keep)], keep
+
+    def history(self):
+        """The conversation history sent with the next question: the summary and every
+        message it does not cover yet, or only the verbatim window once those go over
+        `memory_token_budget` (when summarizing fails or lags behind)"""
+        if self.memory_turns <= 0:
+            return self.memory.chat_memory.messages
+        recent = self.memory.chat_memory.messages[self.summarized_messages :]
+        if estimate_tokens(get_buffer_string(recent)) > self.memory_token_budget:
+            _, recent = self._window()
+        if not self.summary:
+            return recent
+        return [
+            SystemMessage(content=f"Summary of the interview so far:\n{self.summary}"),
+            *recent,
+        ]
+
+    @property
+    def needs_summary(self) -> bool:
+        return self.memory_turns > 0 and bool(self._window()[0])
+
+    async def update_summary(self) -> bool:
+        """Fold the turns that left the verbatim window into the summary, returns whether
+        the summary changed"""
+        fold, _ = self._window() if self.memory_turns > 0 else ([], None)
+        if not fold:
+            return False
+
+        messages = [
+            SystemMessage(
+                content=summary_prompt.format(
+                    role=self.role,
+                    summary=self.summary or "(none yet)",
+                    new_lines=get_buffer_string(
+                        fold, human_prefix="Candidate", ai_prefix=self.name
+                    ),
+                    max_words=MEMORY_SUMMARY_WORDS,
+                )
+            )
+        ]
+        async with chat_slot():
+            with latency.time("llm_summary"):
+                result = await self.llm.ainvoke(messages)
+        self.summary = result.content.strip()
+        self.summarized_messages += len(fold)
+        return True
+
+    async def generate_question(
+        self, user_response: str = "ask me a question", confidence: float = None
+    ) -> str:
         """generate the next interviewer question"""
 
-        next_question = await self.interviewer.apredict(input=user_response)
+        messages = self.prompt.format_messages(input=user_response, chat_history=self.history())
+        async with chat_slot():
+            with latency.time("llm"):
+                next_question = (await self.llm.ainvoke(messages)).content
+        self.memory.save_context({"input": user_response}, {"text": next_question})
+        self._record_confidence(confidence)
         return next_question
 
+    async def stream_question(
+        self,
+        user_response: str = "ask me a question",
+        confidence: float = None,
+        save_input: bool = True,
+    ):
+        """stream the next interviewer question token by token, saving it to memory when done
+
+        With `save_input` False only the question is kept, as for the opening question.
+        """
+
+        messages = self.prompt.format_messages(input=user_response, chat_history=self.history())
+        next_question = ""
+        async with chat_slot():
+            started_at = time.perf_counter()
+            async for chunk in self.llm.astream(messages):
+                if not next_question:
+                    latency.since("llm_first_token", started_at)
+                next_question += chunk.content
+                yield chunk.content
+            latency.since("llm", started_at)
+
+        if not save_input:
+            self.memory.chat_memory.add_ai_message(next_question)
+            return
+        self.memory.save_context({"input": user_response}, {"text": next_question})
+        self._record_confidence(confidence)
+
 
 async def generate_questions(resume, role, role_description) -> str:
 
@@ -113,11 +384,13 @@ async def generate_questions(resume, role, role_description) -> str:
     llm = get_chat_model()
     question_generator_chain = LLMChain(llm=llm, prompt=question_generator_template)
 
-    guidelines = await question_generator_chain.arun(
-        role=role,
-        role_description=role_description,
-        resume_text=resume,
-    )
+    async with chat_slot():
+        with latency.time("llm_guidelines"):
+            guidelines = await question_generator_chain.arun(
+                role=role,
+                role_description=role_description,
+                resume_text=resume,
+            )
 
     return guidelines
 
@@ -137,8 +410,10 @@ async def evaluate_interview(
 
     question_generator_chain = LLMChain(llm=llm, prompt=evaluator_template)
 
-    evaluation = await question_generator_chain.arun(
-        role=role, role_description=role_description, interview=interview
-    )
+    async with chat_slot():
+        with latency.time("llm_evaluation"):
+            evaluation = await question_generator_chain.arun(
+                role=role, role_description=role_description, interview=interview
+            )
 
     return evaluation
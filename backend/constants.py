@@ -1,13 +1,56 @@
 import os
 
 DATABASE_NAME = os.environ.get("DATABASE_NAME", "app.db")
+# threads (and pooled connections) serving database reads
+DB_READERS = int(os.environ.get("DB_READERS", 4))
+# searches matching more documents than this list the newest hits instead of ranking them all
+SEARCH_RANKED_MATCHES = int(os.environ.get("SEARCH_RANKED_MATCHES", 1000))
+# background jobs (post-interview evaluation)
+JOB_CONCURRENCY = int(os.environ.get("JOB_CONCURRENCY", 2))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", 5))
+JOB_BACKOFF = float(os.environ.get("JOB_BACKOFF", 10))  # seconds, doubled on each retry
+JOB_LEASE = float(os.environ.get("JOB_LEASE", 600))  # a running job is retried after this
+JOB_POLL_INTERVAL = float(os.environ.get("JOB_POLL_INTERVAL", 2))
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
+REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 64))
+# "redis" or "memory" for an in-process store when developing without a Redis server
+SESSION_BACKEND = os.environ.get("SESSION_BACKEND", "redis")
+# seconds of inactivity after which an abandoned session expires
+SESSION_TTL = int(os.environ.get("SESSION_TTL", 2 * 60 * 60))
+# interviewers kept in memory per worker so reconnects don't rebuild prompts and chains
+MAX_CACHED_INTERVIEWERS = int(os.environ.get("MAX_CACHED_INTERVIEWERS", 256))
+# generated interview guidelines are reused for the same resume, role and description;
+# entries expire after this many seconds without a hit (0 disables the cache)
+GUIDELINE_CACHE_TTL = int(os.environ.get("GUIDELINE_CACHE_TTL", 7 * 24 * 60 * 60))
+# set when running several worker processes; prometheus_client writes each process's metrics
+# there and /metrics reports the sum of them. Wipe it before each deployment starts, or the
+# counters of the previous deployment's workers keep being added in
+PROMETHEUS_MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
 ALGORITHM = os.environ.get("ALGORITHM", "HS256")
 SECRET_KEY = os.environ.get("SECRET_KEY", "your_default_secret_key")
 
 OPENAI_MODEL_NAME = os.environ.get("OPENAI_MODEL_NAME", "gpt-4o-mini")
 GEMINI_MODEL_NAME = os.environ.get("GEMINI_MODEL_NAME", "gemini-2.0-flash-thinking-exp-01-21")
 
+# chat model provider: "google" or "openai" (by default, whichever API key is set) or "fake",
+# an offline stand-in with deterministic replies for load tests. The fake answers after
+# FAKE_CHAT_LATENCY seconds and then streams one word every FAKE_CHAT_TOKEN_LATENCY seconds.
+CHAT_PROVIDER = os.environ.get("CHAT_PROVIDER")
+FAKE_CHAT_LATENCY = float(os.environ.get("FAKE_CHAT_LATENCY", 0.5))
+FAKE_CHAT_TOKEN_LATENCY = float(os.environ.get("FAKE_CHAT_TOKEN_LATENCY", 0.02))
+
+# maximum concurrent requests per chat model provider
+GOOGLE_MAX_CONCURRENCY = int(os.environ.get("GOOGLE_MAX_CONCURRENCY", 16))
+OPENAI_MAX_CONCURRENCY = int(os.environ.get("OPENAI_MAX_CONCURRENCY", 16))
+FAKE_MAX_CONCURRENCY = int(os.environ.get("FAKE_MAX_CONCURRENCY", 16))
+
+# conversation memory: the last MEMORY_TURNS question/answer pairs are sent verbatim (within
+# MEMORY_TOKEN_BUDGET) and older turns are folded into a rolling summary; 0 turns sends the
+# whole conversation every turn. Roles can override both in role_settings.
+MEMORY_TURNS = int(os.environ.get("MEMORY_TURNS", 6))
+MEMORY_TOKEN_BUDGET = int(os.environ.get("MEMORY_TOKEN_BUDGET", 2000))
+MEMORY_SUMMARY_WORDS = int(os.environ.get("MEMORY_SUMMARY_WORDS", 200))
+
 INTERVIEW_MODEL = (
     os.environ.get("OPENAI_MODEL_NAME", "gpt-4o-mini") 
     if os.environ.get("OPENAI_API_KEY") 
@@ -15,7 +58,63 @@ INTERVIEW_MODEL = (
 )
 INTERVIEW_NAME = os.environ.get("STT_MODEL", "Anna")
 STT_MODEL = os.environ.get("STT_MODEL", "tiny")
+# STT backend for STT_MODEL: "whisper" (openai-whisper, fp32), "whisper-int8" (openai-whisper
+# with int8 dynamic quantization on the CPU), "faster-whisper" (CTranslate2, STT_COMPUTE_TYPE
+# on the CPU, needs requirements-faster-whisper.txt) or "fake" (no model, for tests)
+STT_ENGINE = os.environ.get("STT_ENGINE", "whisper")
+STT_COMPUTE_TYPE = os.environ.get("STT_COMPUTE_TYPE", "int8")
+
+# "memory" decodes answers in-process with PyAV, "file" goes through SAVE_DIR and ffmpeg
+AUDIO_DECODER = os.environ.get("AUDIO_DECODER", "memory")
+
+# voice activity detection: drop silence and cut chunks at pauses before Whisper
+STT_VAD = os.environ.get("STT_VAD", "true").lower() == "true"
+VAD_THRESHOLD_DB = float(os.environ.get("VAD_THRESHOLD_DB", 12))
+VAD_MIN_SILENCE_MS = int(os.environ.get("VAD_MIN_SILENCE_MS", 300))
+
+# chunks from all sessions arriving within STT_BATCH_WINDOW seconds are decoded together
+STT_BATCH_WINDOW = float(os.environ.get("STT_BATCH_WINDOW", 0.05))
+STT_MAX_BATCH_SIZE = int(os.environ.get("STT_MAX_BATCH_SIZE", 16))
+
+# STT/TTS inference: 0 runs the models in the web process, N > 0 starts a pool of N processes
+INFERENCE_WORKERS = int(os.environ.get("INFERENCE_WORKERS", 0))
+INFERENCE_MAX_PENDING = int(os.environ.get("INFERENCE_MAX_PENDING", 32))
+# torch threads per worker, defaults to the cores divided between the workers
+INFERENCE_TORCH_THREADS = int(os.environ.get("INFERENCE_TORCH_THREADS", 0))
+# run one dummy STT/TTS inference after loading so the first candidate doesn't pay for it
+WARMUP_MODELS = os.environ.get("WARMUP_MODELS", "true").lower() == "true"
+# replace STT and TTS with stand-ins that load no model, for load tests. They take
+# FAKE_STT_RTF / FAKE_TTS_RTF seconds per second of audio transcribed / synthesized.
+FAKE_INFERENCE = os.environ.get("FAKE_INFERENCE", "false").lower() == "true"
+FAKE_STT_RTF = float(os.environ.get("FAKE_STT_RTF", 0.1))
+FAKE_TTS_RTF = float(os.environ.get("FAKE_TTS_RTF", 0.2))
+
+# streaming STT: while the candidate speaks, transcribe the answer up to its last pause once
+# STT_STREAM_WINDOW seconds are buffered. Whisper pads every chunk to 30 seconds, so shorter
+# windows give earlier partial transcripts for more encoder time.
+STREAMING_STT = os.environ.get("STREAMING_STT", "true").lower() == "true"
+STT_STREAM_WINDOW = float(os.environ.get("STT_STREAM_WINDOW", 20))
+
+# stream the LLM reply and synthesize it sentence by sentence instead of all at once
+PIPELINED_REPLIES = os.environ.get("PIPELINED_REPLIES", "true").lower() == "true"
+
 TTS_MODEL = os.environ.get("TTS_MODEL", "tts_models/en/ljspeech/tacotron2-DDC")
+# Kokoro voice and speed of the interviewer
+TTS_VOICE = os.environ.get("TTS_VOICE", "af_heart")
+TTS_SPEED = float(os.environ.get("TTS_SPEED", 1.0))
+# synthesized lines are cached by text, voice and speed: the most recently used
+# TTS_CACHE_MAX_BYTES of audio in memory per worker and, with TTS_CACHE_DIR set, up to
+# TTS_CACHE_DISK_MAX_BYTES on disk, shared by the workers and filled by scripts/prewarm_tts
+TTS_CACHE_MAX_BYTES = int(os.environ.get("TTS_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+TTS_CACHE_DIR = os.environ.get("TTS_CACHE_DIR")
+TTS_CACHE_DISK_MAX_BYTES = int(os.environ.get("TTS_CACHE_DISK_MAX_BYTES", 1024 * 1024 * 1024))
+# lines the interviewer says in most interviews, prewarmed into the TTS cache; replies
+# synthesize them as sentences of their own, however short, so the cached audio is used
+TTS_COMMON_LINES = (
+    "Very nice.",
+    "Could you elaborate on that?",
+    "Thank you for your time, that concludes our interview.",
+)
 
 # if multilingual specify 'en' or 'fr'
 MULTILINGUAL_STT = os.environ.get("MULTILINGUAL_STT", False)  # if multilingual specify 'en' or 'fr'
@@ -1,199 +1,657 @@
 import json
+import base64
+import time
+import queue
+import datetime
+import asyncio
 import sqlite3
-from .constants import DATABASE_NAME
+import threading
 
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from .constants import DATABASE_NAME, DB_READERS, SEARCH_RANKED_MATCHES
+from .metrics import timed
+from .migrations import interview_summary, migrate, parse_score, search_documents
 
-def get_role_settings(role: str):
-    """Fetch interview settings for a specific role."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
+
+class Database:
+    """
+    SQLite access shared by the whole app.
+
+    Writes go through a single connection on a dedicated thread and reads through a pool of
+    connections on `readers` threads. The database runs in WAL mode, so admin reads never
+    wait for interview writes (or the other way around), and the connections are reused so
+    SQLite's per-connection prepared statement cache stays warm. The async `read`/`write`
+    helpers keep all of this off the event loop.
+    """
+
+    def __init__(self, path=DATABASE_NAME, readers=DB_READERS):
+        self.path = path
+        self._readers = queue.SimpleQueue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        self._read_executor = ThreadPoolExecutor(readers, thread_name_prefix="db-read")
+        self._write_executor = ThreadPoolExecutor(1, thread_name_prefix="db-write")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def reader(self):
+        """Borrow a pooled read connection."""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def writer(self):
+        """Use the writer connection inside a transaction, committed on success."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            with self._writer:
+                yield self._writer
+
+    @timed("db_read")
+    async def read(self, fn, *args):
+        """Run `fn(conn, *args)` on a pooled read connection in the reader threads."""
+
+        def _run():
+            with self.reader() as conn:
+                return fn(conn, *args)
+
+        return await asyncio.get_running_loop().run_in_executor(self._read_executor, _run)
+
+    @timed("db_write")
+    async def write(self, fn, *args):
+        """Run `fn(conn, *args)` in a transaction on the writer thread."""
+
+        def _run():
+            with self.writer() as conn:
+                return fn(conn, *args)
+
+        return await asyncio.get_running_loop().run_in_executor(self._write_executor, _run)
+
+
+database = Database()
+
+
+async def migrate_db():
+    """Bring the database schema up to date."""
+    await database.write(migrate)
+
+
+async def get_role_settings(role: str):
+    """
+    Fetch interview settings for a specific role: its custom questions, job description and
+    memory settings (None for the defaults).
+    """
+
+    def _query(conn):
+        result = conn.execute(
             """
-            SELECT custom_questions, job_description
+            SELECT custom_questions, job_description, memory_turns, memory_token_budget
             FROM role_settings
             WHERE role = ?
             """,
             (role,),
+        ).fetchone()
+        return result if result else (None, None, None, None)
+
+    return await database.read(_query)
+
+
+def _timestamp(created_at):
+    """Format an epoch timestamp like SQLite's CURRENT_TIMESTAMP (UTC)."""
+    if created_at is None:
+        return None
+    moment = datetime.datetime.fromtimestamp(created_at, datetime.timezone.utc)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _insert_interview(conn, session_id, role, role_description, messages, evaluation):
+    summary = interview_summary(messages, evaluation)
+    conn.execute(
+        """
+        INSERT INTO interviews (
+            session_id, role, role_description, evaluation, evaluation_status,
+            preview, turn_count, score, created_at
         )
-        result = cursor.fetchone()
-        return result if result else (None, None)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        """,
+        (
+            session_id,
+            role,
+            role_description,
+            json.dumps(evaluation) if evaluation is not None else None,
+            "done" if evaluation is not None else "pending",
+            summary["preview"],
+            summary["turn_count"],
+            summary["score"],
+        ),
+    )
+    conn.executemany(
+        """
+        INSERT INTO interview_messages (session_id, turn, role, message, created_at, confidence)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        [
+            (
+                session_id,
+                turn,
+                message["role"],
+                message["message"],
+                _timestamp(message.get("created_at")),
+                message.get("confidence"),
+            )
+            for turn, message in enumerate(messages)
+        ],
+    )
+    conn.executemany(
+        "INSERT INTO interview_search (session_id, role, kind, body) VALUES (?, ?, ?, ?)",
+        search_documents(session_id, role, messages, evaluation),
+    )
 
 
-def save_interview_to_db(session_id, role, role_description, messages, evaluation):
+async def save_interview_to_db(session_id, role, role_description, messages, evaluation):
     """Save a new interview to the database."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
+
+    def _insert(conn):
         try:
-            cursor.execute(
-                """
-                INSERT INTO interviews (session_id, role, role_description, messages, evaluation)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    role,
-                    role_description,
-                    json.dumps(messages),
-                    json.dumps(evaluation),
-                ),
-            )
-            conn.commit()
+            _insert_interview(conn, session_id, role, role_description, messages, evaluation)
         except sqlite3.IntegrityError as e:
             print(f"Error saving interview: {e}")
 
+    await database.write(_insert)
+
+
+async def queue_interview_evaluation_db(session_id, role, role_description, messages):
+    """
+    Save a finished interview without its evaluation, together with the job that will
+    evaluate it, in one transaction.
+
+    Returns the job id, or None if the interview was already saved.
+    """
+
+    def _insert(conn):
+        try:
+            _insert_interview(conn, session_id, role, role_description, messages, None)
+        except sqlite3.IntegrityError as e:
+            print(f"Error saving interview: {e}")
+            return None
+        return _insert_job(conn, "evaluate_interview", {"session_id": session_id})
+
+    return await database.write(_insert)
+
+
+async def save_interview_evaluation_db(session_id, evaluation):
+    """Store the evaluation of an interview saved by `queue_interview_evaluation_db`."""
+
+    def _update(conn):
+        row = conn.execute(
+            "SELECT role, evaluation_status FROM interviews WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        if not row or row[1] == "done":
+            return
+        conn.execute(
+            """
+            UPDATE interviews
+            SET evaluation = ?, score = ?, evaluation_status = 'done'
+            WHERE session_id = ?
+            """,
+            (json.dumps(evaluation), parse_score(evaluation), session_id),
+        )
+        conn.executemany(
+            "INSERT INTO interview_search (session_id, role, kind, body) VALUES (?, ?, ?, ?)",
+            search_documents(session_id, row[0], [], evaluation),
+        )
+
+    await database.write(_update)
+
+
+async def set_evaluation_status_db(session_id, status):
+    """Set the evaluation status (pending, done or failed) shown on an interview."""
+
+    def _update(conn):
+        conn.execute(
+            "UPDATE interviews SET evaluation_status = ? WHERE session_id = ?",
+            (status, session_id),
+        )
+
+    await database.write(_update)
+
+
+def _insert_job(conn, kind, payload, delay=0.0):
+    cursor = conn.execute(
+        "INSERT INTO jobs (kind, payload, run_at) VALUES (?, ?, ?)",
+        (kind, json.dumps(payload), time.time() + delay),
+    )
+    return cursor.lastrowid
+
+
+async def enqueue_job_db(kind, payload, delay=0.0):
+    """Add a job to the queue and return its id."""
+    return await database.write(_insert_job, kind, payload, delay)
+
+
+async def claim_jobs_db(limit, lease):
+    """
+    Claim up to `limit` jobs that are due, including running jobs whose lease expired
+    because their worker died, and lock them for `lease` seconds.
+    """
+
+    def _claim(conn):
+        now = time.time()
+        rows = conn.execute(
+            """
+            UPDATE jobs
+            SET status = 'running', attempts = attempts + 1, locked_until = ?,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id IN (
+                SELECT id FROM jobs
+                WHERE (status = 'queued' AND run_at <= ?)
+                   OR (status = 'running' AND locked_until <= ?)
+                ORDER BY run_at
+                LIMIT ?
+            )
+            RETURNING id, kind, payload, attempts
+            """,
+            (now + lease, now, now, limit),
+        ).fetchall()
+        return [
+            {"id": row[0], "kind": row[1], "payload": json.loads(row[2]), "attempts": row[3]}
+            for row in rows
+        ]
+
+    return await database.write(_claim)
+
+
+async def finish_job_db(job_id, status, error=None, run_at=None):
+    """Mark a claimed job done or failed, or queue it again to run at `run_at`."""
+
+    def _update(conn):
+        conn.execute(
+            """
+            UPDATE jobs
+            SET status = ?, last_error = coalesce(?, last_error), run_at = coalesce(?, run_at),
+                locked_until = NULL, updated_at = CURRENT_TIMESTAMP
+            WHERE id = ?
+            """,
+            (status, error, run_at, job_id),
+        )
+
+    await database.write(_update)
+
 
-def create_role_to_db(role: str, custom_questions, job_description):
+async def requeue_jobs_db(status="failed", kind=None, job_ids=None):
+    """Queue matching jobs to run again now with a fresh retry budget; returns the count."""
+    conditions, params = ["status = ?"], [status]
+    if kind:
+        conditions.append("kind = ?")
+        params.append(kind)
+    if job_ids:
+        conditions.append(f"id IN ({', '.join('?' * len(job_ids))})")
+        params.extend(job_ids)
+
+    def _update(conn):
+        cursor = conn.execute(
+            f"""
+            UPDATE jobs
+            SET status = 'queued', attempts = 0, run_at = ?, locked_until = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE {' AND '.join(conditions)}
+            """,
+            (time.time(), *params),
+        )
+        return cursor.rowcount
+
+    return await database.write(_update)
+
+
+async def create_role_to_db(
+    role: str,
+    custom_questions,
+    job_description,
+    memory_turns=None,
+    memory_token_budget=None,
+):
     """Add or update a role in the role_settings table."""
-    try:
-        with sqlite3.connect(DATABASE_NAME) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO role_settings (role, custom_questions, job_description)
-                VALUES (?, ?, ?)
-                """,
-                (role, custom_questions, job_description),
+
+    def _insert(conn):
+        conn.execute(
+            """
+            INSERT INTO role_settings (
+                role, custom_questions, job_description, memory_turns, memory_token_budget
             )
-            conn.commit()
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (role, custom_questions, job_description, memory_turns, memory_token_budget),
+        )
+
+    try:
+        await database.write(_insert)
     except sqlite3.IntegrityError as e:
         raise ValueError(f"Role '{role}' already exists.") from e
     except Exception as e:
         raise ValueError(f"Error occurred while creating the role: {str(e)}") from e
 
 
-def get_interviews_from_db():
-    """Retrieve a list of all interviews."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT session_id, messages FROM interviews")
+def encode_cursor(created_at, session_id):
+    return base64.urlsafe_b64encode(f"{created_at}|{session_id}".encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, session_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    return created_at, session_id
+
+
+def _parse_date_bound(value, name):
+    """
+    Parse an ISO date or datetime into the format `created_at` is stored in (UTC).
+
+    Returns the formatted bound and whether it was a date without a time.
+    """
+    try:
+        if len(value) == 10:
+            return datetime.date.fromisoformat(value).strftime("%Y-%m-%d %H:%M:%S"), True
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError as e:
+        raise ValueError(f"Invalid {name}: {value}, expected an ISO date or datetime") from e
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return moment.strftime("%Y-%m-%d %H:%M:%S"), False
+
+
+async def get_interviews_from_db(limit=50, cursor=None, role=None, since=None, until=None):
+    """
+    Retrieve one page of interview summaries, newest first.
+
+    Only the stored listing columns are read, never the messages. Pages are keyset
+    paginated on (created_at, session_id): pass the returned `next_cursor` to get the next
+    page. `since`/`until` filter on the creation time, inclusive. They are ISO dates or
+    datetimes, in UTC unless they carry an offset; a date as `until` includes that whole day.
+    """
+    conditions, params = [], []
+    if role:
+        conditions.append("role = ?")
+        params.append(role)
+    if since:
+        conditions.append("created_at >= ?")
+        params.append(_parse_date_bound(since, "since")[0])
+    if until:
+        bound, is_date = _parse_date_bound(until, "until")
+        if is_date:
+            next_day = datetime.date.fromisoformat(until) + datetime.timedelta(days=1)
+            conditions.append("created_at < ?")
+            params.append(next_day.strftime("%Y-%m-%d %H:%M:%S"))
+        else:
+            conditions.append("created_at <= ?")
+            params.append(bound)
+    if cursor:
+        conditions.append("(created_at, session_id) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
+    def _query(conn):
+        rows = conn.execute(
+            f"""
+            SELECT session_id, role, preview, created_at, turn_count, score, evaluation_status
+            FROM interviews
+            {where}
+            ORDER BY created_at DESC, session_id DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1),
+        ).fetchall()
+        interviews = [
+            {
+                "session_id": row[0],
+                "role": row[1],
+                "preview": row[2],
+                "created_at": row[3],
+                "turn_count": row[4],
+                "score": row[5],
+                "evaluation_status": row[6],
+            }
+            for row in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(rows[limit - 1][3], rows[limit - 1][0])
+        return {"interviews": interviews, "next_cursor": next_cursor}
+
+    return await database.read(_query)
+
+
+async def search_interviews_db(query, kind=None, role=None, limit=20):
+    """
+    Full-text search over interview questions, answers and evaluations, best matches first.
+
+    `query` uses the FTS5 query syntax (terms, "phrases", prefix*, AND/OR/NOT). Each hit is
+    the questions, answers or evaluation of one interview with a snippet around the matched
+    terms, which are wrapped in <mark> tags. Queries matching up to SEARCH_RANKED_MATCHES
+    documents are ranked by bm25, so the best hits are found however old they are. Ranking
+    has to score every match, so broader queries list the most recently saved hits instead,
+    with a `score` of None, and stay as fast as rare ones.
+    """
+    conditions, params = ["interview_search MATCH ?"], [query]
+    if kind:
+        conditions.append("kind = ?")
+        params.append(kind)
+    if role:
+        conditions.append("role = ?")
+        params.append(role)
+    where = " AND ".join(conditions)
+
+    def _query(conn):
+        newest = [
+            row[0]
+            for row in conn.execute(
+                f"""
+                SELECT rowid FROM interview_search
+                WHERE {where}
+                ORDER BY rowid DESC
+                LIMIT ?
+                """,
+                (*params, SEARCH_RANKED_MATCHES + 1),
+            )
+        ]
+        if not newest:
+            return []
+        if len(newest) <= SEARCH_RANKED_MATCHES:
+            rank, bound, order = "rank", "", "rank"
+        else:
+            # only the newest `limit` hits are read, walking the index back from the latest
+            rank, bound, order = "NULL AS rank", f"AND rowid >= {newest[:limit][-1]}", "rowid DESC"
         return [
             {
                 "session_id": row[0],
-                "messages": (json.loads(row[1]) if row[1] else "Empty Interview"),
+                "role": row[1],
+                "kind": row[2],
+                "created_at": row[3],
+                "snippet": row[4],
+                "score": None if row[5] is None else -row[5],
             }
-            for row in cursor.fetchall()
+            for row in conn.execute(
+                f"""
+                SELECT hits.session_id, hits.role, hits.kind, interviews.created_at,
+                       hits.snippet, hits.rank
+                FROM (
+                    SELECT rowid, session_id, role, kind, {rank},
+                           snippet(interview_search, 3, '<mark>', '</mark>', '...', 16)
+                               AS snippet
+                    FROM interview_search
+                    WHERE {where} {bound}
+                    ORDER BY {order}
+                    LIMIT ?
+                ) AS hits
+                JOIN interviews ON interviews.session_id = hits.session_id
+                ORDER BY hits.{order}
+                """,
+                (*params, limit),
+            )
         ]
 
+    try:
+        return await database.read(_query)
+    except sqlite3.OperationalError as e:
+        raise ValueError(f"Invalid search query: {e}") from e
+
 
-def create_interview_role_to_db(
+async def create_interview_role_to_db(
     session_id: str, role: str, role_description: str, messages, evaluation
 ):
     """Save an interview with role details into the database."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
+
+    def _insert(conn):
         try:
-            cursor.execute(
-                """
-                INSERT INTO interviews (session_id, role, role_description, messages, evaluation)
-                VALUES (?, ?, ?, ?, ?)
-                """,
-                (
-                    session_id,
-                    role,
-                    role_description,
-                    json.dumps(messages),
-                    json.dumps(evaluation),
-                ),
-            )
-            conn.commit()
+            _insert_interview(conn, session_id, role, role_description, messages, evaluation)
         except sqlite3.IntegrityError as e:
             print(f"Error creating interview: {e}")
 
+    await database.write(_insert)
 
-def get_interview_detail_from_db(session_id):
+
+def _select_interview_messages(conn, session_id):
+    return [
+        {"role": row[0], "message": row[1], "created_at": row[2], "confidence": row[3]}
+        for row in conn.execute(
+            """
+            SELECT role, message, created_at, confidence
+            FROM interview_messages
+            WHERE session_id = ?
+            ORDER BY turn
+            """,
+            (session_id,),
+        )
+    ]
+
+
+async def get_interview_messages_from_db(session_id):
+    """Fetch the messages of an interview in conversation order."""
+    return await database.read(_select_interview_messages, session_id)
+
+
+async def get_interview_detail_from_db(session_id):
     """Fetch detailed information for a specific interview."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
+
+    def _query(conn):
+        result = conn.execute(
             """
-            SELECT role, role_description, messages, evaluation
+            SELECT role, role_description, evaluation, evaluation_status
             FROM interviews WHERE session_id = ?
             """,
             (session_id,),
-        )
-        result = cursor.fetchone()
+        ).fetchone()
         if not result:
             return None
         return {
             "session_id": session_id,
             "role": result[0],
             "role_description": result[1],
-            "messages": json.loads(result[2]),
-            "evaluation": json.loads(result[3]),
+            "messages": _select_interview_messages(conn, session_id),
+            "evaluation": json.loads(result[2]) if result[2] else None,
+            "evaluation_status": result[3],
         }
 
+    return await database.read(_query)
 
-def get_user_from_db(username):
+
+async def get_user_from_db(username):
     """Retrieve a user by username."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
+
+    def _query(conn):
+        row = conn.execute(
             """
             SELECT username, password, role
             FROM users
             WHERE username = ?
             """,
             (username,),
-        )
-        row = cursor.fetchone()
+        ).fetchone()
         if row:
             return {"username": row[0], "password": row[1], "role": row[2]}
-    return None
+        return None
+
+    return await database.read(_query)
 
 
 async def get_roles_db():
     """Retrieve all roles with their job descriptions."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT role, job_description, custom_questions FROM role_settings")
-        roles_with_description = [
+
+    def _query(conn):
+        return [
             {
                 "role": row[0],
                 "job_description": row[1] if row[1] else "No description available",
                 "custom_questions": row[2] if row[2] else "No custom questions available",
             }
-            for row in cursor.fetchall()
+            for row in conn.execute(
+                "SELECT role, job_description, custom_questions FROM role_settings"
+            )
         ]
-    return roles_with_description
+
+    return await database.read(_query)
 
 
 async def get_role_details_db(role: str):
     """Fetch role details from the database."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
+
+    def _query(conn):
+        row = conn.execute(
             """
-            SELECT role, custom_questions, job_description
+            SELECT role, custom_questions, job_description, memory_turns, memory_token_budget
             FROM role_settings
             WHERE role = ?
             """,
             (role,),
-        )
-        row = cursor.fetchone()
+        ).fetchone()
         if row:
             return {
                 "role": row[0],
                 "custom_questions": row[1],
                 "job_description": row[2],
+                "memory_turns": row[3],
+                "memory_token_budget": row[4],
             }
         return None
 
+    return await database.read(_query)
+
+
+ROLE_COLUMNS = ("custom_questions", "job_description", "memory_turns", "memory_token_budget")
+
 
 async def update_role_details_db(role: str, role_data: dict):
-    """Update role details in the database."""
-    with sqlite3.connect(DATABASE_NAME) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            """
+    """Update the role details present in `role_data` in the database."""
+    columns = [column for column in ROLE_COLUMNS if column in role_data]
+    if not columns:
+        return await get_role_details_db(role) is not None
+
+    def _update(conn):
+        cursor = conn.execute(
+            f"""
             UPDATE role_settings
-            SET custom_questions = ?, job_description = ?
+            SET {', '.join(f'{column} = ?' for column in columns)}
             WHERE role = ?
             """,
-            (role_data["custom_questions"], role_data["job_description"], role),
+            (*(role_data[column] for column in columns), role),
         )
-        conn.commit()
-
         if cursor.rowcount == 0:
             return None
         return True
+
+    return await database.write(_update)
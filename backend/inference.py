@@ -0,0 +1,286 @@
+import os
+import asyncio
+import logging
+import itertools
+import threading
+import multiprocessing
+import numpy as np
+import torch
+
+from concurrent.futures import ProcessPoolExecutor
+from .audio import AudioToText
+from .stt_engines import FakeEngine
+from .constants import (
+    STT_MODEL,
+    INFERENCE_WORKERS,
+    INFERENCE_MAX_PENDING,
+    INFERENCE_TORCH_THREADS,
+    WARMUP_MODELS,
+    FAKE_INFERENCE,
+    FAKE_STT_RTF,
+    FAKE_TTS_RTF,
+)
+
+logger = logging.getLogger(__name__)
+
+# models owned by the current worker process, see `_load_models`
+_stt = None
+_tts = None
+# the pool's queue for synthesized segments and its barrier for workers ready to serve
+_segments = None
+_ready = None
+
+
+def _load_tts():
+    from kokoro import KPipeline
+
+    return KPipeline(lang_code="a")
+
+
+def _warm_up_stt(stt: AudioToText):
+    """Run one short decode so the first candidate doesn't pay for lazy init and allocations."""
+    stt.decode_batch([np.zeros(stt.sample_rate, dtype=np.float32)])
+
+
+def _warm_up_tts(tts):
+    for _ in tts("Hello.", voice="af_heart", speed=1.0):
+        pass
+
+
+def _load_models(stt_model: str, torch_threads: int, warm_up: bool, segments, ready):
+    global _stt, _tts, _segments, _ready
+    _segments, _ready = segments, ready
+    torch.set_num_threads(torch_threads)
+    _stt = AudioToText(stt_model)
+    _tts = _load_tts()
+    if warm_up:
+        _warm_up_stt(_stt)
+        _warm_up_tts(_tts)
+
+
+def _wait_until_all_ready() -> int:
+    """Block until every worker of the pool has loaded its models, one call per worker."""
+    _ready.wait()
+    return os.getpid()
+
+
+def _decode_batch(chunks: list) -> list:
+    return _stt.decode_batch(chunks)
+
+
+def _synthesize(call_id: int, text: str, voice: str, speed: float):
+    """Send each segment to the pool as soon as it is synthesized, then None."""
+    try:
+        for result in _tts(text, voice=voice, speed=speed):
+            if result.audio is not None:
+                _segments.put((call_id, np.asarray(result.audio, dtype=np.float32)))
+    finally:
+        _segments.put((call_id, None))
+
+
+class LocalInference:
+    """
+    Run STT and TTS on models loaded in the web process, in worker threads.
+
+    The models are loaded on the first call to `load`, which the app starts in the
+    background at startup; requests that arrive earlier wait for the same load. Without an
+    `stt_model` only the TTS model is loaded.
+    """
+
+    def __init__(self, stt_model: str = STT_MODEL):
+        self.stt_model = stt_model
+        self.stt = None
+        self.tts = None
+        self.concurrency = 1
+        self.ready = {"stt": False, "tts": False}
+        self._loading = None
+
+    async def load(self, warm_up: bool = WARMUP_MODELS):
+        """Load the models once; concurrent callers wait for the same load."""
+        if self._loading is None:
+            self._loading = asyncio.create_task(self._load(warm_up))
+        await asyncio.shield(self._loading)
+
+    async def _load(self, warm_up: bool):
+        if self.stt_model is not None:
+            self.stt = await asyncio.to_thread(AudioToText, self.stt_model)
+            if warm_up:
+                await asyncio.to_thread(_warm_up_stt, self.stt)
+            self.ready["stt"] = True
+
+        self.tts = await asyncio.to_thread(_load_tts)
+        if warm_up:
+            await asyncio.to_thread(_warm_up_tts, self.tts)
+        self.ready["tts"] = True
+
+    async def decode_batch(self, chunks: list) -> list:
+        await self.load()
+        return await asyncio.to_thread(self.stt.decode_batch, chunks)
+
+    async def synthesize(self, text: str, voice: str = "af_heart", speed: float = 1.0):
+        """Yield every audio segment the TTS pipeline produces as soon as it is ready."""
+        await self.load()
+        segments = self.tts(text, voice=voice, speed=speed)
+        while (result := await asyncio.to_thread(next, segments, None)) is not None:
+            if result.audio is not None:
+                yield result.audio
+
+    def shutdown(self):
+        pass
+
+
+class ProcessPoolInference:
+    """
+    Run STT and TTS in a pool of worker processes, each holding its own models.
+
+    At most `max_pending` requests are in flight; further callers wait for a slot, which
+    pushes back on new turns instead of growing an unbounded queue in front of the pool.
+    Workers load (and optionally warm up) their models when they start; `load` starts them
+    all and marks the pool ready once each of them has. Synthesized segments come back
+    through a queue shared by the workers as soon as each is ready, so playback starts
+    after the first segment rather than the whole sentence.
+    """
+
+    def __init__(
+        self,
+        workers: int = INFERENCE_WORKERS,
+        max_pending: int = INFERENCE_MAX_PENDING,
+        stt_model: str = STT_MODEL,
+    ):
+        torch_threads = INFERENCE_TORCH_THREADS or max(1, (os.cpu_count() or 1) // workers)
+        context = multiprocessing.get_context("spawn")
+        self._segments = context.Queue()
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_load_models,
+            initargs=(
+                stt_model,
+                torch_threads,
+                WARMUP_MODELS,
+                self._segments,
+                context.Barrier(workers),
+            ),
+        )
+        self.concurrency = workers
+        self.ready = {"stt": False, "tts": False}
+        self._slots = asyncio.Semaphore(max_pending)
+        self._calls = itertools.count()
+        self._streams = {}
+        threading.Thread(target=self._dispatch_segments, daemon=True).start()
+        logger.info(f"Created {workers} inference workers with {torch_threads} torch threads")
+
+    async def load(self):
+        """Start every worker and wait until they have loaded their models."""
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *(
+                loop.run_in_executor(self.executor, _wait_until_all_ready)
+                for _ in range(self.concurrency)
+            )
+        )
+        self.ready = {"stt": True, "tts": True}
+        logger.info(f"Inference workers ready: {sorted(pids)}")
+
+    def _dispatch_segments(self):
+        """Hand each segment from the workers to the `synthesize` call waiting for it."""
+        while (item := self._segments.get()) is not None:
+            call_id, segment = item
+            stream = self._streams.get(call_id)
+            if stream is None:
+                continue  # the caller stopped listening
+            loop, segments = stream
+            try:
+                loop.call_soon_threadsafe(segments.put_nowait, segment)
+            except RuntimeError:  # its event loop is closed
+                pass
+
+    async def _run(self, fn, *args):
+        async with self._slots:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    async def decode_batch(self, chunks: list) -> list:
+        return await self._run(_decode_batch, chunks)
+
+    async def synthesize(self, text: str, voice: str = "af_heart", speed: float = 1.0):
+        """Yield every audio segment for `text` as soon as the worker has synthesized it."""
+        loop = asyncio.get_running_loop()
+        call_id = next(self._calls)
+        segments = asyncio.Queue()
+        self._streams[call_id] = (loop, segments)
+        receiving = None
+        try:
+            async with self._slots:
+                done = loop.run_in_executor(
+                    self.executor, _synthesize, call_id, text, voice, speed
+                )
+                while True:
+                    receiving = asyncio.ensure_future(segments.get())
+                    await asyncio.wait({receiving, done}, return_when=asyncio.FIRST_COMPLETED)
+                    if not receiving.done() and done.exception() is not None:
+                        # the worker died before it could send the end of the segments
+                        raise done.exception()
+                    if (segment := await receiving) is None:
+                        break
+                    yield segment
+                await done
+        finally:
+            if receiving is not None:
+                receiving.cancel()
+            del self._streams[call_id]
+
+    def shutdown(self):
+        self.executor.shutdown(cancel_futures=True)
+        self._segments.put(None)
+
+
+class FakeInference:
+    """
+    Stand-ins for the STT and TTS models, for load tests.
+
+    Nothing is loaded: decoding waits `stt_rtf` seconds per second of audio and returns a
+    fixed answer, synthesis waits `tts_rtf` seconds per second of speech and returns silence
+    as long as the text would take to say. Like the process pool, `concurrency` batches are
+    decoded at once.
+    """
+
+    transcript = FakeEngine.transcript
+    words_per_second = 2.5
+    tts_sample_rate = 24000
+
+    def __init__(
+        self,
+        concurrency: int = max(1, INFERENCE_WORKERS),
+        stt_rtf: float = FAKE_STT_RTF,
+        tts_rtf: float = FAKE_TTS_RTF,
+    ):
+        self.concurrency = concurrency
+        self.stt = FakeEngine(rtf=stt_rtf)
+        self.tts_rtf = tts_rtf
+        self.ready = {"stt": True, "tts": True}
+
+    async def load(self):
+        pass
+
+    async def decode_batch(self, chunks: list) -> list:
+        # the fake STT engine's answers, without blocking the event loop while "decoding"
+        await asyncio.sleep(self.stt.seconds(chunks))
+        return self.stt.results(chunks)
+
+    async def synthesize(self, text: str, voice: str = "af_heart", speed: float = 1.0):
+        seconds = len(text.split()) / (self.words_per_second * speed)
+        await asyncio.sleep(seconds * self.tts_rtf)
+        yield np.zeros(int(seconds * self.tts_sample_rate), dtype=np.float32)
+
+    def shutdown(self):
+        pass
+
+
+def create_inference(workers: int = INFERENCE_WORKERS, fake: bool = FAKE_INFERENCE):
+    """Return the stand-ins for load tests when configured, the process pool when workers are
+    configured, otherwise in-process models."""
+    if fake:
+        return FakeInference()
+    if workers > 0:
+        return ProcessPoolInference(workers)
+    return LocalInference()
@@ -0,0 +1,154 @@
+import random
+import asyncio
+import logging
+import time
+
+from .chat_model import evaluate_interview
+from .constants import (
+    JOB_BACKOFF,
+    JOB_CONCURRENCY,
+    JOB_LEASE,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL,
+)
+from .db import (
+    claim_jobs_db,
+    finish_job_db,
+    get_interview_detail_from_db,
+    save_interview_evaluation_db,
+    set_evaluation_status_db,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobRunner:
+    """
+    Run the jobs stored in the SQLite `jobs` table in the background.
+
+    At most `concurrency` jobs run at once, so a burst of interviews ending together is
+    worked through at a steady pace. A failing job is retried with exponential backoff
+    (`backoff` seconds, doubled on each attempt, with jitter) until `max_attempts`, then
+    marked failed. Claimed jobs are leased for `lease` seconds: if the process running one
+    dies, another runner picks it up once the lease expires.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = JOB_CONCURRENCY,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+        backoff: float = JOB_BACKOFF,
+        lease: float = JOB_LEASE,
+        poll_interval: float = JOB_POLL_INTERVAL,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.handlers = {}
+        self.running = set()
+        self._wakeup = asyncio.Event()
+        self._loop = None
+
+    def register(self, kind: str, handler, on_failure=None):
+        """Run `handler(payload)` for jobs of `kind`, and `on_failure(payload)` once they
+        have used up their attempts."""
+        self.handlers[kind] = (handler, on_failure)
+
+    def notify(self):
+        """Wake the runner up to claim a job that was just queued."""
+        self._wakeup.set()
+
+    def start(self):
+        if self._loop is None or self._loop.done():
+            self._loop = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop claiming jobs; jobs still running are retried when their lease expires."""
+        tasks = [task for task in (self._loop, *self.running) if task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self):
+        while True:
+            self._wakeup.clear()
+            free = self.concurrency - len(self.running)
+            try:
+                jobs = await claim_jobs_db(free, self.lease) if free > 0 else []
+            except Exception as e:
+                logger.error(f"Error claiming jobs: {e}")
+                jobs = []
+            for job in jobs:
+                task = asyncio.create_task(self._execute(job))
+                self.running.add(task)
+                task.add_done_callback(self._job_done)
+            if len(jobs) < free or free <= 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _job_done(self, task):
+        self.running.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Error running a job: {task.exception()!r}")
+        self.notify()
+
+    async def _execute(self, job):
+        handler, on_failure = self.handlers.get(job["kind"], (None, None))
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind {job['kind']}")
+            await handler(job["payload"])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if job["attempts"] >= self.max_attempts:
+                logger.error(f"Job {job['id']} failed after {job['attempts']} attempts: {error}")
+                await self._finish(job, "failed", error=error)
+                if on_failure:
+                    try:
+                        await on_failure(job["payload"])
+                    except Exception as e:
+                        logger.error(f"Error handling the failure of job {job['id']}: {e}")
+            else:
+                delay = self.backoff * 2 ** (job["attempts"] - 1) * random.uniform(0.8, 1.2)
+                logger.warning(f"Job {job['id']} failed, retrying in {delay:.0f}s: {error}")
+                await self._finish(job, "queued", error=error, run_at=time.time() + delay)
+            return
+        await self._finish(job, "done")
+
+    async def _finish(self, job, status, **kwargs):
+        """Store the outcome of a job; if that fails, the job is retried once its lease
+        expires."""
+        try:
+            await finish_job_db(job["id"], status, **kwargs)
+        except Exception as e:
+            logger.error(f"Error marking job {job['id']} {status}: {e}")
+
+
+async def evaluate_interview_job(payload):
+    """Evaluate a saved interview and store the evaluation"""
+    interview = await get_interview_detail_from_db(payload["session_id"])
+    if interview is None or interview["evaluation_status"] == "done":
+        return
+    logger.info(f"Evaluating interview {payload['session_id']}")
+    evaluation = await evaluate_interview(
+        [{"role": m["role"], "message": m["message"]} for m in interview["messages"]],
+        role=interview["role"],
+        role_description=interview["role_description"],
+    )
+    await save_interview_evaluation_db(payload["session_id"], evaluation)
+    logger.info(f"Interview {payload['session_id']} evaluated")
+
+
+async def evaluate_interview_failed(payload):
+    await set_evaluation_status_db(payload["session_id"], "failed")
+
+
+def create_job_runner(**kwargs) -> JobRunner:
+    """Return a runner with the app's job handlers registered."""
+    runner = JobRunner(**kwargs)
+    runner.register("evaluate_interview", evaluate_interview_job, evaluate_interview_failed)
+    return runner
@@ -1,4 +1,5 @@
 import jwt
+import asyncio
 
 from datetime import datetime, timedelta
 from passlib.context import CryptContext
@@ -29,8 +30,9 @@ def create_access_token(
     return encoded_jwt
 
 
-def authenticate_user(username: str, password: str):
-    user = get_user_from_db(username)
-    if not user or not verify_password(password, user["password"]):
+async def authenticate_user(username: str, password: str):
+    user = await get_user_from_db(username)
+    # bcrypt is deliberately slow, keep it off the event loop
+    if not user or not await asyncio.to_thread(verify_password, password, user["password"]):
         return None
     return user
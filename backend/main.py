@@ -1,14 +1,15 @@
 import os
-import io
 import json
-import base64
 import uuid
 import logging
+import time
 import asyncio
-import soundfile as sf
-from datetime import datetime
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Literal
 from fastapi import (
     FastAPI,
+    Query,
     WebSocket,
     WebSocketDisconnect,
     Depends,
@@ -17,53 +18,122 @@ from fastapi import (
     File,
     UploadFile,
 )
-from .audio import TextToAudio, AudioToText
-from .chat_model import InterViewer, generate_questions, evaluate_interview
+from .audio import AudioDecodeError, StreamingTranscriber, PCMEncoder
+from .chat_model import (
+    InterViewer,
+    generate_questions,
+    get_chat_model_name,
+    has_chat_model_credentials,
+)
 from fastapi.security import OAuth2PasswordRequestForm
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from .models import RoleSettings, RoleData
 from .session import SessionManager
-from .util import transform_interview, resume_reader
+from .stt_scheduler import STTScheduler
+from .cache import GuidelineCache, TTSCache
+from .inference import create_inference
+from .jobs import create_job_runner
+from .util import transform_interview, resume_reader, split_sentences
+from .metrics import (
+    TraceIdFilter,
+    active_sessions,
+    counters,
+    latency,
+    mark_dead_processes,
+    new_trace,
+    record_audio,
+    trace_id,
+)
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
 from .constants import (
     SAVE_DIR,
     SECRET_KEY,
-    STT_MODEL,
     INTERVIEW_NAME,
+    MAX_CACHED_INTERVIEWERS,
+    MEMORY_TURNS,
+    MEMORY_TOKEN_BUDGET,
+    STREAMING_STT,
+    PIPELINED_REPLIES,
+    PROMETHEUS_MULTIPROC_DIR,
+    TTS_VOICE,
+    TTS_SPEED,
+    TTS_COMMON_LINES,
 )
 from .login import authenticate_user, create_access_token
-from kokoro import KPipeline
 from .db import (
     get_roles_db,
     create_role_to_db,
     get_interviews_from_db,
+    search_interviews_db,
     get_role_settings,
     get_role_details_db,
     update_role_details_db,
-    save_interview_to_db,
+    queue_interview_evaluation_db,
     get_interview_detail_from_db,
+    migrate_db,
 )
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s %(levelname)s [%(trace_id)s] %(name)s: %(message)s"
+)
+for handler in logging.getLogger().handlers:
+    handler.addFilter(TraceIdFilter())
 logger = logging.getLogger(__name__)
 logging.getLogger("TTS").setLevel(logging.ERROR)
 logging.getLogger("httpx").setLevel(logging.ERROR)
 
 os.makedirs(SAVE_DIR, exist_ok=True)
-app = FastAPI()
+inference = create_inference()
+stt_scheduler = STTScheduler(inference)
+session_manager = SessionManager()
+interviewers = OrderedDict()
+job_runner = create_job_runner()
+guideline_cache = GuidelineCache(session_manager.client)
+tts_cache = TTSCache()
+# sessions whose guidelines are being generated in this worker, by session id
+preparing_sessions = {}
+
+UNDECODABLE_ANSWER = "Your answer could not be decoded, please answer again."
+UNTRANSCRIBED_ANSWER = "Your answer could not be transcribed, please answer again."
+
+
+async def load_models():
+    """Load and warm up the models in the background so startup isn't blocked on them."""
+    try:
+        await inference.load()
+        logger.info("Models loaded.")
+    except Exception as e:
+        logger.error(f"Error loading models: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await migrate_db()
+    job_runner.start()
+    loading = asyncio.create_task(load_models())
+    yield
+    loading.cancel()
+    await job_runner.stop()
+    inference.shutdown()
+    await session_manager.close()
+    if PROMETHEUS_MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid(), PROMETHEUS_MULTIPROC_DIR)
+
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://localhost:3000",
 ]
 
 
-def initialize_tts_stt():
-    """Initialize the Text-to-Speech model."""
-    stt = AudioToText(STT_MODEL)
-    tts = KPipeline(lang_code='a')
-    return tts, stt
-
-
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -72,151 +142,333 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-tts, stt = initialize_tts_stt()
-session_manager = SessionManager()
+
+async def load_interviewer(session_id):
+    """
+    Return the session's interviewer, reusing the one cached in this worker when possible.
+
+    A cached interviewer only needs the messages other workers appended since it was last
+    used; otherwise it is rebuilt from the stored settings and the full conversation. When
+    the candidate connects before the guidelines are ready, this waits for the generation
+    /start-interview started instead of starting another one.
+    """
+    interviewer = interviewers.get(session_id)
+    if interviewer is not None:
+        interviewer.add_messages(
+            await session_manager.get_messages(session_id, start=interviewer.persisted_messages)
+        )
+    else:
+        stored_data = await session_manager.get_session(session_id)
+        if not stored_data:
+            return None
+        if stored_data.get("guidelines") is None and session_id in preparing_sessions:
+            await asyncio.shield(preparing_sessions[session_id])
+            stored_data = await session_manager.get_session(session_id) or stored_data
+        if stored_data.get("guidelines") is None:
+            stored_data = await prepare_session(session_id, stored_data)
+        interviewer = InterViewer.from_dict(
+            stored_data, await session_manager.get_messages(session_id)
+        )
+
+    interviewers[session_id] = interviewer
+    interviewers.move_to_end(session_id)
+    while len(interviewers) > MAX_CACHED_INTERVIEWERS:
+        interviewers.popitem(last=False)
+    return interviewer
+
+
+async def prepare_session(session_id, settings):
+    """Generate the guidelines of a session created by /start-interview and store them"""
+    guidelines = await guideline_cache.get_or_generate(
+        settings["resume"],
+        settings["role"],
+        settings["role_description"],
+        generate_questions,
+        model=get_chat_model_name(),
+    )
+    settings = {**settings, "guidelines": guidelines}
+    await session_manager.create_session(session_id, settings)
+    return settings
 
 
-async def save_audio_buffer_to_file(buffer):
-    """Save the accumulated audio buffer to a WebM file."""
+async def prepare_session_in_background(session_id, settings):
+    """Start on the guidelines before the candidate connects, so they are usually ready"""
+    started_at = time.perf_counter()
     try:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        webm_file_path = os.path.join(SAVE_DIR, f"recording_{timestamp}.ogg")
+        await prepare_session(session_id, settings)
+        latency.since("guidelines", started_at)
+    except Exception as e:
+        logger.error(f"Error preparing session {session_id}: {e}")
+
 
-        with open(webm_file_path, "wb") as webm_file:
-            webm_file.write(buffer.getvalue())
+async def persist_new_messages(session_id, interviewer: InterViewer):
+    """Append the messages of the latest turn to the session store"""
+    messages = interviewer.unpersisted_messages
+    await session_manager.append_messages(session_id, messages)
+    interviewer.persisted_messages += len(messages)
 
-        return webm_file_path
 
+async def summarize_session(session_id, interviewer: InterViewer):
+    try:
+        if await interviewer.update_summary():
+            await session_manager.update_session(session_id, interviewer.to_dict())
     except Exception as e:
-        logger.error(f"Error saving audio buffer to file: {e}")
-        return None
-    finally:
-        buffer.seek(0)
-        buffer.truncate(0)
+        logger.error(f"Error summarizing session {session_id}: {e}")
+
+
+def schedule_summary(session_id, interviewer: InterViewer):
+    """Fold the turns that left the verbatim window into the summary, off the reply path"""
+    if interviewer.summarizing and not interviewer.summarizing.done():
+        return
+    if interviewer.needs_summary:
+        interviewer.summarizing = asyncio.create_task(summarize_session(session_id, interviewer))
+
+
+async def end_session(session_id):
+    interviewers.pop(session_id, None)
+    await session_manager.remove_session(session_id)
 
-async def generate_audio_response(tts, text) -> io.BytesIO:
+
+async def synthesize(inference, encoder: PCMEncoder, text: str):
+    """
+    Synthesize `text` and yield the encoded segments, recording TTS latency and output.
+
+    Lines in the TTS cache are sent from there in one piece; new ones are cached once they
+    have been synthesized completely.
     """
-    Generate an audio response from text using TTS and return as a BytesIO buffer.
+    key = tts_cache.key(text, TTS_VOICE, TTS_SPEED, encoder.format)
+    if tts_cache.enabled:
+        cached = await tts_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    chunks = []
+    started_at = time.perf_counter()
+    async for segment in inference.synthesize(text, voice=TTS_VOICE, speed=TTS_SPEED):
+        latency.since("tts", started_at)
+        record_audio("tts", len(segment) / encoder.sample_rate)
+        chunks.append(encoder.encode(segment))
+        yield chunks[-1]
+        started_at = time.perf_counter()
+    if tts_cache.enabled:
+        await tts_cache.set(key, b"".join(chunks))
+
+
+async def end_response(websocket: WebSocket):
+    await websocket.send_text(json.dumps({"endOfResponse": True, "trace_id": trace_id.get()}))
+
+
+async def stream_audio_response(
+    websocket: WebSocket,
+    inference,
+    encoder: PCMEncoder,
+    tokens,
+    started_at: float,
+    metric: str = "time_to_first_audio",
+):
     """
-    def _generate():
-        gen = tts(text, voice="af_heart", speed=1.0)
-        audio = next(gen).audio
+    Synthesize a streamed reply sentence by sentence and send each audio segment in order.
+
+    The LLM keeps streaming into a queue while earlier sentences are being synthesized, so the
+    first audio only waits for the first sentence.
+    """
+    sentences = asyncio.Queue()
+
+    async def produce():
+        try:
+            async for sentence in split_sentences(tokens, standalone=TTS_COMMON_LINES):
+                await sentences.put(sentence)
+        finally:
+            await sentences.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        is_first = True
+        while (sentence := await sentences.get()) is not None:
+            async for chunk in synthesize(inference, encoder, sentence):
+                await websocket.send_bytes(chunk)
+                if is_first:
+                    elapsed = latency.since(metric, started_at)
+                    logger.info(f"{metric}: {elapsed:.3f}s")
+                    is_first = False
+        await producer
+    finally:
+        producer.cancel()
 
-        buffer = io.BytesIO()
-        sf.write(buffer, audio, samplerate=24000, format="WAV")
-        buffer.seek(0)
-        return buffer
+    await end_response(websocket)
 
-    return await asyncio.to_thread(_generate)
+
+async def emit_partial_transcript(websocket: WebSocket, transcriber: StreamingTranscriber):
+    """Transcribe the completed windows of the current answer and send the partial text."""
+    partial = await transcriber.step()
+    if partial:
+        await websocket.send_text(json.dumps({"partial_transcript": partial}))
 
 
 async def process_interview_data(interviewer: InterViewer, session_id):
-    """Save interview to db"""
-    try:
-        logger.info("Processing interview data")
-        interview = transform_interview(interviewer.memory.chat_memory.messages)
-        evaluation = await evaluate_interview(
-            interview,
-            role=interviewer.role,
-            role_description=interviewer.role_description,
-        )
-        save_interview_to_db(
-            session_id=session_id,
-            role=interviewer.role,
-            role_description=interviewer.role_description,
-            messages=interview,
-            evaluation=evaluation,
-        )
-        logger.info("Interview data saved to db")
-    except Exception as e:
-        logger.error(f"Error during interview processing: {e}")
+    """Save the interview to db and queue its evaluation"""
+    logger.info("Processing interview data")
+    job_id = await queue_interview_evaluation_db(
+        session_id=session_id,
+        role=interviewer.role,
+        role_description=interviewer.role_description,
+        messages=transform_interview(interviewer.memory.chat_memory.messages, with_metadata=True),
+    )
+    job_runner.notify()
+    logger.info(f"Interview data saved to db, evaluation job {job_id}")
 
 
 async def handle_websocket_audio_stream(
     websocket: WebSocket,
-    buffer: io.BytesIO,
+    transcriber: StreamingTranscriber,
     interviewer: InterViewer,
-    stt: AudioToText,
-    tts: TextToAudio,
+    inference,
+    encoder: PCMEncoder,
     session_id,
 ):
-    """Handle the WebSocket audio streaming and save when done."""
+    """
+    Handle one WebSocket message, transcribing while the candidate speaks.
+
+    Returns True once the interview has ended. A disconnect raises WebSocketDisconnect and
+    leaves the session in place, so the candidate can reconnect and resume.
+    """
     try:
         data = await websocket.receive()
+        if data["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(data.get("code", 1000), data.get("reason"))
 
         if "bytes" in data:
-            buffer.write(data["bytes"])
+            transcriber.feed(data["bytes"])
+            if STREAMING_STT and (transcriber.pending is None or transcriber.pending.done()):
+                transcriber.pending = asyncio.create_task(
+                    emit_partial_transcript(websocket, transcriber)
+                )
         elif "text" in data:
             message = json.loads(data["text"])
             if message.get("endOfMessage"):
-                webm_file_path = await save_audio_buffer_to_file(buffer)
-                user_ans = stt.transcribe_audio(webm_file_path)
+                new_trace()
+                started_at = time.perf_counter()
+                # on errors keep the session, the candidate can answer again
+                try:
+                    with latency.time("stt_final"):
+                        user_ans, confidence = await transcriber.finalize()
+                except AudioDecodeError as e:
+                    logger.warning(f"Could not decode the answer: {e}")
+                    await websocket.send_text(json.dumps({"error": UNDECODABLE_ANSWER}))
+                    await end_response(websocket)
+                    return
+                except Exception as e:
+                    logger.error(f"Could not transcribe the answer: {e!r}")
+                    await websocket.send_text(json.dumps({"error": UNTRANSCRIBED_ANSWER}))
+                    await end_response(websocket)
+                    return
                 logger.info(f"User answer: {user_ans}")
-                if webm_file_path:
-                    model_question = await interviewer.generate_question(user_response=user_ans)
-                    ogg_audio_buffer = await generate_audio_response(
-                        tts, model_question
+                if PIPELINED_REPLIES:
+                    tokens = interviewer.stream_question(
+                        user_response=user_ans, confidence=confidence
                     )
-                    await websocket.send_bytes(ogg_audio_buffer.read())
-                    logger.info("Sent audio response.")
+                    await stream_audio_response(websocket, inference, encoder, tokens, started_at)
                 else:
-                    logger.error("Failed to save audio.")
+                    model_question = await interviewer.generate_question(
+                        user_response=user_ans, confidence=confidence
+                    )
+                    is_first = True
+                    async for chunk in synthesize(inference, encoder, model_question):
+                        await websocket.send_bytes(chunk)
+                        if is_first:
+                            latency.since("time_to_first_audio", started_at)
+                            is_first = False
+                    await end_response(websocket)
+                await persist_new_messages(session_id, interviewer)
+                schedule_summary(session_id, interviewer)
+                logger.info("Sent audio response.")
             if message.get("end_interview"):
-                asyncio.create_task(process_interview_data(interviewer, session_id))
+                await process_interview_data(interviewer, session_id)
                 await websocket.send_text("Interview ended successfully.")
                 await websocket.close()
-                buffer.close()
+                await transcriber.reset()
                 return True
     except WebSocketDisconnect:
-        buffer.close()
-    except RuntimeError as e:
-        logger.error(f"Caught a RuntimeError: {e}")
-        buffer.close()
-        return True
+        await transcriber.reset()
+        raise
 
 
 @app.websocket("/ws/audio")
 async def audio_stream(websocket: WebSocket):
-    interviewer = None
     await websocket.accept()
+    new_trace()
     session_id = None
     data = await websocket.receive()
+    if data["type"] == "websocket.disconnect":
+        return
     if "text" in data:
         message = json.loads(data["text"])
         if "session_id" in message:
             session_id = message.get("session_id")
 
-    stored_data = session_manager.get_session(session_id)
-    if not stored_data:
+    started_at = time.perf_counter()
+    try:
+        interviewer = await load_interviewer(session_id)
+    except Exception as e:
+        logger.error(f"Error loading interviewer: {e}")
+        interviewer = None
+    if not interviewer:
         logger.error("Interviewer not found")
         await websocket.close()
         return
-    else:
-        interviewer = InterViewer.from_dict(stored_data)
 
-    audio_buffer = io.BytesIO()
+    transcriber = StreamingTranscriber(stt_scheduler)
+    encoder = PCMEncoder()
+    await websocket.send_text(json.dumps({"audio_format": encoder.format}))
 
+    active_sessions.inc()
     try:
+        if not interviewer.memory.chat_memory.messages:
+            tokens = interviewer.stream_question("ask a question", save_input=False)
+            await stream_audio_response(
+                websocket, inference, encoder, tokens, started_at, "time_to_first_question"
+            )
+            await persist_new_messages(session_id, interviewer)
+
         while True:
             to_break = await handle_websocket_audio_stream(
                 websocket,
-                audio_buffer,
+                transcriber,
                 interviewer,
-                stt,
-                tts,
+                inference,
+                encoder,
                 session_id,
             )
             if to_break:
-                session_manager.remove_session(session_id)
+                await end_session(session_id)
                 break
 
     except WebSocketDisconnect:
-        session_manager.remove_session(session_id)
+        # keep the session so the candidate can reconnect and resume
+        logger.info(f"Session {session_id} disconnected")
+    finally:
+        await transcriber.reset()
+        active_sessions.dec()
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/readyz")
+async def readyz():
+    models = {**inference.ready, "chat": has_chat_model_credentials()}
+    ready = all(models.values())
+    return JSONResponse(
+        status_code=200 if ready else 503, content={"ready": ready, "models": models}
+    )
 
 
 @app.post("/login")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(form_data.username, form_data.password)
     if not user:
         raise HTTPException(status_code=401, detail="Incorrect username or password")
 
@@ -235,59 +487,103 @@ async def start_interview(
     portfolio_text: str = Form(None),
     portfolio_file: UploadFile = File(None),
 ):
+    """
+    Create the interview session and return its id right away.
+
+    The guidelines are generated in the background and the first question is streamed as
+    audio once the candidate connects to /ws/audio.
+    """
     try:
+        role_settings = asyncio.create_task(get_role_settings(role))
         if portfolio_text:
             resume_text = portfolio_text
         elif portfolio_file:
             try:
                 pdf_content = await portfolio_file.read()
-                resume_text = resume_reader(pdf_content)
+                resume_text = await asyncio.to_thread(resume_reader, pdf_content)
             except Exception as e:
+                role_settings.cancel()
                 return JSONResponse(
                     status_code=400, content={"detail": f"Error reading PDF: {str(e)}"}
                 )
-        custom_questions, _ = get_role_settings(role)
+        custom_questions, _, memory_turns, memory_token_budget = await role_settings
         must_have_questions = (custom_questions.split("\n") if custom_questions else [],)
 
-        guidelines = await generate_questions(
-            resume=resume_text,
-            role=role,
-            role_description=role_description,
-        )
         session_id = str(uuid.uuid4())
-        interviewer = InterViewer(
-            guidelines,
-            INTERVIEW_NAME,
-            role,
-            resume_text,
-            role_description,
-            must_have_questions,
-        )
-        first_question = await interviewer.generate_question("ask a question")
-        interviewer.memory.clear()
-        interviewer.memory.chat_memory.add_ai_message(first_question)
-        buffer = await generate_audio_response(tts, first_question)
-        session_manager.create_session(session_id, interviewer.to_dict())
-        audio_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
-        return JSONResponse(content={"audio_base64": audio_base64, "session_id": session_id})
+        settings = {
+            "guidelines": None,
+            "name": INTERVIEW_NAME,
+            "role": role,
+            "resume": resume_text,
+            "role_description": role_description,
+            "must_have_questions": must_have_questions,
+            "memory_turns": MEMORY_TURNS if memory_turns is None else memory_turns,
+            "memory_token_budget": memory_token_budget or MEMORY_TOKEN_BUDGET,
+        }
+        await session_manager.create_session(session_id, settings)
+        task = asyncio.create_task(prepare_session_in_background(session_id, settings))
+        preparing_sessions[session_id] = task
+        task.add_done_callback(lambda _: preparing_sessions.pop(session_id, None))
+        return JSONResponse(content={"session_id": session_id})
     except Exception as e:
         logger.error(f"Unexpected error: {str(e)}")
         return JSONResponse(status_code=500, content={"detail": f"Unexpected error: {str(e)}"})
 
 
+@app.get("/metrics")
+async def get_prometheus_metrics():
+    registry = REGISTRY
+    if PROMETHEUS_MULTIPROC_DIR:
+        mark_dead_processes(PROMETHEUS_MULTIPROC_DIR)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+@app.get("/metrics/latency")
+async def get_latency_metrics():
+    return JSONResponse(content=latency.summary())
+
+
+@app.get("/metrics/counters")
+async def get_counter_metrics():
+    return JSONResponse(content=counters.summary())
+
+
 @app.get("/interviews/")
-async def get_interview_summaries():
-    interviews = get_interviews_from_db()
-    for interview in interviews:
-        interview["preview"] = interview["messages"][0]["message"][:50]
-        interview.pop("messages")
+async def get_interview_summaries(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str = None,
+    role: str = None,
+    since: str = None,
+    until: str = None,
+):
+    try:
+        page = await get_interviews_from_db(
+            limit=limit, cursor=cursor, role=role, since=since, until=until
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(content=page)
 
-    return JSONResponse(content=interviews)
+
+@app.get("/interviews/search")
+async def search_interviews(
+    q: str = Query(..., min_length=1),
+    kind: Literal["question", "answer", "evaluation"] = None,
+    role: str = None,
+    limit: int = Query(20, ge=1, le=100),
+):
+    try:
+        results = await search_interviews_db(q, kind=kind, role=role, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(content={"results": results})
 
 
 @app.get("/interviews/{session_id}")
 async def get_interview_detail(session_id: str):
-    interview = get_interview_detail_from_db(session_id)
+    interview = await get_interview_detail_from_db(session_id)
     if not interview:
         raise HTTPException(status_code=404, detail="Interview not found")
     return JSONResponse(content=interview)
@@ -296,10 +592,12 @@ async def get_interview_detail(session_id: str):
 @app.post("/admin/create-role")
 async def save_interview_settings(settings: RoleSettings):
     try:
-        create_role_to_db(
+        await create_role_to_db(
             role=settings.role,
             custom_questions=settings.customQuestions,
             job_description=settings.jobDescription,
+            memory_turns=settings.memoryTurns,
+            memory_token_budget=settings.memoryTokenBudget,
         )
         return {"message": "Interview settings saved successfully"}
     except ValueError as e:
@@ -333,7 +631,9 @@ async def update_role(role: str, role_data: RoleData):
     Update the details of a specific role.
     """
     try:
-        updated_role = await update_role_details_db(role, role_data.model_dump())
+        updated_role = await update_role_details_db(
+            role, role_data.model_dump(exclude_unset=True)
+        )
         if not updated_role:
             raise HTTPException(status_code=404, detail="Role not found")
         return {"message": "Role updated successfully"}
@@ -345,7 +645,7 @@ async def update_role(role: str, role_data: RoleData):
 @app.delete("/delete_session/{session_id}")
 async def delete_session(session_id: str):
     try:
-        session_manager.remove_session(session_id)
+        await end_session(session_id)
         return {"message": f"Session {session_id} deleted successfully."}
     except ValueError as e:
         logger.error(f"Error deleting session: {str(e)}")
@@ -0,0 +1,152 @@
+import os
+import glob
+import time
+import uuid
+import logging
+import functools
+import contextvars
+
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+from prometheus_client import Counter as PrometheusCounter, Gauge, Histogram, multiprocess
+
+# buckets from a few milliseconds (DB, session I/O) to the length of a long LLM reply
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+stage_seconds = Histogram(
+    "interview_stage_seconds",
+    "Time spent in each stage of an interview turn",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+)
+events_total = PrometheusCounter(
+    "interview_events_total", "Events such as cache hits and misses", ["event"]
+)
+# rate() of these is the audio seconds transcribed / synthesized per wall clock second
+audio_seconds_total = PrometheusCounter(
+    "interview_audio_seconds_total", "Seconds of audio processed", ["direction"]
+)
+# share of each stretch of transcribed audio that the VAD kept as speech
+vad_speech_ratio = Histogram(
+    "interview_vad_speech_ratio",
+    "Share of the audio sent to STT that the VAD kept as speech",
+    buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1),
+)
+# summed over the live worker processes when PROMETHEUS_MULTIPROC_DIR is set
+active_sessions = Gauge(
+    "interview_active_sessions", "Connected interview WebSockets", multiprocess_mode="livesum"
+)
+
+trace_id = contextvars.ContextVar("trace_id", default="-")
+
+
+def mark_dead_processes(path: str):
+    """Drop the live gauges of the worker processes in the multiprocess directory that are
+    gone, such as a worker that crashed and was restarted under a new pid."""
+    for name in glob.glob(os.path.join(path, "gauge_live*_*.db")):
+        pid = int(name[: -len(".db")].rsplit("_", 1)[1])
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            multiprocess.mark_process_dead(pid, path)
+        except PermissionError:
+            pass  # alive, run by another user
+
+
+def new_trace() -> str:
+    """Start a new trace for the current task, e.g. one WebSocket turn, and return its id."""
+    value = uuid.uuid4().hex[:12]
+    trace_id.set(value)
+    return value
+
+
+class TraceIdFilter(logging.Filter):
+    """Add the current `trace_id` to every log record."""
+
+    def filter(self, record):
+        record.trace_id = trace_id.get()
+        return True
+
+
+class LatencyRecorder:
+    """
+    Keep the most recent latency samples per metric and summarize them.
+
+    Every sample is also observed by the `interview_stage_seconds` Prometheus histogram.
+    """
+
+    def __init__(self, max_samples=1000):
+        self.samples = defaultdict(lambda: deque(maxlen=max_samples))
+
+    def observe(self, name: str, seconds: float):
+        self.samples[name].append(seconds)
+        stage_seconds.labels(name).observe(seconds)
+
+    def since(self, name: str, started_at: float) -> float:
+        """Record the time elapsed since a `time.perf_counter()` timestamp and return it."""
+        elapsed = time.perf_counter() - started_at
+        self.observe(name, elapsed)
+        return elapsed
+
+    @contextmanager
+    def time(self, name: str):
+        """Record how long the block takes, including when it raises."""
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.since(name, started_at)
+
+    def summary(self) -> dict:
+        summary = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            summary[name] = {
+                "count": len(ordered),
+                "p50": ordered[int(0.50 * (len(ordered) - 1))],
+                "p95": ordered[int(0.95 * (len(ordered) - 1))],
+                "max": ordered[-1],
+            }
+        return summary
+
+
+class CounterRecorder:
+    """Count events such as cache hits and misses."""
+
+    def __init__(self):
+        self.counts = Counter()
+
+    def increment(self, name: str, amount: int = 1):
+        self.counts[name] += amount
+        events_total.labels(name).inc(amount)
+
+    def summary(self) -> dict:
+        return dict(self.counts)
+
+
+def timed(name: str):
+    """Decorate a coroutine function to record its duration under `name`."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with latency.time(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record_audio(direction: str, seconds: float):
+    """Count `seconds` of audio transcribed ("stt") or synthesized ("tts")."""
+    audio_seconds_total.labels(direction).inc(seconds)
+
+
+def record_speech_ratio(ratio: float):
+    """Record the share of the audio the VAD kept before it went to STT."""
+    vad_speech_ratio.observe(ratio)
+
+
+latency = LatencyRecorder()
+counters = CounterRecorder()
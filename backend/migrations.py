@@ -0,0 +1,176 @@
+import json
+import re
+import sqlite3
+
+SCORE_PATTERN = re.compile(r"SCORE:\s*\**\s*(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+def parse_score(evaluation):
+    """Extract the final `SCORE: n` rating from the evaluator output, if any."""
+    matches = SCORE_PATTERN.findall(evaluation or "")
+    return float(matches[-1]) if matches else None
+
+
+def interview_summary(messages, evaluation):
+    """The denormalized listing columns stored alongside each interview."""
+    return {
+        "preview": messages[0]["message"][:50] if messages else "",
+        "turn_count": len(messages),
+        "score": parse_score(evaluation),
+    }
+
+
+def _add_interview_listing_columns(conn: sqlite3.Connection):
+    conn.execute("ALTER TABLE interviews ADD COLUMN preview TEXT")
+    conn.execute("ALTER TABLE interviews ADD COLUMN created_at TEXT")
+    conn.execute("ALTER TABLE interviews ADD COLUMN turn_count INTEGER")
+    conn.execute("ALTER TABLE interviews ADD COLUMN score REAL")
+
+    rows = conn.execute("SELECT session_id, messages, evaluation FROM interviews").fetchall()
+    for session_id, messages, evaluation in rows:
+        messages = json.loads(messages) if messages else []
+        evaluation = json.loads(evaluation) if evaluation else None
+        summary = interview_summary(messages, evaluation)
+        conn.execute(
+            """
+            UPDATE interviews
+            SET preview = ?, turn_count = ?, score = ?, created_at = CURRENT_TIMESTAMP
+            WHERE session_id = ?
+            """,
+            (summary["preview"], summary["turn_count"], summary["score"], session_id),
+        )
+
+    conn.execute(
+        "CREATE INDEX idx_interviews_created_at ON interviews (created_at DESC, session_id DESC)"
+    )
+    conn.execute(
+        "CREATE INDEX idx_interviews_role_created_at "
+        "ON interviews (role, created_at DESC, session_id DESC)"
+    )
+
+
+def _add_interview_messages(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE interview_messages (
+            session_id TEXT NOT NULL,
+            turn INTEGER NOT NULL,
+            role TEXT NOT NULL,
+            message TEXT NOT NULL,
+            created_at TEXT,
+            confidence REAL,
+            PRIMARY KEY (session_id, turn)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        "CREATE INDEX idx_interview_messages_role_created_at "
+        "ON interview_messages (role, created_at)"
+    )
+
+    rows = conn.execute("SELECT session_id, messages FROM interviews WHERE messages IS NOT NULL")
+    for session_id, messages in rows.fetchall():
+        conn.executemany(
+            """
+            INSERT INTO interview_messages (session_id, turn, role, message)
+            VALUES (?, ?, ?, ?)
+            """,
+            [
+                (session_id, turn, message["role"], message["message"])
+                for turn, message in enumerate(json.loads(messages))
+            ],
+        )
+
+
+def search_documents(session_id, role, messages, evaluation):
+    """
+    The rows indexed for full-text search: one document each for the interviewer questions,
+    the candidate answers and the evaluation of an interview.
+    """
+    questions = [m["message"] for m in messages if m["role"] == "AI"]
+    answers = [m["message"] for m in messages if m["role"] != "AI"]
+    documents = [
+        (session_id, role, "question", "\n".join(questions)),
+        (session_id, role, "answer", "\n".join(answers)),
+        (session_id, role, "evaluation", evaluation or ""),
+    ]
+    return [document for document in documents if document[3]]
+
+
+def _add_interview_search(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE VIRTUAL TABLE interview_search USING fts5(
+            session_id UNINDEXED, role UNINDEXED, kind UNINDEXED, body,
+            tokenize = 'porter unicode61'
+        )
+        """
+    )
+
+    messages = {}
+    for session_id, role, message in conn.execute(
+        "SELECT session_id, role, message FROM interview_messages ORDER BY session_id, turn"
+    ).fetchall():
+        messages.setdefault(session_id, []).append({"role": role, "message": message})
+    for session_id, role, evaluation in conn.execute(
+        "SELECT session_id, role, evaluation FROM interviews"
+    ).fetchall():
+        evaluation = json.loads(evaluation) if evaluation else None
+        conn.executemany(
+            "INSERT INTO interview_search (session_id, role, kind, body) VALUES (?, ?, ?, ?)",
+            search_documents(session_id, role, messages.get(session_id, []), evaluation),
+        )
+    conn.execute("INSERT INTO interview_search (interview_search) VALUES ('optimize')")
+
+
+def _add_jobs(conn: sqlite3.Connection):
+    conn.execute(
+        """
+        CREATE TABLE jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'queued',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            run_at REAL NOT NULL,
+            locked_until REAL,
+            last_error TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            updated_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """
+    )
+    conn.execute("CREATE INDEX idx_jobs_status_run_at ON jobs (status, run_at)")
+    conn.execute("ALTER TABLE interviews ADD COLUMN evaluation_status TEXT")
+    conn.execute("UPDATE interviews SET evaluation_status = 'done'")
+
+
+def _add_role_memory_settings(conn: sqlite3.Connection):
+    # NULL uses the MEMORY_TURNS / MEMORY_TOKEN_BUDGET defaults
+    conn.execute("ALTER TABLE role_settings ADD COLUMN memory_turns INTEGER")
+    conn.execute("ALTER TABLE role_settings ADD COLUMN memory_token_budget INTEGER")
+
+
+# applied in order; PRAGMA user_version records how many have run
+MIGRATIONS = [
+    _add_interview_listing_columns,
+    _add_interview_messages,
+    _add_interview_search,
+    _add_jobs,
+    _add_role_memory_settings,
+]
+
+
+def migrate(conn: sqlite3.Connection):
+    """Apply the pending migrations to the database, each in its own transaction."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        conn.execute("BEGIN")
+        try:
+            migration(conn)
+            conn.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        print(f"Applied migration {number}: {migration.__name__}")
@@ -11,8 +11,12 @@ class RoleSettings(BaseModel):
     role: str
     customQuestions: str
     jobDescription: str
+    memoryTurns: Optional[int] = None
+    memoryTokenBudget: Optional[int] = None
 
 
 class RoleData(BaseModel):
     custom_questions: Optional[str] = None
     job_description: Optional[str] = None
+    memory_turns: Optional[int] = None
+    memory_token_budget: Optional[int] = None
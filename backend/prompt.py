@@ -74,3 +74,15 @@ Instructions:
 - Rate the conversation from 1-10 in your final answer (at the end of your evaluation) with the format: SCORE:
 - NEVER evaluate the interviewer questions
 """
+
+summary_prompt = """
+You are keeping notes on a job interview for the role {role} so that the interviewer can continue it without the full transcript.
+
+CURRENT NOTES:
+{summary}
+
+NEW PART OF THE CONVERSATION:
+{new_lines}
+
+Update the notes with the new part of the conversation. Keep the questions already asked, the topics covered, what the candidate said about their experience and skills, and anything the interviewer should follow up on. Write at most {max_words} words and answer with the updated notes only.
+"""
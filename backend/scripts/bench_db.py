@@ -0,0 +1,104 @@
+import os
+import json
+import uuid
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+
+from .. import db
+from ..db import Database, get_interviews_from_db, get_interview_detail_from_db
+from ..migrations import migrate
+from .init_db import create_tables
+
+
+def seed(path, interviews, turns):
+    with sqlite3.connect(path) as conn:
+        create_tables(conn)
+        messages = json.dumps(
+            [
+                {"role": "AI" if i % 2 == 0 else "User", "message": "Tell me about Django. " * 10}
+                for i in range(turns * 2)
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO interviews VALUES (?, ?, ?, ?, ?)",
+            (
+                (str(uuid.uuid4()), "Python (Django) Developer", "", messages, '"SCORE: 7"')
+                for _ in range(interviews)
+            ),
+        )
+        conn.commit()
+        migrate(conn)
+    return [row[0] for row in sqlite3.connect(path).execute("SELECT session_id FROM interviews")]
+
+
+def blocking_list(path):
+    """The previous data layer: a new connection and the query on the event loop."""
+    with sqlite3.connect(path) as conn:
+        return [
+            {"session_id": row[0], "messages": json.loads(row[1])}
+            for row in conn.execute("SELECT session_id, messages FROM interviews")
+        ]
+
+
+async def live_socket(stop, lags, tick=0.005):
+    """Stand-in for an interview socket: wakes every `tick` and records how late it was."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + tick
+        await asyncio.sleep(tick)
+        lags.append(loop.time() - expected)
+
+
+async def admin_reads(mode, path, session_ids, stop, counter):
+    while not stop.is_set():
+        if mode == "blocking":
+            blocking_list(path)
+            await asyncio.sleep(0)
+        else:
+            await get_interviews_from_db()
+            await get_interview_detail_from_db(session_ids[counter[0] % len(session_ids)])
+        counter[0] += 1
+
+
+async def run(mode, path, session_ids, admins, duration):
+    stop, lags, counter = asyncio.Event(), [], [0]
+    tasks = [asyncio.create_task(live_socket(stop, lags))]
+    tasks += [
+        asyncio.create_task(admin_reads(mode, path, session_ids, stop, counter))
+        for _ in range(admins)
+    ]
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(*tasks)
+
+    lags.sort()
+    print(
+        f"{mode:>9}: socket lag p50 {lags[len(lags) // 2] * 1000:7.2f}ms  "
+        f"p99 {lags[int(len(lags) * 0.99)] * 1000:7.2f}ms  max {lags[-1] * 1000:7.2f}ms  "
+        f"admin reads {counter[0] / duration:6.1f}/s"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure how admin reads affect live interview sockets."
+    )
+    parser.add_argument("--interviews", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--admins", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        session_ids = seed(path, args.interviews, args.turns)
+        db.database = Database(path)
+        print(f"{args.interviews} interviews, {args.admins} concurrent admin readers")
+        for mode in ("blocking", "pooled"):
+            asyncio.run(run(mode, path, session_ids, args.admins, args.duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import time
+import uuid
+import random
+import asyncio
+import sqlite3
+import argparse
+import tempfile
+
+from .. import db
+from ..db import Database, search_interviews_db
+from ..migrations import migrate
+from .init_db import create_tables
+
+SKILLS = [
+    "Django", "Flask", "FastAPI", "PostgreSQL", "Redis", "Kubernetes", "Docker", "React",
+    "TypeScript", "GraphQL", "Kafka", "Terraform", "pandas", "PyTorch", "asyncio", "Celery",
+    "Rust", "Go", "Java", "Spring", "Angular", "Vue", "MongoDB", "Cassandra", "Elasticsearch",
+    "RabbitMQ", "Airflow", "Spark", "Snowflake", "dbt", "Ansible", "Jenkins", "Prometheus",
+    "Grafana", "OAuth", "gRPC", "WebSockets", "NumPy", "scikit-learn", "TensorFlow", "Kotlin",
+    "Swift", "Svelte", "Nginx", "Lambda", "DynamoDB", "BigQuery", "Pulsar",
+]
+FILLER = (
+    "I worked on a team that owned the billing service and we spent a lot of time on "
+    "testing, code review, deployment pipelines and on call rotations for production"
+).split()
+
+QUERIES = [
+    "Django",
+    "Kafka AND Terraform",
+    "Snowflake",
+    '"code review"',
+    "Postgre*",
+    "asyncio NOT Celery",
+]
+
+
+def sentence(rng, words=25):
+    """Filler text mentioning one skill, picked with a long-tailed (Zipf-like) frequency."""
+    text = rng.choices(FILLER, k=words)
+    skill = rng.choices(SKILLS, weights=[1 / rank for rank in range(1, len(SKILLS) + 1)])[0]
+    text.insert(rng.randrange(len(text)), skill)
+    return " ".join(text) + "."
+
+
+def seed(path, interviews, turns, seed_value=0):
+    """Create `interviews` synthetic interviews of `turns` question/answer pairs."""
+    rng = random.Random(seed_value)
+    with sqlite3.connect(path) as conn:
+        create_tables(conn)
+        migrate(conn)
+        for _ in range(interviews):
+            messages = [
+                {"role": "AI" if i % 2 == 0 else "User", "message": sentence(rng)}
+                for i in range(turns * 2)
+            ]
+            evaluation = f"{sentence(rng, 40)} SCORE: {rng.randint(1, 10)}"
+            db._insert_interview(
+                conn, str(uuid.uuid4()), rng.choice(SKILLS), "", messages, evaluation
+            )
+        conn.commit()
+
+
+async def bench(queries, repeat, limit):
+    for query in queries:
+        await search_interviews_db(query, limit=limit)  # warm-up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = await search_interviews_db(query, limit=limit)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(
+            f"{query!r:>24}: p50 {timings[len(timings) // 2] * 1000:7.2f}ms  "
+            f"p95 {timings[int(len(timings) * 0.95)] * 1000:7.2f}ms  {len(results)} hits"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure /interviews/search query latency.")
+    parser.add_argument("--interviews", type=int, default=100_000)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--query", action="append", help="query to run instead of the defaults")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        start = time.perf_counter()
+        seed(path, args.interviews, args.turns)
+        print(
+            f"Seeded {args.interviews} interviews of {args.turns} turns "
+            f"in {time.perf_counter() - start:.1f}s"
+        )
+        db.database = Database(path)
+        asyncio.run(bench(args.query or QUERIES, args.repeat, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import time
+
+import numpy as np
+import whisper
+
+from ..audio import AudioToText
+from ..constants import STT_MODEL
+
+
+def legacy_transcribe(stt: AudioToText, audio) -> str:
+    """The previous path: 22050 Hz chunks, a wasted mel and model.transcribe per chunk."""
+    chunk_length = 30 * 22050
+    chunks = [
+        whisper.pad_or_trim(audio[i : i + chunk_length])
+        for i in range(0, max(len(audio), 1), chunk_length)
+    ]
+    transcript = ""
+    for chunk in chunks:
+        whisper.log_mel_spectrogram(chunk).to(stt.engine.model.device)
+        transcript += stt.engine.model.transcribe(chunk)["text"] + " "
+    return transcript.strip()
+
+
+def bench(name, fn, audio, repeat):
+    fn(audio)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = fn(audio)
+        timings.append(time.perf_counter() - start)
+
+    duration = len(audio) / whisper.audio.SAMPLE_RATE
+    best = min(timings)
+    print(f"{name:>8}: best {best:.3f}s  mean {sum(timings) / len(timings):.3f}s  "
+          f"RTF {best / duration:.3f}")
+    print(f"{'':>8}  {text!r}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the legacy and batched STT paths.")
+    parser.add_argument("--audio", default="sample.wav")
+    parser.add_argument("--model", default=STT_MODEL)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--tile", type=int, default=1, help="repeat the clip to simulate a long answer"
+    )
+    args = parser.parse_args()
+
+    stt = AudioToText(args.model, engine="whisper")
+    audio = whisper.load_audio(args.audio)
+    audio = np.tile(audio, args.tile)
+    print(f"{args.audio}: {len(audio) / whisper.audio.SAMPLE_RATE:.1f}s of audio")
+
+    bench("legacy", lambda a: legacy_transcribe(stt, a), audio, args.repeat)
+    bench("batched", stt.transcribe_array, audio, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import re
+import time
+import argparse
+
+import numpy as np
+import whisper
+
+from ..audio import AudioToText
+from ..constants import STT_MODEL
+from ..stt_engines import STT_ENGINES
+
+WORD = re.compile(r"[a-z0-9']+")
+
+
+def words(text: str) -> list:
+    """Lowercase words without punctuation, so only recognition errors count."""
+    return WORD.findall(text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance between the transcripts, divided by the reference length."""
+    ref, hyp = words(reference), words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,  # deletion
+                    current[j - 1] + 1,  # insertion
+                    previous[j - 1] + (ref_word != hyp_word),  # substitution
+                )
+            )
+        previous = current
+    return previous[-1] / max(len(ref), 1)
+
+
+def bench(engine, model, audio, repeat):
+    """Load the engine, then return its load time, best transcription time and transcript."""
+    start = time.perf_counter()
+    stt = AudioToText(model, engine=engine)
+    load = time.perf_counter() - start
+
+    text = stt.transcribe_array(audio)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = stt.transcribe_array(audio)
+        timings.append(time.perf_counter() - start)
+    return load, min(timings), text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the real-time factor and WER of the STT engines."
+    )
+    parser.add_argument("--audio", default="sample.wav")
+    parser.add_argument("--model", default=STT_MODEL)
+    parser.add_argument(
+        "--engine",
+        action="append",
+        choices=sorted(STT_ENGINES),
+        help="engines to compare, by default whisper, whisper-int8 and faster-whisper",
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--tile", type=int, default=1, help="repeat the clip to simulate a long answer"
+    )
+    parser.add_argument(
+        "--reference",
+        help="the correct transcript of one clip; by default the first engine's transcript",
+    )
+    args = parser.parse_args()
+    engines = args.engine or ["whisper", "whisper-int8", "faster-whisper"]
+
+    audio = np.tile(whisper.load_audio(args.audio), args.tile)
+    duration = len(audio) / whisper.audio.SAMPLE_RATE
+    print(f"{args.audio}: {duration:.1f}s of audio, {args.model} model")
+
+    reference = " ".join([args.reference] * args.tile) if args.reference else None
+    print(f"{'engine':>15} {'load':>7} {'best':>7} {'RTF':>6} {'WER':>6}")
+    for engine in engines:
+        load, best, text = bench(engine, args.model, audio, args.repeat)
+        baseline = reference is None
+        if baseline:
+            reference = text
+        wer = word_error_rate(reference, text)
+        print(f"{engine:>15} {load:6.1f}s {best:6.3f}s {best / duration:6.3f} {wer:6.1%}")
+        print(f"{'':>15} {text!r}")
+        if baseline:
+            print(f"{'':>15} (used as the WER reference)")
+
+
+if __name__ == "__main__":
+    main()
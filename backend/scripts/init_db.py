@@ -3,6 +3,7 @@ import sqlite3
 from passlib.context import CryptContext
 from ..constants import DATABASE_NAME, ROLE_CFG
 from ..login import hash_password
+from ..migrations import migrate
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -13,20 +14,46 @@ DEFAULT_USERS = [
 ]
 
 
+def create_tables(conn):
+    """Create the base tables, which the migrations then bring up to date."""
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            role TEXT NOT NULL
+        )
+    """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS interviews (
+            session_id TEXT PRIMARY KEY,
+            role TEXT NOT NULL,
+            role_description TEXT,
+            messages TEXT,
+            evaluation TEXT
+        )
+    """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS role_settings (
+            role TEXT PRIMARY KEY,
+            custom_questions TEXT,
+            job_description TEXT
+        )
+    """
+    )
+    conn.commit()
+
+
 def init_db():
     with sqlite3.connect(DATABASE_NAME) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+        create_tables(conn)
         cursor = conn.cursor()
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT UNIQUE NOT NULL,
-                password TEXT NOT NULL,
-                role TEXT NOT NULL
-            )
-        """
-        )
-        conn.commit()
         for user in DEFAULT_USERS:
             try:
                 cursor.execute(
@@ -36,26 +63,6 @@ def init_db():
             except sqlite3.IntegrityError:
                 print(f"User {user['username']} already exists, skipping.")
 
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS interviews (
-                session_id TEXT PRIMARY KEY,
-                role TEXT NOT NULL,
-                role_description TEXT,
-                messages TEXT,
-                evaluation TEXT
-            )
-        """
-        )
-        cursor.execute(
-            """
-            CREATE TABLE IF NOT EXISTS role_settings (
-                role TEXT PRIMARY KEY,
-                custom_questions TEXT,
-                job_description TEXT
-            )
-        """
-        )
         for role, config in ROLE_CFG.items():
             cursor.execute(
                 """
@@ -69,6 +76,7 @@ def init_db():
                 ),
             )
         conn.commit()
+        migrate(conn)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,238 @@
+import os
+import json
+import math
+import time
+import wave
+import asyncio
+import argparse
+import tempfile
+
+import httpx
+import websockets
+
+RESUME = (
+    "Candidate {index}. Backend developer with six years of Python, Django and PostgreSQL. "
+    "Built and operated event-driven services on AWS, owned CI/CD pipelines and on-call."
+)
+ROLE_DESCRIPTION = "Build and run our backend services in Python and Django."
+
+
+def percentile(values, q):
+    """Nearest-rank percentile of `values`, None when there are none."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+async def monitor_loop_lag(samples, interval=0.01):
+    """Record how late the event loop wakes up from short sleeps; blocking calls show here."""
+    while True:
+        started_at = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - started_at - interval)
+
+
+async def receive_reply(ws, sent_at):
+    """Wait for a whole spoken reply and return the seconds to its first audio and its end."""
+    first_audio = None
+    while True:
+        message = await ws.recv()
+        if isinstance(message, bytes):
+            if first_audio is None:
+                first_audio = time.perf_counter() - sent_at
+        elif json.loads(message).get("endOfResponse"):
+            return first_audio, time.perf_counter() - sent_at
+
+
+async def send_answer(ws, audio: bytes, chunk_bytes: int, pause: float):
+    """Stream the answer in chunks like the browser's recorder, `pause` seconds apart."""
+    for start in range(0, len(audio), chunk_bytes):
+        await ws.send(audio[start : start + chunk_bytes])
+        if pause:
+            await asyncio.sleep(pause)
+
+
+async def candidate(index, args, client, audio, chunk_bytes, pause, results):
+    """Run one simulated interview: start it, answer `args.turns` questions and end it."""
+    await asyncio.sleep(args.ramp * index / args.sessions)
+    response = await client.post(
+        "/start-interview",
+        data={
+            "role": args.role,
+            "role_description": ROLE_DESCRIPTION,
+            "portfolio_text": RESUME.format(index=index),
+        },
+    )
+    response.raise_for_status()
+    session_id = response.json()["session_id"]
+
+    ws_url = "ws" + args.url[len("http") :] + "/ws/audio"
+    async with websockets.connect(ws_url, max_size=None) as ws:
+        started_at = time.perf_counter()
+        await ws.send(json.dumps({"session_id": session_id}))
+        first_audio, _ = await receive_reply(ws, started_at)
+        results["first_question"].append(first_audio)
+
+        for _ in range(args.turns):
+            await send_answer(ws, audio, chunk_bytes, pause)
+            sent_at = time.perf_counter()
+            await ws.send(json.dumps({"endOfMessage": True}))
+            first_audio, reply = await receive_reply(ws, sent_at)
+            results["time_to_first_audio"].append(first_audio)
+            results["full_reply"].append(reply)
+
+        await ws.send(json.dumps({"end_interview": True}))
+        await ws.recv()
+
+
+async def start_server(port):
+    """
+    Create the database and serve the app in this process and event loop, so that blocking
+    calls in the app show up as event loop lag.
+    """
+    import uvicorn
+
+    from ..main import app
+    from .init_db import init_db
+
+    init_db()
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            await task
+            raise RuntimeError("The server exited during startup")
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def run(args):
+    server = None
+    if args.url is None:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server, server_task = await start_server(args.port)
+
+    with wave.open(args.audio) as clip:
+        bytes_per_second = clip.getframerate() * clip.getnchannels() * clip.getsampwidth()
+    with open(args.audio, "rb") as f:
+        audio = f.read()
+    chunk_bytes = int(bytes_per_second * args.chunk_seconds)
+    pause = args.chunk_seconds / args.speed if args.speed else 0
+
+    # one client for every candidate, creating one loads certificates and blocks the loop
+    client = httpx.AsyncClient(base_url=args.url, timeout=60)
+    results = {name: [] for name in ("first_question", "time_to_first_audio", "full_reply")}
+    results["loop_lag"] = []
+    monitor = asyncio.create_task(monitor_loop_lag(results["loop_lag"]))
+    started_at = time.perf_counter()
+    try:
+        outcomes = await asyncio.gather(
+            *(
+                candidate(index, args, client, audio, chunk_bytes, pause, results)
+                for index in range(args.sessions)
+            ),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - started_at
+        stages = (await client.get("/metrics/latency")).json()
+    finally:
+        monitor.cancel()
+        await client.aclose()
+        if server is not None:
+            server.should_exit = True
+            await server_task
+
+    errors = [outcome for outcome in outcomes if isinstance(outcome, Exception)]
+    return results, stages, errors, elapsed
+
+
+def report(args, results, stages, errors, elapsed) -> dict:
+    summary = {
+        "sessions": args.sessions,
+        "failed_sessions": len(errors),
+        "turns": len(results["time_to_first_audio"]),
+        "elapsed": elapsed,
+        "turns_per_second": len(results["time_to_first_audio"]) / elapsed,
+    }
+    print(
+        f"{args.sessions} sessions ({len(errors)} failed), {summary['turns']} turns "
+        f"in {elapsed:.1f}s: {summary['turns_per_second']:.2f} turns/s"
+    )
+    print(f"{'seconds':<22} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for name in ("first_question", "time_to_first_audio", "full_reply", "loop_lag"):
+        values = [value for value in results[name] if value is not None]
+        row = {q: percentile(values, q) for q in (0.50, 0.95, 0.99, 1.0)}
+        summary[name] = {f"p{round(q * 100)}": value for q, value in row.items()}
+        cells = " ".join(f"{'-' if v is None else f'{v:.3f}':>8}" for v in row.values())
+        print(f"{name:<22} {cells}")
+
+    print("\nserver stages (p50 / p95):")
+    for name, stage in sorted(stages.items()):
+        print(f"  {name:<20} {stage['p50']:.3f} / {stage['p95']:.3f}  ({stage['count']})")
+    summary["server_stages"] = stages
+
+    for error in errors[:5]:
+        print(f"session failed: {type(error).__name__}: {error}")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run concurrent simulated interviews against the backend and report turn latency "
+            "and throughput. Without --url the app is served in this process with the fake "
+            "chat model, in-memory sessions and, unless --real-inference, fake STT/TTS."
+        )
+    )
+    parser.add_argument("--url", help="an already running backend, e.g. http://localhost:8000")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=3, help="answers per interview")
+    parser.add_argument("--ramp", type=float, default=5, help="seconds to start all sessions")
+    parser.add_argument("--audio", default="sample.wav", help="the WAV answer sent every turn")
+    parser.add_argument("--chunk-seconds", type=float, default=0.25)
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="answer speed vs real time, 0 for no pauses"
+    )
+    parser.add_argument("--role", default="Python (Django) Developer")
+    parser.add_argument("--chat-latency", type=float, help="fake chat model first token delay")
+    parser.add_argument("--real-inference", action="store_true", help="load the STT/TTS models")
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    parser.add_argument(
+        "--max-turn-p95", type=float, help="fail above this time to first audio p95"
+    )
+    parser.add_argument("--max-loop-lag", type=float, help="fail above this event loop lag p99")
+    args = parser.parse_args()
+
+    if args.url is None:
+        # read by the backend modules when the app is imported
+        os.environ.setdefault("CHAT_PROVIDER", "fake")
+        os.environ.setdefault("SESSION_BACKEND", "memory")
+        os.environ.setdefault("DATABASE_NAME", os.path.join(tempfile.mkdtemp(), "load_test.db"))
+        if not args.real_inference:
+            os.environ.setdefault("FAKE_INFERENCE", "true")
+        if args.chat_latency is not None:
+            os.environ["FAKE_CHAT_LATENCY"] = str(args.chat_latency)
+
+    summary = report(args, *asyncio.run(run(args)))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+    turn_p95 = summary["time_to_first_audio"]["p95"] or 0
+    lag_p99 = summary["loop_lag"]["p99"] or 0
+    failures = []
+    if summary["failed_sessions"]:
+        failures.append(f"{summary['failed_sessions']} sessions failed")
+    if args.max_turn_p95 is not None and turn_p95 > args.max_turn_p95:
+        failures.append(f"time to first audio p95 {turn_p95:.3f}s > {args.max_turn_p95}s")
+    if args.max_loop_lag is not None and lag_p99 > args.max_loop_lag:
+        failures.append(f"event loop lag p99 {lag_p99:.3f}s > {args.max_loop_lag}s")
+    if failures:
+        raise SystemExit("; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,13 @@
+import sqlite3
+
+from ..constants import DATABASE_NAME
+from ..migrations import migrate
+
+
+def migrate_db():
+    with sqlite3.connect(DATABASE_NAME) as conn:
+        migrate(conn)
+
+
+if __name__ == "__main__":
+    migrate_db()
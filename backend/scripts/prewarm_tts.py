@@ -0,0 +1,71 @@
+import asyncio
+import argparse
+
+from ..audio import PCMEncoder
+from ..cache import TTSCache
+from ..constants import TTS_CACHE_DIR, TTS_COMMON_LINES, TTS_SPEED, TTS_VOICE
+from ..db import get_role_settings, get_roles_db
+from ..inference import LocalInference
+from ..util import split_sentences
+
+
+async def lines_of(text):
+    """Split `text` into the same sentences the reply pipeline synthesizes one by one."""
+
+    async def tokens():
+        yield text
+
+    return [sentence async for sentence in split_sentences(tokens(), standalone=TTS_COMMON_LINES)]
+
+
+async def prewarm(args):
+    roles = args.role or [role["role"] for role in await get_roles_db()]
+    texts = [] if args.no_common else list(TTS_COMMON_LINES)
+    for role in roles:
+        custom_questions, *_ = await get_role_settings(role)
+        texts += [line.strip() for line in (custom_questions or "").splitlines() if line.strip()]
+
+    lines = []
+    for text in texts:
+        lines += [line for line in await lines_of(text) if line not in lines]
+
+    cache = TTSCache(directory=args.directory)
+    encoder = PCMEncoder()
+    inference = LocalInference(stt_model=None)  # only the TTS model
+    await inference.load(warm_up=False)
+
+    synthesized = 0
+    for line in lines:
+        key = cache.key(line, args.voice, args.speed, encoder.format)
+        if await cache.get(key) is not None:
+            continue
+        segments = [
+            encoder.encode(segment)
+            async for segment in inference.synthesize(line, voice=args.voice, speed=args.speed)
+        ]
+        await cache.set(key, b"".join(segments))
+        synthesized += 1
+        print(f"Synthesized {line!r}")
+    print(
+        f"{len(lines)} lines for {len(roles)} roles: {synthesized} synthesized, "
+        f"{len(lines) - synthesized} already cached in {args.directory}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Synthesize the roles' must-have questions into the TTS disk cache."
+    )
+    parser.add_argument("--role", action="append", help="only these roles, default all")
+    parser.add_argument("--directory", default=TTS_CACHE_DIR, help="default TTS_CACHE_DIR")
+    parser.add_argument("--voice", default=TTS_VOICE)
+    parser.add_argument("--speed", type=float, default=TTS_SPEED)
+    parser.add_argument("--no-common", action="store_true", help="skip the common lines")
+    args = parser.parse_args()
+    if not args.directory:
+        parser.error("set TTS_CACHE_DIR or pass --directory, the server reads the cache there")
+    asyncio.run(prewarm(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import asyncio
+import argparse
+
+from ..db import requeue_jobs_db
+from ..jobs import create_job_runner
+
+
+async def replay(args):
+    count = await requeue_jobs_db(status=args.status, kind=args.kind, job_ids=args.job_id)
+    print(f"Requeued {count} {args.status} jobs")
+    if not args.run:
+        return
+
+    # work through the queue in this process instead of waiting for the server
+    runner = create_job_runner()
+    runner.start()
+    try:
+        await asyncio.sleep(args.run)
+    finally:
+        await runner.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Queue background jobs again, by default the ones that failed."
+    )
+    parser.add_argument("--status", default="failed", choices=["failed", "done", "queued"])
+    parser.add_argument("--kind", help="only jobs of this kind, e.g. evaluate_interview")
+    parser.add_argument("--job-id", type=int, action="append", help="only these job ids")
+    parser.add_argument(
+        "--run",
+        type=float,
+        metavar="SECONDS",
+        help="also run the queue in this process for this many seconds",
+    )
+    asyncio.run(replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
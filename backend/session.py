@@ -1,18 +1,209 @@
-import redis
+import time
 import json
+import redis.asyncio as redis
+
+from langchain.schema import AIMessage, BaseMessage, HumanMessage
+from .metrics import timed
+from .constants import REDIS_URL, REDIS_MAX_CONNECTIONS, SESSION_BACKEND, SESSION_TTL
+
+# version 1: [1, "ai" | "human", content, created_at]
+# version 2: [2, "ai" | "human", content, created_at, confidence]
+MESSAGE_CODEC_VERSION = 2
+
+
+def encode_message(message: BaseMessage) -> str:
+    """Encode a chat message into the compact, versioned form stored in Redis"""
+    kind = "ai" if isinstance(message, AIMessage) else "human"
+    created_at = message.response_metadata.setdefault("created_at", time.time())
+    confidence = message.response_metadata.get("confidence")
+    return json.dumps(
+        [MESSAGE_CODEC_VERSION, kind, message.content, created_at, confidence],
+        separators=(",", ":"),
+    )
+
+
+def decode_message(raw) -> BaseMessage:
+    """Decode a chat message stored by `encode_message`"""
+    version, *fields = json.loads(raw)
+    if version == 1:
+        kind, content, created_at = fields
+        confidence = None
+    elif version == 2:
+        kind, content, created_at, confidence = fields
+    else:
+        raise ValueError(f"Unsupported message codec version: {version}")
+
+    metadata = {"created_at": created_at}
+    if confidence is not None:
+        metadata["confidence"] = confidence
+    message_cls = AIMessage if kind == "ai" else HumanMessage
+    return message_cls(content=content, response_metadata=metadata)
+
+
+class InMemoryRedis:
+    """
+    In-process stand-in for the subset of the asyncio Redis client used by SessionManager.
+
+    Meant for local development and tests; keys expire lazily when they are next touched.
+    """
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+
+    def _alive(self, key):
+        expires_at = self.expires.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            self.expires.pop(key, None)
+        return key in self.data
+
+    async def get(self, key):
+        return self.data[key] if self._alive(key) else None
+
+    async def set(self, key, value, ex=None, xx=False):
+        if xx and not self._alive(key):
+            return None
+        self.data[key] = value.encode() if isinstance(value, str) else value
+        self.expires.pop(key, None)
+        if ex:
+            await self.expire(key, ex)
+        return True
+
+    async def expire(self, key, seconds):
+        if not self._alive(key):
+            return False
+        self.expires[key] = time.monotonic() + seconds
+        return True
+
+    async def exists(self, *keys):
+        return sum(self._alive(key) for key in keys)
+
+    async def delete(self, *keys):
+        deleted = 0
+        for key in keys:
+            if self._alive(key):
+                del self.data[key]
+                self.expires.pop(key, None)
+                deleted += 1
+        return deleted
+
+    async def rpush(self, key, *values):
+        if not self._alive(key):
+            self.data[key] = []
+        self.data[key].extend(v.encode() if isinstance(v, str) else v for v in values)
+        return len(self.data[key])
+
+    async def llen(self, key):
+        return len(self.data[key]) if self._alive(key) else 0
+
+    async def lrange(self, key, start, end):
+        if not self._alive(key):
+            return []
+        values = self.data[key]
+        return values[start:] if end == -1 else values[start : end + 1]
+
+    def pipeline(self, transaction=True):
+        return _InMemoryPipeline(self)
+
+    async def aclose(self):
+        pass
+
+
+class _InMemoryPipeline:
+    def __init__(self, client: InMemoryRedis):
+        self.client = client
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((getattr(self.client, name), args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        results = [await command(*args, **kwargs) for command, args, kwargs in self.commands]
+        self.commands = []
+        return results
+
 
 class SessionManager:
-    def __init__(self, redis_url="redis://localhost:6379/0"):
-        self.client = redis.from_url(redis_url)
+    """
+    Store interview sessions in Redis.
+
+    The interviewer settings live under `<session_id>` and the conversation under
+    `<session_id>:messages`, a list that only ever grows by the messages of each new turn.
+    Both keys expire after `ttl` seconds without activity; every read or write refreshes
+    them in the same pipelined round-trip, so abandoned interviews don't linger in Redis.
+    """
+
+    def __init__(self, redis_url=REDIS_URL, ttl=SESSION_TTL, backend=SESSION_BACKEND):
+        if backend == "memory":
+            self.client = InMemoryRedis()
+        else:
+            pool = redis.ConnectionPool.from_url(redis_url, max_connections=REDIS_MAX_CONNECTIONS)
+            self.client = redis.Redis(connection_pool=pool)
+        self.ttl = ttl
+
+    @staticmethod
+    def _messages_key(session_id):
+        return f"{session_id}:messages"
+
+    def _refresh(self, pipe, session_id):
+        pipe.expire(session_id, self.ttl)
+        pipe.expire(self._messages_key(session_id), self.ttl)
 
-    def create_session(self, session_id, data):
-        self.client.set(session_id, json.dumps(data))
+    @timed("session_io")
+    async def create_session(self, session_id, data):
+        await self.client.set(session_id, json.dumps(data), ex=self.ttl)
 
-    def get_session(self, session_id):
-        session = self.client.get(session_id)
+    @timed("session_io")
+    async def update_session(self, session_id, data):
+        """Replace the settings of a session that still exists"""
+        await self.client.set(session_id, json.dumps(data), ex=self.ttl, xx=True)
+
+    @timed("session_io")
+    async def get_session(self, session_id):
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.get(session_id)
+            self._refresh(pipe, session_id)
+            session, *_ = await pipe.execute()
         return json.loads(session) if session else None
 
-    def remove_session(self, session_id):
-        if not self.client.exists(session_id):
+    @timed("session_io")
+    async def append_messages(self, session_id, messages):
+        """Append new conversation messages to the session and return its message count"""
+        async with self.client.pipeline(transaction=True) as pipe:
+            if messages:
+                pipe.rpush(
+                    self._messages_key(session_id), *(encode_message(m) for m in messages)
+                )
+            else:
+                pipe.llen(self._messages_key(session_id))
+            self._refresh(pipe, session_id)
+            count, *_ = await pipe.execute()
+        return count
+
+    @timed("session_io")
+    async def get_messages(self, session_id, start=0):
+        """Return the session's conversation messages from index `start` onwards"""
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.lrange(self._messages_key(session_id), start, -1)
+            self._refresh(pipe, session_id)
+            messages, *_ = await pipe.execute()
+        return [decode_message(raw) for raw in messages]
+
+    @timed("session_io")
+    async def remove_session(self, session_id):
+        if not await self.client.delete(session_id, self._messages_key(session_id)):
             raise ValueError(f"Session {session_id} does not exist.")
-        self.client.delete(session_id)
\ No newline at end of file
+
+    async def close(self):
+        await self.client.aclose()
@@ -0,0 +1,177 @@
+import math
+import time
+import logging
+
+import torch
+import whisper
+import numpy as np
+
+from torch.ao.quantization import quantize_dynamic
+from whisper.model import Linear as WhisperLinear
+
+from .constants import FAKE_STT_RTF, STT_COMPUTE_TYPE
+
+logger = logging.getLogger(__name__)
+
+
+class WhisperEngine:
+    """
+    openai-whisper in fp32, on whatever device torch picks.
+
+    Like `whisper.transcribe`, chunks whose text is too repetitive or too unlikely are decoded
+    again at the next of `temperatures`, unless they are most likely silence.
+    """
+
+    temperatures = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+    compression_ratio_threshold = 2.4
+    logprob_threshold = -1.0
+    no_speech_threshold = 0.6
+
+    def __init__(self, model_size: str, device: str = None):
+        self.model = whisper.load_model(model_size, device=device)
+
+    def _needs_fallback(self, result) -> bool:
+        if result.no_speech_prob > self.no_speech_threshold and (
+            result.avg_logprob < self.logprob_threshold
+        ):
+            return False  # silence
+        return (
+            result.compression_ratio > self.compression_ratio_threshold
+            or result.avg_logprob < self.logprob_threshold
+        )
+
+    def decode_batch(self, chunks: list) -> list:
+        """
+        Decode several audio chunks of up to 30 seconds in a single forward pass.
+
+        Parameters:
+        chunks (list): The 16 kHz audio chunks, padded or trimmed to 30 seconds here.
+
+        Returns:
+        list: A (text, confidence) tuple for each chunk, in order. The confidence is the
+        mean token probability of the decoded text.
+        """
+        mel = torch.stack(
+            [
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(chunk), n_mels=self.model.dims.n_mels
+                )
+                for chunk in chunks
+            ]
+        ).to(self.model.device)
+        results = [None] * len(chunks)
+        retry = list(range(len(chunks)))
+        for temperature in self.temperatures:
+            options = whisper.DecodingOptions(fp16=False, temperature=temperature)
+            for i, result in zip(retry, whisper.decode(self.model, mel[retry], options)):
+                results[i] = result
+            retry = [i for i in retry if self._needs_fallback(results[i])]
+            if not retry:
+                break
+        return [(result.text, math.exp(result.avg_logprob)) for result in results]
+
+
+class QuantizedWhisperEngine(WhisperEngine):
+    """
+    openai-whisper on the CPU with int8 weights for its linear layers.
+
+    Torch dynamic quantization keeps activations in float and quantizes them on the fly, so
+    the model and decoding loop are unchanged; the matrix multiplications, which dominate
+    CPU time, run in int8.
+    """
+
+    def __init__(self, model_size: str):
+        super().__init__(model_size, device="cpu")
+        plain_linear_layers(self.model)
+        self.model = quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def plain_linear_layers(model: torch.nn.Module):
+    """
+    Replace whisper's Linear layers by torch.nn.Linear ones sharing their weights.
+
+    whisper's Linear only adds a dtype cast, but dynamic quantization converts exact
+    torch.nn.Linear modules and nothing else.
+    """
+    for module in list(model.modules()):
+        for name, child in module.named_children():
+            if isinstance(child, WhisperLinear):
+                linear = torch.nn.Linear(
+                    child.in_features, child.out_features, bias=child.bias is not None
+                )
+                linear.weight, linear.bias = child.weight, child.bias
+                setattr(module, name, linear)
+
+
+class FasterWhisperEngine:
+    """
+    CTranslate2 through faster-whisper, int8 on the CPU by default (`STT_COMPUTE_TYPE`).
+
+    Each chunk is decoded on its own; CTranslate2 already uses every thread it is given.
+    """
+
+    def __init__(self, model_size: str, compute_type: str = STT_COMPUTE_TYPE):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise ImportError(
+                "The faster-whisper STT engine needs requirements-faster-whisper.txt installed"
+            ) from e
+
+        self.model = WhisperModel(
+            model_size,
+            device="cpu",
+            compute_type=compute_type,
+            cpu_threads=torch.get_num_threads(),
+        )
+
+    def _decode(self, chunk: np.ndarray) -> tuple:
+        segments, _ = self.model.transcribe(
+            chunk, beam_size=1, vad_filter=False, without_timestamps=True
+        )
+        segments = list(segments)
+        if not segments:
+            return "", 0.0
+        text = " ".join(segment.text.strip() for segment in segments)
+        avg_logprob = sum(segment.avg_logprob for segment in segments) / len(segments)
+        return text, math.exp(avg_logprob)
+
+    def decode_batch(self, chunks: list) -> list:
+        return [self._decode(np.asarray(chunk, dtype=np.float32)) for chunk in chunks]
+
+
+class FakeEngine:
+    """Returns a fixed transcript after `rtf` seconds per second of audio, loads no model."""
+
+    transcript = "I would start by measuring where the time goes and then fix the slowest part."
+    confidence = 0.9
+
+    def __init__(self, model_size: str = None, rtf: float = FAKE_STT_RTF):
+        self.rtf = rtf
+
+    def seconds(self, chunks: list) -> float:
+        """How long decoding the chunks pretends to take."""
+        return sum(len(chunk) for chunk in chunks) / whisper.audio.SAMPLE_RATE * self.rtf
+
+    def results(self, chunks: list) -> list:
+        return [(self.transcript, self.confidence) for _ in chunks]
+
+    def decode_batch(self, chunks: list) -> list:
+        time.sleep(self.seconds(chunks))
+        return self.results(chunks)
+
+
+STT_ENGINES = {
+    "whisper": WhisperEngine,
+    "whisper-int8": QuantizedWhisperEngine,
+    "faster-whisper": FasterWhisperEngine,
+    "fake": FakeEngine,
+}
+
+
+def create_stt_engine(name: str, model_size: str):
+    """Load the STT engine registered as `name` with the given Whisper model size."""
+    if name not in STT_ENGINES:
+        raise ValueError(f"Unknown STT engine {name!r}, expected one of {sorted(STT_ENGINES)}")
+    logger.info(f"Loading {name} STT engine with the {model_size} model")
+    return STT_ENGINES[name](model_size)
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+import contextvars
+import numpy as np
+
+from whisper.audio import SAMPLE_RATE
+
+from .metrics import latency, record_audio
+from .constants import STT_BATCH_WINDOW, STT_MAX_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+class STTScheduler:
+    """
+    Batch Whisper decoding across all connected interview sessions.
+
+    Chunks submitted within `batch_window` seconds of each other are stacked into one
+    log-mel batch and decoded by a single `whisper.decode` call off the event loop, so
+    concurrent candidates share each forward pass. Up to `inference.concurrency` batches run
+    at once; while they are busy new chunks keep accumulating into the next batch.
+    """
+
+    def __init__(
+        self,
+        inference,
+        batch_window: float = STT_BATCH_WINDOW,
+        max_batch_size: int = STT_MAX_BATCH_SIZE,
+    ):
+        self.inference = inference
+        self.batch_window = batch_window
+        self.max_batch_size = max_batch_size
+        self.queue = None
+        self._slots = None
+        self._worker = None
+        self._decoding = set()
+
+    async def transcribe(self, chunks: list) -> tuple:
+        """
+        Transcribe audio chunks of up to 30 seconds, submitting each of them to the batch.
+
+        The caller decides where the chunks are cut, normally at the pauses its VAD found.
+        Returns the text and the mean confidence of its chunks (None if nothing was decoded).
+        """
+        results = await asyncio.gather(*(self._submit(chunk) for chunk in chunks))
+        text = " ".join(text.strip() for text, _ in results).strip()
+        confidence = sum(c for _, c in results) / len(results) if results else None
+        return text, confidence
+
+    async def _submit(self, chunk: np.ndarray) -> tuple:
+        if self._worker is None or self._worker.done():
+            self.queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.inference.concurrency)
+            # a fresh context, or every batch would log under the first submitter's trace id
+            self._worker = asyncio.create_task(self._run(), context=contextvars.Context())
+
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((chunk, future))
+        return await future
+
+    async def _collect_batch(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            await self._slots.acquire()
+            batch = await self._collect_batch()
+            task = asyncio.create_task(self._decode(batch))
+            self._decoding.add(task)
+            task.add_done_callback(self._decoded)
+
+    def _decoded(self, task: asyncio.Task):
+        self._decoding.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"STT batch task failed: {task.exception()!r}")
+
+    async def _decode(self, batch: list):
+        try:
+            with latency.time("stt"):
+                results = await self.inference.decode_batch([chunk for chunk, _ in batch])
+            record_audio("stt", sum(len(chunk) for chunk, _ in batch) / SAMPLE_RATE)
+        except Exception as e:
+            logger.error(f"Error decoding STT batch of {len(batch)}: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._slots.release()
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
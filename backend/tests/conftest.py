@@ -0,0 +1,17 @@
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+# the backend reads its settings when it is imported, so this has to come first
+os.environ["DATABASE_NAME"] = os.path.join(tempfile.mkdtemp(), "test.db")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def database():
+    from backend.scripts.init_db import create_tables
+
+    with sqlite3.connect(os.environ["DATABASE_NAME"]) as conn:
+        create_tables(conn)
+    yield os.environ["DATABASE_NAME"]
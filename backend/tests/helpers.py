@@ -0,0 +1,81 @@
+"""Test data shared by the test modules: recorded speech and seeded interviews."""
+
+import io
+import uuid
+import random
+import sqlite3
+
+import av
+import numpy as np
+
+from backend import db
+from backend.migrations import migrate
+from backend.scripts.init_db import create_tables
+
+RECORDER_RATE = 48000
+
+
+def speech(seconds: float, pauses=()) -> np.ndarray:
+    """A voice-like tone with (start, end) pauses of near silence, at the recorder rate."""
+    t = np.arange(int(seconds * RECORDER_RATE)) / RECORDER_RATE
+    audio = 0.3 * np.sin(2 * np.pi * 220 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 3 * t))
+    for start, end in pauses:
+        audio[int(start * RECORDER_RATE) : int(end * RECORDER_RATE)] = 0
+    return audio + 0.001 * np.random.default_rng(0).standard_normal(len(audio))
+
+
+def encode_ogg(audio: np.ndarray) -> bytes:
+    """Encode the audio as ogg/opus, like the browser's MediaRecorder."""
+    output = io.BytesIO()
+    with av.open(output, "w", format="ogg") as container:
+        stream = container.add_stream("libopus", rate=RECORDER_RATE)
+        stream.layout = "mono"
+        samples = (audio * 32767).astype(np.int16)
+        for start in range(0, len(samples), 960):
+            frame = av.AudioFrame.from_ndarray(
+                samples[None, start : start + 960], format="s16", layout="mono"
+            )
+            frame.sample_rate = RECORDER_RATE
+            container.mux(stream.encode(frame))
+        container.mux(stream.encode(None))
+    return output.getvalue()
+
+
+SKILLS = [
+    "Django", "Flask", "FastAPI", "PostgreSQL", "Redis", "Kubernetes", "Docker", "React",
+    "TypeScript", "GraphQL", "Kafka", "Terraform", "pandas", "PyTorch", "asyncio", "Celery",
+    "Rust", "Go", "Java", "Spring", "Angular", "Vue", "MongoDB", "Cassandra", "Elasticsearch",
+    "RabbitMQ", "Airflow", "Spark", "Snowflake", "dbt", "Ansible", "Jenkins", "Prometheus",
+    "Grafana", "OAuth", "gRPC", "WebSockets", "NumPy", "scikit-learn", "TensorFlow", "Kotlin",
+    "Swift", "Svelte", "Nginx", "Lambda", "DynamoDB", "BigQuery", "Pulsar",
+]
+FILLER = (
+    "I worked on a team that owned the billing service and we spent a lot of time on "
+    "testing, code review, deployment pipelines and on call rotations for production"
+).split()
+
+
+def sentence(rng, words=25):
+    """Filler text mentioning one skill, picked with a long-tailed (Zipf-like) frequency."""
+    text = rng.choices(FILLER, k=words)
+    skill = rng.choices(SKILLS, weights=[1 / rank for rank in range(1, len(SKILLS) + 1)])[0]
+    text.insert(rng.randrange(len(text)), skill)
+    return " ".join(text) + "."
+
+
+def seed(path, interviews, turns, seed_value=0):
+    """Create `interviews` synthetic interviews of `turns` question/answer pairs."""
+    rng = random.Random(seed_value)
+    with sqlite3.connect(path) as conn:
+        create_tables(conn)
+        migrate(conn)
+        for _ in range(interviews):
+            messages = [
+                {"role": "AI" if i % 2 == 0 else "User", "message": sentence(rng)}
+                for i in range(turns * 2)
+            ]
+            evaluation = f"{sentence(rng, 40)} SCORE: {rng.randint(1, 10)}"
+            db._insert_interview(
+                conn, str(uuid.uuid4()), rng.choice(SKILLS), "", messages, evaluation
+            )
+        conn.commit()
@@ -0,0 +1,128 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from prometheus_client import REGISTRY
+
+from backend.audio import AudioDecodeError, StreamDecoder, StreamingTranscriber, decode_audio
+from backend.tests.helpers import encode_ogg, speech
+
+STT_RATE = 16000
+
+
+class RecordingSTT:
+    def __init__(self):
+        self.durations = []
+
+    async def transcribe(self, chunks):
+        self.durations.append([len(chunk) / STT_RATE for chunk in chunks])
+        return f"part {len(self.durations)}", 0.9
+
+
+def test_stream_decoder_matches_decoding_at_once():
+    data = encode_ogg(speech(5))
+
+    async def decode_in_chunks():
+        decoder = StreamDecoder()
+        decoded = []
+        for start in range(0, len(data), 4000):
+            decoder.feed(data[start : start + 4000])
+            await asyncio.sleep(0.01)
+            decoded.append(decoder.read())
+        decoded.append(await decoder.close())
+        return np.concatenate(decoded)
+
+    np.testing.assert_array_equal(asyncio.run(decode_in_chunks()), decode_audio(data))
+
+
+def test_streaming_transcriber_commits_at_pauses():
+    pauses = [(6, 6.6), (13, 13.6), (19, 19.6)]
+    data = encode_ogg(speech(25, pauses))
+    stt = RecordingSTT()
+
+    async def answer():
+        transcriber = StreamingTranscriber(stt, window_seconds=4)
+        partials = []
+        for start in range(0, len(data), len(data) // 25):
+            transcriber.feed(data[start : start + len(data) // 25])
+            await asyncio.sleep(0.02)
+            partials.append(await transcriber.step())
+        return partials, await transcriber.finalize()
+
+    recorded = REGISTRY.get_sample_value("interview_vad_speech_ratio_count") or 0
+    partials, (text, confidence) = asyncio.run(answer())
+
+    assert [partial for partial in partials if partial] == [
+        "part 1",
+        "part 1 part 2",
+        "part 1 part 2 part 3",
+    ]
+    assert (text, confidence) == ("part 1 part 2 part 3 part 4", 0.9)
+    # each step sends the speech between two pauses as one chunk, without the pauses
+    speech_between_pauses = [6, 13 - 6.6, 19 - 13.6, 25 - 19.6]
+    for durations, expected in zip(stt.durations, speech_between_pauses):
+        assert len(durations) == 1
+        assert abs(durations[0] - expected) < 0.5
+    # the share of speech the VAD kept is recorded for every transcribed stretch
+    assert REGISTRY.get_sample_value("interview_vad_speech_ratio_count") == recorded + 4
+
+
+def test_undecodable_answer_raises_and_resets():
+    stt = RecordingSTT()
+    transcriber = StreamingTranscriber(stt)
+    transcriber.feed(b"not an audio stream" * 100)
+
+    with pytest.raises(AudioDecodeError):
+        asyncio.run(transcriber.finalize())
+    with pytest.raises(AudioDecodeError):
+        decode_audio(b"not an audio stream" * 100)
+    assert transcriber.decoder is None
+    assert stt.durations == []
+
+
+def test_truncated_answer_keeps_what_was_decoded():
+    data = encode_ogg(speech(5))
+    transcriber = StreamingTranscriber(RecordingSTT())
+    transcriber.feed(data[: len(data) // 2])
+
+    text, _ = asyncio.run(transcriber.finalize())
+
+    assert text == "part 1"
+    assert 1.5 < sum(transcriber.stt.durations[0]) < 3.5
+
+
+def test_partial_transcription_errors_reach_finalize():
+    class FailingSTT(RecordingSTT):
+        async def transcribe(self, chunks):
+            raise RuntimeError("STT worker crashed")
+
+    async def answer():
+        transcriber = StreamingTranscriber(FailingSTT(), window_seconds=1)
+        transcriber.feed(encode_ogg(speech(3, [(1.5, 2.1)])))
+        await asyncio.sleep(0.1)
+        transcriber.pending = asyncio.create_task(transcriber.step())
+        with pytest.raises(RuntimeError, match="STT worker crashed"):
+            await transcriber.finalize()
+        return transcriber
+
+    transcriber = asyncio.run(answer())
+
+    assert transcriber.pending is None and transcriber.decoder is None
+
+
+def test_reset_cancels_the_partial_transcription():
+    class SlowSTT(RecordingSTT):
+        async def transcribe(self, chunks):
+            await asyncio.sleep(10)
+
+    async def disconnect():
+        transcriber = StreamingTranscriber(SlowSTT(), window_seconds=1)
+        transcriber.feed(encode_ogg(speech(3, [(1.5, 2.1)])))
+        await asyncio.sleep(0.1)
+        pending = transcriber.pending = asyncio.create_task(transcriber.step())
+        await asyncio.sleep(0.01)
+        await transcriber.reset()
+        return pending
+
+    assert asyncio.run(disconnect()).cancelled()
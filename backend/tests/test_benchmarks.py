@@ -0,0 +1,390 @@
+"""
+Microbenchmarks of the audio, transcript, resume and database hot paths.
+
+They only run once, as plain tests, unless benchmarking is enabled; save each run so later
+commits can be compared with it:
+
+    pytest tests/test_benchmarks.py --benchmark-enable --benchmark-autosave
+    pytest tests/test_benchmarks.py --benchmark-enable --benchmark-compare \
+        --benchmark-compare-fail=median:25%
+
+The database benchmarks run against BENCH_INTERVIEWS seeded interviews (default 10000).
+"""
+
+import os
+import uuid
+import random
+import asyncio
+import sqlite3
+
+import numpy as np
+import pytest
+
+from langchain.schema import AIMessage, HumanMessage
+from whisper.audio import SAMPLE_RATE
+
+from backend import db
+from backend.audio import (
+    AudioToText,
+    PCMEncoder,
+    VoiceActivityDetector,
+    chunk_audio,
+    decode_audio,
+    split_audio,
+)
+from backend.db import Database
+from backend.session import decode_message, encode_message
+from backend.tests.helpers import SKILLS, seed, sentence
+from backend.util import resume_reader, split_sentences, transform_interview
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "sample.wav")
+STT_MODEL = os.environ.get("BENCH_STT_MODEL", "tiny")
+INTERVIEWS = int(os.environ.get("BENCH_INTERVIEWS", 10_000))
+TURNS = 10
+# seconds, searching terms and phrases took 1-3ms at 100000 seeded interviews
+SEARCH_TARGET = 0.01
+RESUME_LINE = (
+    "Senior backend developer - Python, Django, PostgreSQL, Redis and Kafka on AWS, "
+    "owned the billing platform and its CI/CD pipelines"
+)
+
+
+def benchmarking(config) -> bool:
+    return config.getoption("benchmark_enable") or not config.getoption("benchmark_disable")
+
+
+@pytest.fixture(scope="module")
+def loop():
+    """One event loop for every async benchmark, so creating it is never timed."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+def make_pdf(pages: int, lines: int = 45) -> bytes:
+    """A text-only PDF of `pages` pages, laid out like an exported resume."""
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # the page tree, once the pages are known
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in range(1, pages + 1):
+        text = " ".join(
+            f"(Page {page} line {line}: {RESUME_LINE}) Tj T*" for line in range(lines)
+        )
+        stream = f"BT /F1 9 Tf 14 TL 40 770 Td {text} ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>"
+
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n{body}\nendobj\n".encode()
+    xref = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    pdf += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    pdf += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return pdf
+
+
+# audio
+
+
+@pytest.fixture(scope="module")
+def answer():
+    with open(SAMPLE, "rb") as f:
+        data = f.read()
+    return data, decode_audio(data)
+
+
+@pytest.fixture(scope="module")
+def long_answer(answer):
+    """The sample answer repeated to about 90 seconds, so it spans several chunks."""
+    _, audio = answer
+    return np.tile(audio, max(1, int(90 * SAMPLE_RATE / len(audio))))
+
+
+@pytest.fixture(scope="module")
+def stt(request):
+    if not benchmarking(request.config):
+        pytest.skip("loads a Whisper model, only benchmarked")
+    return AudioToText(STT_MODEL)
+
+
+def test_decode_audio(benchmark, answer):
+    data, _ = answer
+    benchmark(decode_audio, data)
+
+
+def test_chunk_audio(benchmark, long_answer):
+    benchmark(chunk_audio, long_answer)
+
+
+def test_split_audio_at_pauses(benchmark, long_answer):
+    benchmark(split_audio, long_answer, VoiceActivityDetector())
+
+
+def test_pcm_encode(benchmark):
+    encoder = PCMEncoder()
+    speech = np.random.default_rng(0).uniform(-1, 1, encoder.sample_rate * 5)
+    benchmark(encoder.encode, speech.astype(np.float32))
+
+
+def test_transcribe_array(benchmark, stt, answer):
+    _, audio = answer
+    benchmark(stt.transcribe_array, audio)
+
+
+def test_transcribe_audio(benchmark, stt, tmp_path):
+    with open(SAMPLE, "rb") as f:
+        data = f.read()
+
+    def copy_answer():
+        # transcribe_audio deletes the file it is given
+        path = tmp_path / f"{uuid.uuid4()}.wav"
+        path.write_bytes(data)
+        return (str(path),), {}
+
+    benchmark.pedantic(stt.transcribe_audio, setup=copy_answer, rounds=10)
+
+
+# transcript
+
+
+@pytest.fixture(scope="module")
+def messages():
+    rng = random.Random(0)
+    messages = []
+    for turn in range(TURNS * 2):
+        metadata = {"created_at": 1_700_000_000 + turn}
+        if turn % 2:
+            metadata["confidence"] = 0.9
+            messages.append(HumanMessage(content=sentence(rng, 80), response_metadata=metadata))
+        else:
+            messages.append(AIMessage(content=sentence(rng, 25), response_metadata=metadata))
+    return messages
+
+
+@pytest.mark.parametrize("with_metadata", [False, True])
+def test_transform_interview(benchmark, messages, with_metadata):
+    benchmark(transform_interview, messages, with_metadata=with_metadata)
+
+
+def test_encode_messages(benchmark, messages):
+    benchmark(lambda: [encode_message(message) for message in messages])
+
+
+def test_decode_messages(benchmark, messages):
+    encoded = [encode_message(message) for message in messages]
+    benchmark(lambda: [decode_message(message) for message in encoded])
+
+
+def test_split_sentences(benchmark, loop):
+    tokens = [word + " " for word in sentence(random.Random(0), 300).split()]
+
+    async def sentences():
+        async def stream():
+            for token in tokens:
+                yield token
+
+        return [s async for s in split_sentences(stream())]
+
+    benchmark(lambda: loop.run_until_complete(sentences()))
+
+
+# resume
+
+
+@pytest.mark.parametrize("pages", [1, 5, 20])
+def test_resume_reader(benchmark, pages):
+    benchmark(resume_reader, make_pdf(pages))
+
+
+# database
+
+
+@pytest.fixture(scope="module")
+def seeded(request, tmp_path_factory):
+    """A database of seeded interviews, used by `db` for the module's tests."""
+    path = str(tmp_path_factory.mktemp("bench") / "bench.db")
+    seed(path, INTERVIEWS if benchmarking(request.config) else 200, TURNS)
+    rng = random.Random(0)
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "INSERT INTO users (username, password, role) VALUES (?, ?, ?)",
+            ("benchuser", "not-a-hash", "admin"),
+        )
+        conn.executemany(
+            "INSERT INTO role_settings (role, custom_questions, job_description) "
+            "VALUES (?, ?, ?)",
+            [(skill, "Ask about their pets!", sentence(rng, 200)) for skill in SKILLS],
+        )
+        session_ids = [row[0] for row in conn.execute("SELECT session_id FROM interviews")]
+        deep = conn.execute(
+            "SELECT created_at, session_id FROM interviews "
+            "ORDER BY created_at DESC, session_id DESC LIMIT 1 OFFSET ?",
+            (len(session_ids) // 2,),
+        ).fetchone()
+
+    database, db.database = db.database, Database(path)
+    yield session_ids, deep
+    db.database = database
+
+
+@pytest.fixture
+def run(benchmark, loop):
+    """Benchmark a coroutine function, with a coroutine `setup` run before each round."""
+
+    def run(fn, setup=None, rounds=50):
+        if setup is None:
+            return benchmark(lambda: loop.run_until_complete(fn()))
+        return benchmark.pedantic(
+            lambda *args: loop.run_until_complete(fn(*args)),
+            setup=lambda: (loop.run_until_complete(setup()), {}),
+            rounds=rounds,
+        )
+
+    return run
+
+
+@pytest.fixture(scope="module")
+def interview():
+    rng = random.Random(0)
+    messages = [
+        {"role": "AI" if i % 2 == 0 else "User", "message": sentence(rng)}
+        for i in range(TURNS * 2)
+    ]
+    return messages, f"{sentence(rng, 40)} SCORE: 7"
+
+
+async def new_id():
+    return (str(uuid.uuid4()),)
+
+
+def test_migrate_db(run, seeded):
+    run(db.migrate_db)
+
+
+def test_get_user_from_db(run, seeded):
+    run(lambda: db.get_user_from_db("benchuser"))
+
+
+def test_get_roles_db(run, seeded):
+    run(db.get_roles_db)
+
+
+def test_get_role_settings(run, seeded):
+    run(lambda: db.get_role_settings("Django"))
+
+
+def test_get_role_details_db(run, seeded):
+    run(lambda: db.get_role_details_db("Django"))
+
+
+def test_update_role_details_db(run, seeded):
+    run(lambda: db.update_role_details_db("Django", {"custom_questions": "Ask about pets"}))
+
+
+def test_create_role_to_db(run, seeded):
+    run(lambda role: db.create_role_to_db(role, "Ask about pets", "Build things"), new_id)
+
+
+@pytest.mark.parametrize("page", ["first", "role", "deep_cursor"])
+def test_get_interviews_from_db(run, seeded, page):
+    _, deep = seeded
+    arguments = {
+        "first": {},
+        "role": {"role": "Django"},
+        "deep_cursor": {"cursor": db.encode_cursor(*deep)},
+    }[page]
+    run(lambda: db.get_interviews_from_db(**arguments))
+
+
+@pytest.mark.parametrize("query", ["Django", "Pulsar", '"code review"'])
+def test_search_interviews_db(request, run, benchmark, seeded, query):
+    run(lambda: db.search_interviews_db(query))
+    if benchmarking(request.config):
+        # however many interviews match, a search stays interactive
+        assert benchmark.stats.stats.median < SEARCH_TARGET
+
+
+@pytest.mark.parametrize(
+    "fn", [db.get_interview_detail_from_db, db.get_interview_messages_from_db]
+)
+def test_read_interview(run, seeded, fn):
+    session_ids, _ = seeded
+    rng = random.Random(0)
+
+    async def some_id():
+        return (rng.choice(session_ids),)
+
+    run(fn, some_id)
+
+
+@pytest.mark.parametrize("fn", [db.save_interview_to_db, db.create_interview_role_to_db])
+def test_save_interview(run, seeded, interview, fn):
+    messages, evaluation = interview
+    run(lambda session_id: fn(session_id, "Django", "", messages, evaluation), new_id)
+
+
+def test_queue_interview_evaluation_db(run, seeded, interview):
+    messages, _ = interview
+    run(
+        lambda session_id: db.queue_interview_evaluation_db(session_id, "Django", "", messages),
+        new_id,
+    )
+
+
+def test_save_interview_evaluation_db(run, seeded, interview):
+    messages, evaluation = interview
+
+    async def queued_id():
+        session_id = str(uuid.uuid4())
+        await db.queue_interview_evaluation_db(session_id, "Django", "", messages)
+        return (session_id,)
+
+    run(lambda session_id: db.save_interview_evaluation_db(session_id, evaluation), queued_id)
+
+
+def test_set_evaluation_status_db(run, seeded):
+    session_ids, _ = seeded
+    rng = random.Random(0)
+
+    async def some_id():
+        return (rng.choice(session_ids),)
+
+    run(lambda session_id: db.set_evaluation_status_db(session_id, "pending"), some_id)
+
+
+def test_enqueue_job_db(run, seeded):
+    run(lambda: db.enqueue_job_db("bench", {}))
+
+
+def test_claim_jobs_db(run, seeded):
+    run(lambda: db.claim_jobs_db(1, 60))
+
+
+def test_finish_job_db(run, seeded):
+    async def claimed_job():
+        await db.enqueue_job_db("bench", {})
+        return ((await db.claim_jobs_db(1, 60))[0]["id"],)
+
+    run(lambda job_id: db.finish_job_db(job_id, "done"), claimed_job)
+
+
+def test_requeue_jobs_db(run, seeded):
+    run(lambda: db.requeue_jobs_db(kind="bench"))
+
+
+def test_cursor_round_trip(benchmark, seeded):
+    _, deep = seeded
+    benchmark(lambda: db.decode_cursor(db.encode_cursor(*deep)))
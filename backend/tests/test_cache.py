@@ -0,0 +1,69 @@
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.cache import GuidelineCache, TTSCache
+from backend.session import InMemoryRedis
+
+RESUME = "Backend developer, six years of Python and Django."
+ROLE = "Python (Django) Developer"
+DESCRIPTION = "Build our backend services."
+
+
+class Generator:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, resume, role, role_description):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return f"guidelines {self.calls}"
+
+
+def test_guidelines_are_cached_per_chat_model():
+    cache = GuidelineCache(InMemoryRedis())
+    generate = Generator()
+
+    async def guidelines(model):
+        return await cache.get_or_generate(RESUME, ROLE, DESCRIPTION, generate, model=model)
+
+    async def run():
+        return [
+            await guidelines("openai:gpt-4o-mini"),
+            await guidelines("openai:gpt-4o-mini"),
+            await guidelines("google:gemini-2.0-flash"),
+        ]
+
+    assert asyncio.run(run()) == ["guidelines 1", "guidelines 1", "guidelines 2"]
+    assert generate.calls == 2
+
+
+def test_concurrent_requests_share_one_generation_without_caching():
+    cache = GuidelineCache(InMemoryRedis(), ttl=0)
+    generate = Generator()
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                cache.get_or_generate(RESUME, ROLE, DESCRIPTION, generate, model="fake:fake")
+                for _ in range(3)
+            )
+        )
+
+    assert asyncio.run(run()) == ["guidelines 1"] * 3
+    # nothing is stored, so the next interview generates them again
+    assert asyncio.run(run()) == ["guidelines 2"] * 3
+    assert generate.calls == 2
+
+
+def test_concurrent_tts_cache_writes(tmp_path):
+    cache = TTSCache(directory=str(tmp_path))
+    cache.prune_every = 50
+    key = cache.key("Very nice.", "af_heart", 1.0, {"sample_rate": 24000})
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda i: cache._write(key, bytes([i % 256]) * 4096), range(400)))
+
+    assert cache._writes == 400
+    assert [path.name for path in tmp_path.iterdir()] == [f"{key}.pcm"]
+    assert len((tmp_path / f"{key}.pcm").read_bytes()) == 4096
@@ -0,0 +1,110 @@
+import uuid
+import asyncio
+
+import pytest
+
+from backend import db
+
+ROLE = "Date Filter Tester"
+
+
+@pytest.fixture(scope="module")
+def interviews():
+    """Interviews created at the given UTC times, by session id."""
+    created = {
+        "late-january-31": "2025-01-31 23:30:00",
+        "february-1": "2025-02-01 00:00:00",
+        "january-15": "2025-01-15 12:00:00",
+    }
+    ids = {name: f"{name}-{uuid.uuid4()}" for name in created}
+
+    def insert(conn):
+        for name, created_at in created.items():
+            db._insert_interview(conn, ids[name], ROLE, "", [], None)
+            conn.execute(
+                "UPDATE interviews SET created_at = ? WHERE session_id = ?",
+                (created_at, ids[name]),
+            )
+
+    async def setup():
+        await db.migrate_db()
+        await db.database.write(insert)
+
+    asyncio.run(setup())
+    return ids
+
+
+def listed(interviews, **bounds):
+    page = asyncio.run(db.get_interviews_from_db(role=ROLE, **bounds))
+    names = {session_id: name for name, session_id in interviews.items()}
+    return [names[interview["session_id"]] for interview in page["interviews"]]
+
+
+def test_until_a_date_includes_that_whole_day(interviews):
+    assert listed(interviews, until="2025-01-31") == ["late-january-31", "january-15"]
+
+
+def test_since_a_date_starts_at_midnight(interviews):
+    assert listed(interviews, since="2025-01-31") == ["february-1", "late-january-31"]
+
+
+def test_datetime_bounds_with_t_separator_and_offset(interviews):
+    assert listed(interviews, since="2025-01-31T23:30:00", until="2025-01-31T23:59:59") == [
+        "late-january-31"
+    ]
+    # 01:00 at UTC+2 is 23:00 UTC the day before
+    assert listed(interviews, since="2025-02-01T01:00:00+02:00") == [
+        "february-1",
+        "late-january-31",
+    ]
+
+
+def test_invalid_bound():
+    with pytest.raises(ValueError, match="Invalid until"):
+        asyncio.run(db.get_interviews_from_db(until="last tuesday"))
+
+
+def test_search_ranks_every_match_not_only_the_newest():
+    best = f"best-{uuid.uuid4()}"
+    strong = {"role": "AI", "message": "Tell me about your zanzibarite zanzibarite pipeline."}
+    weak = "A long answer that mentions zanzibarite once, among many other words. " * 5
+
+    def insert(conn):
+        db._insert_interview(conn, best, ROLE, "", [strong], None)
+        # hundreds of newer, weaker matches
+        conn.executemany(
+            "INSERT INTO interview_search (session_id, role, kind, body) VALUES (?, ?, ?, ?)",
+            [(f"weak-{index}", ROLE, "answer", weak) for index in range(500)],
+        )
+
+    async def search():
+        await db.migrate_db()
+        await db.database.write(insert)
+        return await db.search_interviews_db("zanzibarite", limit=5)
+
+    results = asyncio.run(search())
+
+    assert results[0]["session_id"] == best
+    assert results[0]["score"] > 0
+    assert "<mark>zanzibarite</mark>" in results[0]["snippet"]
+
+
+def test_search_lists_the_newest_hits_of_frequent_terms(monkeypatch):
+    monkeypatch.setattr(db, "SEARCH_RANKED_MATCHES", 3)
+    ids = [f"frequent-{index}-{uuid.uuid4()}" for index in range(6)]
+    question = {"role": "AI", "message": "How do you deploy quokkaform modules?"}
+
+    def insert(conn):
+        for session_id in ids:
+            db._insert_interview(conn, session_id, ROLE, "", [question], None)
+
+    async def search(query):
+        await db.migrate_db()
+        await db.database.write(insert)
+        return await db.search_interviews_db(query, limit=2)
+
+    results = asyncio.run(search("quokkaform"))
+
+    assert [result["session_id"] for result in results] == ids[:-3:-1]
+    assert [result["score"] for result in results] == [None, None]
+    assert "<mark>quokkaform</mark>" in results[0]["snippet"]
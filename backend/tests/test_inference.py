@@ -0,0 +1,83 @@
+import time
+import asyncio
+import threading
+
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from backend import inference
+
+
+def test_without_an_stt_model_only_tts_is_loaded(monkeypatch):
+    def load_whisper(model_size):
+        raise AssertionError(f"loaded the {model_size} Whisper model")
+
+    monkeypatch.setattr(inference, "AudioToText", load_whisper)
+    monkeypatch.setattr(inference, "_load_tts", lambda: "tts pipeline")
+    local = inference.LocalInference(stt_model=None)
+
+    asyncio.run(local.load(warm_up=False))
+
+    assert (local.stt, local.tts) == (None, "tts pipeline")
+    assert local.ready == {"stt": False, "tts": True}
+
+
+class SlowPipeline:
+    """A TTS pipeline that takes `delay` seconds per segment."""
+
+    def __init__(self, segments=3, delay=0.2, error=None):
+        self.segments, self.delay, self.error = segments, delay, error
+        self.finished = threading.Event()
+
+    def __call__(self, text, voice, speed):
+        for i in range(self.segments):
+            time.sleep(self.delay)
+            yield SimpleNamespace(audio=np.full(10, i, dtype=np.float32))
+        if self.error:
+            raise self.error
+        self.finished.set()
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A pool whose workers are threads of this process, sharing its fake models."""
+    pool = inference.ProcessPoolInference(workers=1)
+    pool.executor.shutdown()
+    pool.executor = ThreadPoolExecutor(1)
+    monkeypatch.setattr(inference, "_segments", pool._segments)
+    yield pool
+    pool.shutdown()
+
+
+def synthesize(pool, pipeline) -> list:
+    async def receive():
+        segments = []
+        async for segment in pool.synthesize("Tell me about your last project."):
+            segments.append((segment[0], pipeline.finished.is_set()))
+        return segments
+
+    return asyncio.run(receive())
+
+
+def test_the_pool_streams_each_segment_as_soon_as_it_is_synthesized(pool, monkeypatch):
+    pipeline = SlowPipeline()
+    monkeypatch.setattr(inference, "_tts", pipeline)
+
+    segments = synthesize(pool, pipeline)
+
+    assert [segment for segment, _ in segments] == [0, 1, 2]
+    # the first segments arrived while the rest of the sentence was still being synthesized
+    assert [finished for _, finished in segments[:2]] == [False, False]
+    assert not pool._streams
+
+
+def test_pool_synthesis_errors_reach_the_caller(pool, monkeypatch):
+    pipeline = SlowPipeline(segments=1, delay=0, error=RuntimeError("TTS crashed"))
+    monkeypatch.setattr(inference, "_tts", pipeline)
+
+    with pytest.raises(RuntimeError, match="TTS crashed"):
+        synthesize(pool, pipeline)
+    assert not pool._streams
@@ -0,0 +1,110 @@
+import asyncio
+
+from langchain.schema import SystemMessage, get_buffer_string
+
+from backend.chat_model import FakeChatModel, InterViewer
+from backend.util import estimate_tokens
+
+ANSWER = (
+    "In my last role I owned the ingestion service, we moved it from cron jobs to a queue "
+    "with retries and I added tracing so we could see where the latency went. "
+) * 3
+QUESTION = "Thanks. Can you walk me through how you would approach that differently today?"
+NOTES = "Notes: the candidate discussed queues, retries and tracing."
+
+
+class RecordingChatModel(FakeChatModel):
+    """Answers instantly with fixed replies and records the size of every prompt."""
+
+    latency: float = 0
+    token_latency: float = 0
+    prompt_tokens: list = []
+
+    def _reply(self, messages) -> str:
+        prompt = get_buffer_string(messages)
+        self.prompt_tokens.append(estimate_tokens(prompt))
+        return NOTES if "keeping notes" in prompt else QUESTION
+
+
+def interviewer(memory_turns, memory_token_budget=2000) -> InterViewer:
+    interviewer = InterViewer(
+        "Ask about their experience with distributed systems.",
+        "Anna",
+        "Backend Developer",
+        "Ten years of Python.",
+        "Build and run our backend services.",
+        (["Ask about their favorite programming language"],),
+        memory_turns=memory_turns,
+        memory_token_budget=memory_token_budget,
+    )
+    interviewer.llm = RecordingChatModel()
+    interviewer.memory.chat_memory.add_ai_message("Hello! Tell me about your last role.")
+    return interviewer
+
+
+async def answer(interviewer: InterViewer):
+    async for _ in interviewer.stream_question(ANSWER):
+        pass
+    return interviewer.llm.prompt_tokens[-1]
+
+
+def question_prompt_sizes(interviewer: InterViewer, turns: int) -> list:
+    """Answer `turns` questions, summarizing after each, and return each question's prompt
+    size."""
+
+    async def run():
+        sizes = []
+        for _ in range(turns):
+            sizes.append(await answer(interviewer))
+            await interviewer.update_summary()
+        return sizes
+
+    return asyncio.run(run())
+
+
+def test_prompt_size_stops_growing_once_the_window_is_full():
+    full = question_prompt_sizes(interviewer(memory_turns=0), 20)
+    bounded = question_prompt_sizes(interviewer(memory_turns=3), 20)
+
+    settled = bounded[3 + 1 :]
+    assert max(settled) == min(settled)
+    assert full == sorted(full) and full[-1] > 3 * settled[-1]
+
+
+def test_folded_turns_are_sent_until_the_summary_covers_them():
+    bounded = interviewer(memory_turns=2)
+
+    async def run():
+        for _ in range(4):
+            await answer(bounded)
+
+    asyncio.run(run())
+    messages = bounded.memory.chat_memory.messages
+
+    # the summary has not run, so nothing may be left out
+    assert bounded.needs_summary
+    assert bounded.history() == messages
+
+    assert asyncio.run(bounded.update_summary())
+    summary, *recent = bounded.history()
+    assert isinstance(summary, SystemMessage) and NOTES in summary.content
+    assert recent == messages[-4:]
+
+
+def test_prompt_stays_bounded_when_summarizing_fails():
+    bounded = interviewer(memory_turns=3, memory_token_budget=600)
+    unsummarized = interviewer(memory_turns=0)
+
+    async def run():
+        sizes = []
+        for _ in range(20):
+            # the summary never comes in
+            sizes.append((await answer(bounded), await answer(unsummarized)))
+        return sizes
+
+    sizes = asyncio.run(run())
+
+    assert bounded.needs_summary and not bounded.summary
+    assert bounded.history() == bounded._window()[1]
+    settled = [size for size, _ in sizes[5:]]
+    assert max(settled) == min(settled) and sizes[-1][1] > 3 * settled[-1]
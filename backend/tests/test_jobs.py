@@ -0,0 +1,37 @@
+import asyncio
+import logging
+
+from backend import jobs
+
+
+def test_a_failed_status_write_is_logged(monkeypatch, caplog):
+    async def finish_job_db(job_id, status, **kwargs):
+        raise RuntimeError("database is locked")
+
+    async def handler(payload):
+        pass
+
+    monkeypatch.setattr(jobs, "finish_job_db", finish_job_db)
+    runner = jobs.JobRunner()
+    runner.register("noop", handler)
+
+    with caplog.at_level(logging.ERROR, logger=jobs.__name__):
+        asyncio.run(runner._execute({"id": 7, "kind": "noop", "payload": {}, "attempts": 1}))
+
+    assert "Error marking job 7 done: database is locked" in caplog.text
+
+
+def test_a_job_that_crashes_the_runner_is_logged(caplog):
+    async def run():
+        runner = jobs.JobRunner()
+        crashed = asyncio.get_running_loop().create_future()
+        crashed.set_exception(RuntimeError("lost the job"))
+        runner.running.add(crashed)
+        runner._job_done(crashed)
+        return runner
+
+    with caplog.at_level(logging.ERROR, logger=jobs.__name__):
+        runner = asyncio.run(run())
+
+    assert not runner.running
+    assert "lost the job" in caplog.text
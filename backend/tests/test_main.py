@@ -0,0 +1,159 @@
+import os
+import sys
+import json
+import asyncio
+import subprocess
+
+from fastapi.testclient import TestClient
+
+from backend import main
+from backend.tests.helpers import encode_ogg, speech
+
+
+def receive_reply(ws) -> list:
+    """Receive messages until the end of a spoken reply and return the JSON ones."""
+    messages = []
+    while True:
+        message = ws.receive()
+        if message.get("text"):
+            messages.append(json.loads(message["text"]))
+            if messages[-1].get("endOfResponse"):
+                return messages
+
+
+def answer(ws, audio: bytes):
+    ws.send_bytes(audio)
+    ws.send_text(json.dumps({"endOfMessage": True}))
+    return receive_reply(ws)
+
+
+def start_interview(client) -> str:
+    response = client.post(
+        "/start-interview",
+        data={
+            "role": "Python (Django) Developer",
+            "role_description": "Build our backend services in Python and Django.",
+            "portfolio_text": "Backend developer, six years of Python and Django.",
+        },
+    )
+    assert response.status_code == 200
+    return response.json()["session_id"]
+
+
+def test_reconnect_resumes_the_interview():
+    audio = encode_ogg(speech(2))
+    with TestClient(main.app) as client:
+        session_id = start_interview(client)
+        with client.websocket_connect("/ws/audio") as ws:
+            ws.send_text(json.dumps({"session_id": session_id}))
+            receive_reply(ws)
+            answer(ws, audio)
+        # the candidate dropped without ending the interview, and comes back to a worker
+        # that does not have the interviewer cached
+        main.interviewers.clear()
+
+        with client.websocket_connect("/ws/audio") as ws:
+            ws.send_text(json.dumps({"session_id": session_id}))
+            assert "audio_format" in json.loads(ws.receive_text())
+            answer(ws, audio)
+
+        messages = main.interviewers[session_id].memory.chat_memory.messages
+        assert [message.type for message in messages] == ["ai", "human", "ai", "human", "ai"]
+        assert messages[1].content == main.inference.transcript
+        stored = client.portal.call(main.session_manager.get_messages, session_id)
+        assert len(stored) == 5
+
+
+def test_undecodable_answer_keeps_the_session():
+    with TestClient(main.app) as client:
+        session_id = start_interview(client)
+        with client.websocket_connect("/ws/audio") as ws:
+            ws.send_text(json.dumps({"session_id": session_id}))
+            receive_reply(ws)
+            reply = answer(ws, b"not an audio stream" * 100)
+
+            assert reply[0] == {"error": main.UNDECODABLE_ANSWER}
+            assert reply[-1]["endOfResponse"]
+            answer(ws, encode_ogg(speech(2)))
+
+        assert client.portal.call(main.session_manager.get_session, session_id)
+        assert len(client.portal.call(main.session_manager.get_messages, session_id)) == 3
+
+
+def test_failed_transcription_keeps_the_session(monkeypatch):
+    transcribe = main.stt_scheduler.transcribe
+    failures = [RuntimeError("STT worker crashed")]
+
+    async def flaky_transcribe(chunks):
+        if failures:
+            raise failures.pop()
+        return await transcribe(chunks)
+
+    monkeypatch.setattr(main.stt_scheduler, "transcribe", flaky_transcribe)
+    with TestClient(main.app) as client:
+        session_id = start_interview(client)
+        with client.websocket_connect("/ws/audio") as ws:
+            ws.send_text(json.dumps({"session_id": session_id}))
+            receive_reply(ws)
+            reply = answer(ws, encode_ogg(speech(2)))
+
+            assert reply[0] == {"error": main.UNTRANSCRIBED_ANSWER}
+            answer(ws, encode_ogg(speech(2)))
+
+        assert len(client.portal.call(main.session_manager.get_messages, session_id)) == 3
+
+
+def test_connecting_early_waits_for_the_guidelines_being_generated(monkeypatch):
+    calls = []
+
+    async def generate_questions(resume, role, role_description):
+        calls.append(resume)
+        await asyncio.sleep(0.3)
+        return "Ask about their Django projects."
+
+    monkeypatch.setattr(main, "generate_questions", generate_questions)
+    monkeypatch.setattr(main.guideline_cache, "ttl", 0)
+    with TestClient(main.app) as client:
+        session_id = start_interview(client)
+        with client.websocket_connect("/ws/audio") as ws:
+            ws.send_text(json.dumps({"session_id": session_id}))
+            receive_reply(ws)
+
+    assert len(calls) == 1
+    assert main.interviewers[session_id].guidelines == "Ask about their Django projects."
+
+
+def test_metrics_add_up_every_worker_process(tmp_path, monkeypatch):
+    # another worker process counts an event into the shared directory
+    worker = (
+        "from prometheus_client import Counter\n"
+        "Counter('interview_events_total', '', ['event']).labels('worker_event').inc(3)\n"
+    )
+    environment = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    subprocess.run([sys.executable, "-c", worker], env=environment, check=True)
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    with TestClient(main.app) as client:
+        response = client.get("/metrics")
+
+    assert 'interview_events_total{event="worker_event"} 3.0' in response.text
+
+
+def test_metrics_drop_the_sessions_of_dead_workers(tmp_path, monkeypatch):
+    # a worker counted a connected session and crashed before disconnecting it
+    worker = (
+        "from prometheus_client import Gauge\n"
+        "Gauge('interview_active_sessions', '', multiprocess_mode='livesum').inc()\n"
+    )
+    environment = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    subprocess.run([sys.executable, "-c", worker], env=environment, check=True)
+    assert list(tmp_path.glob("gauge_livesum_*.db"))
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+
+    with TestClient(main.app) as client:
+        response = client.get("/metrics")
+
+    assert "interview_active_sessions 1.0" not in response.text
+    assert not list(tmp_path.glob("gauge_livesum_*.db"))
@@ -0,0 +1,124 @@
+import os
+
+import numpy as np
+import pytest
+import torch
+import whisper
+
+from torch.ao.nn.quantized.dynamic import Linear as QuantizedLinear
+from whisper.decoding import DecodingResult
+from whisper.model import ModelDimensions, Whisper
+
+from backend.audio import decode_audio
+from backend.stt_engines import STT_ENGINES, FakeEngine, WhisperEngine, create_stt_engine
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "sample.wav")
+# a Whisper small enough to decode in a moment; n_text_ctx caps the reply at 4 tokens
+DIMENSIONS = ModelDimensions(
+    n_mels=80,
+    n_audio_ctx=1500,
+    n_audio_state=64,
+    n_audio_head=1,
+    n_audio_layer=1,
+    n_vocab=51865,
+    n_text_ctx=8,
+    n_text_state=64,
+    n_text_head=1,
+    n_text_layer=1,
+)
+
+
+@pytest.fixture
+def offline_whisper(monkeypatch):
+    """Load randomly initialised models instead of downloading the real weights."""
+
+    def load_model(name, device=None):
+        torch.manual_seed(0)
+        model = Whisper(DIMENSIONS)
+        with torch.no_grad():
+            for parameter in model.parameters():
+                parameter.normal_(std=0.02)
+        return model.to(device or "cpu")
+
+    monkeypatch.setattr(whisper, "load_model", load_model)
+
+
+@pytest.fixture(scope="module")
+def answer():
+    with open(SAMPLE, "rb") as f:
+        return decode_audio(f.read())
+
+
+@pytest.mark.parametrize("name", ["whisper", "whisper-int8", "fake"])
+def test_every_engine_loads_and_transcribes(name, answer, offline_whisper):
+    engine = create_stt_engine(name, "tiny")
+
+    assert isinstance(engine, STT_ENGINES[name])
+    [(text, confidence)] = engine.decode_batch([answer])
+    assert isinstance(text, str)
+    assert 0 < confidence <= 1
+
+
+def test_faster_whisper_transcribes_the_sample(answer):
+    """Needs the faster-whisper extra and the tiny model, downloaded or cached."""
+    pytest.importorskip("faster_whisper")
+    try:
+        engine = create_stt_engine("faster-whisper", "tiny")
+    except Exception as e:  # no network and nothing cached
+        pytest.skip(f"the tiny model is not available: {e}")
+
+    [(text, confidence)] = engine.decode_batch([answer])
+    assert text.strip()
+    assert 0 < confidence <= 1
+
+
+def test_the_quantized_engine_runs_int8_linear_layers(offline_whisper):
+    engine = create_stt_engine("whisper-int8", "tiny")
+    modules = list(engine.model.modules())
+
+    assert any(isinstance(module, QuantizedLinear) for module in modules)
+    assert not any(isinstance(module, torch.nn.Linear) for module in modules)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError, match="Unknown STT engine 'whisper-cpp'"):
+        create_stt_engine("whisper-cpp", "tiny")
+
+
+def test_the_fake_engine_loads_nothing(answer):
+    assert create_stt_engine("fake", "large").decode_batch([answer, answer]) == [
+        (FakeEngine.transcript, FakeEngine.confidence)
+    ] * 2
+
+
+def result(text, avg_logprob, compression_ratio, no_speech_prob=0.0) -> DecodingResult:
+    return DecodingResult(
+        audio_features=None,
+        language="en",
+        text=text,
+        avg_logprob=avg_logprob,
+        compression_ratio=compression_ratio,
+        no_speech_prob=no_speech_prob,
+    )
+
+
+def test_chunks_that_fail_are_decoded_again_at_a_higher_temperature(offline_whisper, monkeypatch):
+    decoded = []
+
+    def decode(model, mel, options):
+        decoded.append((len(mel), options.temperature))
+        if options.temperature > 0:
+            return [result("hello there", -0.2, 1.2)]
+        return [
+            result("fine", -0.2, 1.1),
+            result("again and again and again and again", -0.3, 3.1),  # repetitive
+            result("", -1.5, 1.0, no_speech_prob=0.9),  # silence
+        ]
+
+    monkeypatch.setattr(whisper, "decode", decode)
+    engine = WhisperEngine("tiny")
+    texts = [text for text, _ in engine.decode_batch([np.zeros(16000, dtype=np.float32)] * 3)]
+
+    assert decoded == [(3, 0.0), (1, 0.2)]
+    assert texts == ["fine", "hello there", ""]
+
@@ -0,0 +1,70 @@
+import asyncio
+
+import numpy as np
+
+from backend.inference import FakeInference
+from backend.metrics import new_trace, trace_id
+from backend.stt_scheduler import STTScheduler
+
+SAMPLE_RATE = 16000
+
+
+class FailingInference(FakeInference):
+    async def decode_batch(self, chunks: list) -> list:
+        raise RuntimeError("model crashed")
+
+
+def test_batches_are_decoded_together_and_forgotten_when_done():
+    inference = FakeInference(concurrency=1, stt_rtf=0)
+    scheduler = STTScheduler(inference, batch_window=0.05)
+    speech = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+    async def answers():
+        results = await asyncio.gather(
+            scheduler.transcribe([speech, speech]), scheduler.transcribe([speech])
+        )
+        await asyncio.sleep(0)
+        return results
+
+    results = asyncio.run(answers())
+
+    transcript = inference.transcript
+    assert results == [(f"{transcript} {transcript}", 0.9), (transcript, 0.9)]
+    assert not scheduler._decoding
+
+
+def test_nothing_to_transcribe():
+    scheduler = STTScheduler(FakeInference(stt_rtf=0))
+
+    assert asyncio.run(scheduler.transcribe([])) == ("", None)
+
+
+def test_decoding_errors_reach_every_waiting_answer():
+    scheduler = STTScheduler(FailingInference(stt_rtf=0), batch_window=0)
+    speech = np.zeros(SAMPLE_RATE, dtype=np.float32)
+
+    async def answers():
+        return await asyncio.gather(
+            scheduler._submit(speech), scheduler._submit(speech), return_exceptions=True
+        )
+
+    assert [str(error) for error in asyncio.run(answers())] == ["model crashed"] * 2
+    assert not scheduler._decoding
+
+
+def test_batches_do_not_inherit_the_submitters_trace():
+    class TracingInference(FakeInference):
+        async def decode_batch(self, chunks: list) -> list:
+            self.trace = trace_id.get()
+            return await super().decode_batch(chunks)
+
+    inference = TracingInference(stt_rtf=0)
+    scheduler = STTScheduler(inference, batch_window=0)
+
+    async def answer():
+        new_trace()
+        return await scheduler.transcribe([np.zeros(SAMPLE_RATE, dtype=np.float32)])
+
+    asyncio.run(answer())
+
+    assert inference.trace == "-"
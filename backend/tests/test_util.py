@@ -0,0 +1,46 @@
+import asyncio
+
+from backend.util import split_sentences
+
+COMMON_LINES = ("Very nice.", "Could you elaborate on that?")
+
+
+def sentences(*tokens, **options) -> list:
+    async def stream():
+        for token in tokens:
+            yield token
+
+    async def collect():
+        return [sentence async for sentence in split_sentences(stream(), **options)]
+
+    return asyncio.run(collect())
+
+
+def test_short_sentences_are_merged_with_the_next_one():
+    assert sentences("Great. ", "Tell me about ", "your last project. ", "Why?") == [
+        "Great. Tell me about your last project.",
+        "Why?",
+    ]
+
+
+def test_standalone_lines_are_never_merged():
+    reply = ["Ok. ", "Very ", "nice. ", "Great. ", "Could you ", "elaborate on that?"]
+
+    assert sentences(*reply, standalone=COMMON_LINES) == [
+        "Ok.",
+        "Very nice.",
+        "Great.",
+        "Could you elaborate on that?",
+    ]
+    assert sentences("Very nice. Why did you pick Django?", standalone=COMMON_LINES) == [
+        "Very nice.",
+        "Why did you pick Django?",
+    ]
+
+
+def test_standalone_lines_match_like_the_tts_cache_keys():
+    # the model wrote a non-breaking space
+    assert sentences("Very\u00a0nice. ", "Why?", standalone=COMMON_LINES) == [
+        "Very\u00a0nice.",
+        "Why?",
+    ]
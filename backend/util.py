@@ -1,16 +1,34 @@
+import re
+import unicodedata
 from PyPDF2 import PdfReader
 from io import BytesIO
 from langchain.schema import AIMessage, BaseMessage
-from typing import List
+from typing import AsyncIterator, Collection, List
 
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+WHITESPACE = re.compile(r"\s+")
 
-def transform_interview(conversation_data: List[BaseMessage]):
-    """Transform a list of conversation messages to a list of messages with role and content."""
+
+def normalize_text(text) -> str:
+    """Normalize unicode forms and whitespace so trivially different copies hash alike."""
+    return WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text or "")).strip()
+
+
+def transform_interview(conversation_data: List[BaseMessage], with_metadata: bool = False):
+    """Transform a list of conversation messages to a list of messages with role and content.
+
+    With `with_metadata`, each message also carries its `created_at` timestamp and the STT
+    `confidence` of candidate answers, as stored per turn in the database.
+    """
     messages_list = []
 
     for msg in conversation_data:
         role = "AI" if isinstance(msg, AIMessage) else "User"
-        messages_list.append({"role": role, "message": msg.content})
+        message = {"role": role, "message": msg.content}
+        if with_metadata:
+            message["created_at"] = msg.response_metadata.get("created_at")
+            message["confidence"] = msg.response_metadata.get("confidence")
+        messages_list.append(message)
 
     return messages_list
 
@@ -23,3 +41,44 @@ def resume_reader(resume_bytes):
     for page in pdf_reader.pages:
         text += page.extract_text()
     return text
+
+
+async def split_sentences(
+    tokens: AsyncIterator[str], min_length: int = 20, standalone: Collection[str] = ()
+):
+    """Group a stream of tokens into sentences, yielding each one as soon as it is complete.
+
+    Sentences shorter than `min_length` are merged with the next one so that very short
+    utterances ("Great.") are not synthesized on their own, except the `standalone` ones,
+    such as the lines kept in the TTS cache, which are always yielded by themselves. They
+    are compared after `normalize_text`, like the TTS cache keys.
+    """
+    standalone = {normalize_text(line) for line in standalone}
+    pending = ""
+    sentence = ""
+    async for token in tokens:
+        pending += token
+        *completed, pending = SENTENCE_END.split(pending)
+        for part in completed:
+            if normalize_text(part) in standalone:
+                if sentence:
+                    yield sentence
+                yield part.strip()
+                sentence = ""
+                continue
+            sentence = f"{sentence} {part}".strip()
+            if len(sentence) >= min_length:
+                yield sentence
+                sentence = ""
+
+    if sentence and normalize_text(pending) in standalone:
+        yield sentence
+        sentence = ""
+    sentence = f"{sentence} {pending}".strip()
+    if sentence:
+        yield sentence
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of English text (about 4 characters per token), without a tokenizer."""
+    return len(text) // 4 + 1
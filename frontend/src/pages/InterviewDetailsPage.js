@@ -113,7 +113,15 @@ const InterviewDetailsPage = () => {
 
         <div className="bg-white shadow-lg rounded-lg p-6">
           <h2 className="text-2xl font-semibold text-gray-800 mb-4">Evaluation</h2>
+          {interview.evaluation ? (
             <ReactMarkdown className="prose max-w-none">{interview.evaluation}</ReactMarkdown>
+          ) : (
+            <p className="text-gray-500">
+              {interview.evaluation_status === 'failed'
+                ? 'The evaluation failed and can be replayed.'
+                : 'The evaluation is in progress.'}
+            </p>
+          )}
         </div>
       </div>
     </div>
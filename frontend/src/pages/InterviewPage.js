@@ -15,20 +15,23 @@ const InterviewPage = () => {
   const [isInterviewStarted, setIsInterviewStarted] = useState(false);
   const [isSavingInterview, setIsSavingInterview] = useState(false); 
   const [avgVolume, setAvgVolume] = useState(0);
-  const [audioData, setAudioData] = useState(null); 
   const [session_id, setSessionId] = useState(null)
   const [isListening, setIsListening] = useState(false);
   const mediaStream = useRef(null);
   const mediaRecorder = useRef(null);
   const chunks = useRef([]); 
   const sendQueue = useRef([]); 
+  const playbackContext = useRef(null);
+  const playbackFormat = useRef({ sample_rate: 24000 });
+  const scheduledUntil = useRef(0);
+  const activeSegments = useRef(0);
+  const responseComplete = useRef(false);
   const audioContext = useRef(null);
   const analyserNode = useRef(null);
   const silenceTimer = useRef(null);
   const silenceThreshold = 0.1;
   const silenceDuration = 2000;
   const ws = useRef(null);
-  const audioRef = useRef(null);  
   const navigate = useNavigate(); 
   const hasPageLoaded = useRef(false);
   const isSavingInterviewRef = useRef(isSavingInterview);
@@ -42,8 +45,7 @@ const InterviewPage = () => {
   }, [isSavingInterview]);
 
   useEffect(() => {
-    if (state?.audio_base64) {
-      setAudioData(state.audio_base64);
+    if (state?.session_id) {
       setSessionId(state.session_id);
     }
   }, [state]);
@@ -105,36 +107,86 @@ const InterviewPage = () => {
       ws.current.onclose = () => console.log('WebSocket disconnected');
       ws.current.onerror = (error) => console.error('WebSocket error:', error);
 
-      ws.current.onmessage = (event) => {
-        
-        if (event.data === "Interview ended successfully.") {
-          console.log("Signal to end interview");
-          endInterview();
-        }
-
-        setIsListening(false);
-        const audioData = event.data;
-        const audioBlob = new Blob([audioData], { type: 'audio/ogg' });
-        const audio = new Audio(URL.createObjectURL(audioBlob));
-        audioRef.current = audio;
-        if (!isSavingInterviewRef.current) {
-          audio.play().catch((err) => {
-              console.error('Error playing audio:', err);
-              setIsListening(true);
-            });
-          
-            audio.onended = () => {
-              console.log("Audio playback finished, re-enabling listening");
-              setIsListening(true);
-              startListening();
-            };
-          };
-      }
+      ws.current.onmessage = handleMessage;
     } catch (error) {
       console.error('Error accessing microphone:', error);
     }
   };
 
+  const handleMessage = (event) => {
+    if (event.data === "Interview ended successfully.") {
+      console.log("Signal to end interview");
+      endInterview();
+      return;
+    }
+
+    if (typeof event.data === 'string') {
+      const message = JSON.parse(event.data);
+      if (message.audio_format) {
+        playbackFormat.current = message.audio_format;
+      }
+      if (message.partial_transcript) {
+        console.log("Partial transcript:", message.partial_transcript);
+      }
+      if (message.error) {
+        console.error("Server error:", message.error);
+      }
+      if (message.endOfResponse) {
+        responseComplete.current = true;
+        resumeListeningIfDone();
+      }
+      return;
+    }
+
+    setIsListening(false);
+    scheduleSegment(event.data);
+  };
+
+  const scheduleSegment = (data) => {
+    if (isSavingInterviewRef.current) return;
+
+    if (!playbackContext.current || playbackContext.current.state === 'closed') {
+      playbackContext.current = new (window.AudioContext || window.webkitAudioContext)();
+      scheduledUntil.current = 0;
+    }
+    const context = playbackContext.current;
+
+    // 16-bit little-endian PCM, as announced by the server in `audio_format`
+    const samples = new Int16Array(data);
+    const segment = context.createBuffer(1, samples.length, playbackFormat.current.sample_rate);
+    const channel = segment.getChannelData(0);
+    for (let i = 0; i < samples.length; i++) {
+      channel[i] = samples[i] / 32768;
+    }
+
+    const source = context.createBufferSource();
+    source.buffer = segment;
+    source.connect(context.destination);
+    const startAt = Math.max(context.currentTime, scheduledUntil.current);
+    source.start(startAt);
+    scheduledUntil.current = startAt + segment.duration;
+    activeSegments.current += 1;
+    source.onended = () => {
+      activeSegments.current -= 1;
+      resumeListeningIfDone();
+    };
+  };
+
+  const resumeListeningIfDone = () => {
+    if (responseComplete.current && activeSegments.current === 0 && !isSavingInterviewRef.current) {
+      responseComplete.current = false;
+      console.log("Audio playback finished, re-enabling listening");
+      setIsListening(true);
+      startListening();
+    }
+  };
+
+  const stopPlayback = () => {
+    if (playbackContext.current && playbackContext.current.state !== 'closed') {
+      playbackContext.current.close();
+    }
+  };
+
   const startRecording = () => {
     if (mediaRecorder.current?.state === 'recording') {
       console.log("Already recording; skipping start.");
@@ -227,29 +279,21 @@ const InterviewPage = () => {
     checkVolume();
   };
 
-  const playBase64Audio = () => {
-    if (audioData) {
-      
+  const connectInterview = () => {
+    if (session_id) {
+      // created on the click so the browser lets it play; the first question is streamed
+      // over the socket like every other reply
+      playbackContext.current = new (window.AudioContext || window.webkitAudioContext)();
+      scheduledUntil.current = 0;
+
       ws.current = new WebSocket(`${config.WS_BASE_URL}/audio`);
+      ws.current.binaryType = 'arraybuffer';
+      ws.current.onmessage = handleMessage;
       ws.current.onopen = () => {
         console.log('WebSocket connected');
         ws.current.send(JSON.stringify({ session_id: session_id }));
         flushSendQueue();
       };
-
-      const audioBlob = new Blob([new Uint8Array(atob(audioData).split('').map(c => c.charCodeAt(0)))], { type: 'audio/ogg' });
-      const audioUrl = URL.createObjectURL(audioBlob);
-      const audio = new Audio(audioUrl);
-      audioRef.current = audio;
-      audio.play().catch((err) => {
-        console.error('Error playing base64 audio:', err);
-      });
-
-      audio.onended = () => {
-        console.log("Audio playback finished, re-enabling listening");
-        setIsListening(true);
-        startListening();
-      };
     }
   }
 
@@ -271,25 +315,18 @@ const InterviewPage = () => {
 
   const handleStartInterview = () => {
     setIsInterviewStarted(true);
-    playBase64Audio();
+    connectInterview();
   };
 
   const endInterview = () => {
-
-    if (audioRef.current) {
-      audioRef.current.pause();
-      audioRef.current.currentTime = 0;
-    }
+    stopPlayback();
     navigate('/congratulations');
   };
 
   const signalEndInterView = () => {
     setIsSavingInterview(true);
     stopListening();
-    if (audioRef.current) {
-        audioRef.current.pause();
-        audioRef.current.currentTime = 0;
-    }
+    stopPlayback();
     if (ws.current && ws.current.readyState === WebSocket.OPEN) {
       ws.current.send(JSON.stringify({ end_interview: true }));
     }
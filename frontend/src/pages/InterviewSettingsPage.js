@@ -48,7 +48,6 @@ const InterviewSettingsPage = () => {
   
         navigate('/interview', { 
           state: { 
-            audio_base64: data.audio_base64,
             session_id: data.session_id 
           }
         });
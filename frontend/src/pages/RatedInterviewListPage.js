@@ -9,12 +9,11 @@ const RatedInterviewsPage = () => {
   const [interviews, setInterviews] = useState([]);
   const navigate = useNavigate();
   const [currentPage, setCurrentPage] = useState(1);
+  // cursors[i] fetches page i + 1; a trailing cursor means there is a next page
+  const [cursors, setCursors] = useState([null]);
   const itemsPerPage = 9;
 
-  const indexOfLastInterview = currentPage * itemsPerPage;
-  const indexOfFirstInterview = (currentPage - 1) * itemsPerPage; 
-  const currentInterviews = interviews.slice(indexOfFirstInterview, indexOfLastInterview);
-  const totalPages = Math.ceil(interviews.length / itemsPerPage);
+  const totalPages = cursors.length;
 
   const handlePageChange = (page) => {
     setCurrentPage(page);
@@ -24,15 +23,23 @@ const RatedInterviewsPage = () => {
   useEffect(() => {
     const fetchInterviews = async () => {
       try {
-        const response = await fetch(`${config.API_BASE_URL}/interviews/`);
+        const params = new URLSearchParams({ limit: itemsPerPage });
+        const cursor = cursors[currentPage - 1];
+        if (cursor) params.append('cursor', cursor);
+
+        const response = await fetch(`${config.API_BASE_URL}/interviews/?${params}`);
         const data = await response.json();
-        setInterviews(data);
+        setInterviews(data.interviews);
+        if (data.next_cursor && cursors.length === currentPage) {
+          setCursors([...cursors, data.next_cursor]);
+        }
       } catch (error) {
         console.error("Failed to fetch interviews", error);
       }
     };
     fetchInterviews();
-  }, []);
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [currentPage]);
 
   return (
     <div className="flex h-screen bg-gray-100">
@@ -59,7 +66,7 @@ const RatedInterviewsPage = () => {
         ) : (
           <>
             <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6 mb-8">
-              {currentInterviews.map((interview) => (
+              {interviews.map((interview) => (
                 <div
                   key={interview.session_id}
                   className="bg-white shadow-lg rounded-lg p-6 hover:shadow-xl transition-shadow duration-300 cursor-pointer"